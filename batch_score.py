@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Score an offer file against fitted recruitment curve parameters.
+
+Streams a CSV file or columnar '.offers' directory through the model in
+fixed-size chunks and writes, for every offer, the baseline probability,
+the culture-adjusted probability and the regional salary that reaches the
+target probability. Each chunk is scored with one vectorized call, so
+throughput is bounded by reading and writing the files rather than by
+per-row Python work, and memory use is bounded by the chunk size.
+
+Culture and cost of living can come from columns of the input file or be
+given as one value for every offer. When the parameters were fitted with
+covariates (fit_parameters.py --culture-column etc.), each offer is instead
+shifted by the fitted coefficients applied to the same input columns.
+
+With a posterior draws file from posterior_sampler.py (--posterior), the
+output also gets the lower and upper limits of a credible interval for
+each offer's recommended salary. The draws must have been sampled around
+the curve in the parameters file, otherwise the limits would describe a
+different curve than the scores, so a mismatched file is rejected. A limit
+with no finite value (too many draws cannot reach the target) is left
+empty (NaN), like an unattainable recommended salary.
+
+Usage:
+    python batch_score.py offers.csv --output scores.csv
+    python batch_score.py offers.offers --culture-column culture --output scores.offers
+    python batch_score.py offers.csv --posterior posterior_draws.npz --credible-level 0.9
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from recruitment_core import score_offers
+from posterior_sampler import load_posterior, salary_credible_interval, sampled_curve_matches
+from covariate_model import covariate_columns, covariate_shift, score_covariate_offers
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, available_columns, read_columns, write_columns
+
+SCORE_COLUMNS = ('probability', 'culture_adjusted_probability', 'recommended_salary')
+INTERVAL_COLUMNS = ('recommended_salary_lower', 'recommended_salary_upper')
+
+
+def score_chunks(chunks, a, b, c, culture=0, cost_of_living=100, target_probability=0.8,
+                 culture_column=None, cost_of_living_column=None, covariates=None, salary_interval=None):
+    """
+    Score a stream of offer chunks.
+
+    Parameters:
+    chunks: iterable of DataFrames with a 'salary offer ($USD)' column
+    a, b, c: curve parameters
+    culture: culture factor used when culture_column is not given
+    cost_of_living: cost of living index used when cost_of_living_column is not given
+    target_probability: probability the recommended salary should achieve
+    culture_column: optional column holding each offer's culture factor
+    cost_of_living_column: optional column holding each offer's cost of living index
+    covariates: optional 'covariates' section of a covariate fit; replaces the
+                culture and cost of living settings
+    salary_interval: optional (lower, upper) credible limits of the national
+                     recommended salary ($1000s, culture 0); adds INTERVAL_COLUMNS,
+                     which are NaN where a limit is infinite
+
+    Yields:
+    DataFrame per chunk with the input columns followed by the score columns
+    """
+    for chunk in chunks:
+        if covariates:
+            scores = score_covariate_offers(chunk[SALARY_COLUMN].to_numpy(), a, b, c,
+                                            covariate_shift(chunk, covariates), target_probability)
+        else:
+            scores = score_offers(
+                chunk[SALARY_COLUMN].to_numpy(), a, b, c,
+                culture=chunk[culture_column].to_numpy() if culture_column else culture,
+                cost_of_living=(chunk[cost_of_living_column].to_numpy()
+                                if cost_of_living_column else cost_of_living),
+                target_probability=target_probability
+            )
+        output = {column: chunk[column].to_numpy() for column in chunk.columns}
+        output.update((column, scores[column]) for column in SCORE_COLUMNS)
+        if salary_interval is not None:
+            # The culture shift and regional scaling are monotone, so they map the limits directly
+            offer_culture = chunk[culture_column].to_numpy() if culture_column else culture
+            col_adjustment = (chunk[cost_of_living_column].to_numpy()
+                              if cost_of_living_column else cost_of_living) / 100.0
+            for column, limit in zip(INTERVAL_COLUMNS, salary_interval):
+                limit = limit if np.isfinite(limit) else np.nan
+                output[column] = np.broadcast_to(
+                    (limit - offer_culture) * col_adjustment * 1000.0, len(chunk)).astype(float)
+        yield pd.DataFrame(output, copy=False)
+
+
+def batch_score(input_path, output_path, params_path='parameters.json', culture=0,
+                cost_of_living=100, target_probability=0.8, culture_column=None,
+                cost_of_living_column=None, chunksize=1_000_000, posterior_path=None,
+                credible_level=0.95):
+    """
+    Score every offer in a file and write the results.
+
+    Parameters:
+    input_path: CSV file or '.offers' directory with a 'salary offer ($USD)' column
+    output_path: destination CSV file or '.offers' directory
+    params_path: parameters file with the fitted curve parameters
+    culture, cost_of_living: values used for every offer when no column is given
+    target_probability: probability the recommended salary should achieve
+    culture_column, cost_of_living_column: optional per-offer input columns
+                     (ignored when the parameters include fitted covariates)
+    chunksize: rows scored per chunk
+    posterior_path: optional posterior draws file (posterior_sampler.py) for
+                    credible limits on the recommended salary; it must have been
+                    sampled around the curve in params_path
+    credible_level: credible level of those limits
+
+    Returns:
+    Number of offers scored
+    """
+    with open(params_path, 'r') as f:
+        params = json.load(f)
+    curve = params['curve_parameters']
+    covariates = params.get('covariates')
+    if covariates:
+        # The fitted coefficients say which columns shift each offer
+        culture_column = cost_of_living_column = None
+        required = covariate_columns(covariates['features'])
+    else:
+        required = [culture_column, cost_of_living_column]
+
+    salary_interval = None
+    if posterior_path:
+        if covariates:
+            raise ValueError("Posterior draws describe the curve without covariates; "
+                             "they cannot be combined with covariate parameters")
+        draws, metadata = load_posterior(posterior_path)
+        if not sampled_curve_matches(metadata, curve):
+            raise ValueError(f"Posterior draws in {posterior_path} were not sampled around the curve in "
+                             f"{params_path}; sample them from the same data (posterior_sampler.py)")
+        lower, _, upper = salary_credible_interval(draws, target_probability, credible_level)
+        salary_interval = (lower, upper)
+
+    # Carry the outcome through when present so the scores can be evaluated later
+    present = available_columns(input_path)
+    for column in required:
+        if column and column not in present:
+            raise ValueError(f"Column '{column}' not found in {input_path}")
+    columns = [SALARY_COLUMN]
+    for column in [ACCEPTANCE_COLUMN] + required:
+        if column and column in present and column not in columns:
+            columns.append(column)
+
+    chunks = read_columns(input_path, columns, chunksize=chunksize)
+    scored = score_chunks(
+        chunks, curve['a'], curve['b'], curve['c'],
+        culture=culture, cost_of_living=cost_of_living, target_probability=target_probability,
+        culture_column=culture_column, cost_of_living_column=cost_of_living_column,
+        covariates=covariates, salary_interval=salary_interval
+    )
+    return write_columns(scored, output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score offers against fitted recruitment parameters')
+    parser.add_argument('input_file', help='CSV file or .offers directory with salary offers')
+    parser.add_argument('--output', default='scores.csv',
+                        help='Output CSV file or .offers directory (default: scores.csv)')
+    parser.add_argument('--params', default='parameters.json', help='Path to parameters file')
+    parser.add_argument('--culture', type=float, default=0,
+                        help='Culture factor for every offer (default: 0)')
+    parser.add_argument('--culture-column', help='Input column with a culture factor per offer')
+    parser.add_argument('--cost-of-living', type=float, default=100,
+                        help='Cost of living index for every offer (default: 100)')
+    parser.add_argument('--cost-of-living-column',
+                        help='Input column with a cost of living index per offer')
+    parser.add_argument('--target-probability', type=float, default=0.8,
+                        help='Probability the recommended salary should achieve (default: 0.8)')
+    parser.add_argument('--chunksize', type=int, default=1_000_000,
+                        help='Rows scored per chunk (default: 1000000)')
+    parser.add_argument('--posterior', default=None,
+                        help='Posterior draws file from posterior_sampler.py; adds credible limits '
+                             'on the recommended salary')
+    parser.add_argument('--credible-level', type=float, default=0.95,
+                        help='Credible level of the recommended-salary limits (default: 0.95)')
+
+    args = parser.parse_args()
+
+    if args.chunksize <= 0:
+        parser.error("--chunksize must be positive")
+    if not 0 < args.target_probability < 1:
+        parser.error("--target-probability must be between 0 and 1")
+    if not 0 < args.credible_level < 1:
+        parser.error("--credible-level must be between 0 and 1")
+
+    start = time.perf_counter()
+    n_rows = batch_score(
+        args.input_file, args.output, args.params,
+        culture=args.culture, cost_of_living=args.cost_of_living,
+        target_probability=args.target_probability,
+        culture_column=args.culture_column, cost_of_living_column=args.cost_of_living_column,
+        chunksize=args.chunksize, posterior_path=args.posterior, credible_level=args.credible_level
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {n_rows} offers in {elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):,.0f} offers/s)")
+    print(f"Scores saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Benchmark the recruitment model's hot paths and keep a history of results.
+
+Times the fit (fit_curve_parameters), sigmoid scoring, test_predictions,
+the parameter sweep, the app's chart construction and a 10^4-position
+budget allocation. Data-dependent benchmarks run over synthetic offer
+histories from generate_sample_data.py at each requested size (10^2 to
+10^7 rows by default). For every case the
+best wall time of several runs is recorded, plus the peak memory allocated
+during one extra traced run (tracemalloc, which NumPy reports its buffers
+to). Each invocation appends one entry to a JSON history file and compares
+it with the previous entry, flagging cases that got slower.
+
+Usage:
+    python benchmarks.py
+    python benchmarks.py --sizes 100 10000 1000000 --only fit sigmoid --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from recruitment_core import sigmoid_recruitment
+from offer_data import SALARY_COLUMN, read_offers
+from generate_sample_data import generate_offers, TRAINING_SALARY_BANDS
+from fit_parameters import fit_curve_parameters
+from test_predictions import test_predictions
+from parameter_sweep import run_sweep
+from recruitment_chart import build_recruitment_figure, render_recruitment_chart
+from portfolio_optimizer import optimize_offers
+from parameter_store import DEFAULT_PARAMETERS
+
+DEFAULT_SIZES = [10 ** power for power in range(2, 8)]
+DEFAULT_HISTORY = 'benchmark_history.json'
+
+# A case is flagged when its best time exceeds the previous run's by this factor
+REGRESSION_RATIO = 1.2
+
+# Benchmarks run once per offer-history size
+SIZED_BENCHMARKS = ('fit', 'fit_aggregate', 'sigmoid', 'test_predictions')
+
+# Benchmarks whose work does not depend on the data size
+FIXED_BENCHMARKS = ('sweep', 'build_figure', 'render_chart', 'portfolio')
+
+# Open positions in the budget allocation benchmark
+PORTFOLIO_POSITIONS = 10_000
+
+
+def _measure(func, repeat):
+    """Best wall time over repeat runs, then peak traced memory of one more run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_time': min(times),
+        'wall_time_mean': float(np.mean(times)),
+        'peak_memory_mb': peak / 2 ** 20,
+        'repeat': repeat,
+    }
+
+
+def _quiet(func):
+    """Wrap func so the scripts' progress output does not flood the report."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+
+def sized_cases(data_path, params_path, n_rows):
+    """Benchmark callables for one offer history."""
+    a, b, c = (DEFAULT_PARAMETERS['curve_parameters'][name] for name in ('a', 'b', 'c'))
+    salaries = read_offers(data_path)[SALARY_COLUMN].to_numpy() / 1000
+    culture = np.zeros(n_rows)
+    culture[::2] = 10
+    out = np.empty(n_rows)
+
+    return {
+        'fit': _quiet(lambda: fit_curve_parameters(data_path)),
+        'fit_aggregate': _quiet(lambda: fit_curve_parameters(data_path, aggregate=True)),
+        'sigmoid': lambda: sigmoid_recruitment(salaries, a, b, c, culture, out=out),
+        'test_predictions': _quiet(lambda: test_predictions(data_path, params_path)),
+    }
+
+
+def fixed_cases():
+    """Benchmark callables that do not depend on the data size."""
+    a, b, c = (DEFAULT_PARAMETERS['curve_parameters'][name] for name in ('a', 'b', 'c'))
+
+    def build_figure():
+        build_recruitment_figure(a, b, c, 10, 91, 0.8)
+
+    def render_chart():
+        # Bypass the LRU cache so every run renders
+        render_recruitment_chart.__wrapped__(a, b, c, 10, 91, 0.8)
+
+    rng = np.random.default_rng(0)
+    culture = rng.integers(-4, 5, PORTFOLIO_POSITIONS) * 5
+    cost_of_living = rng.integers(77, 232, PORTFOLIO_POSITIONS)
+
+    return {
+        'sweep': lambda: run_sweep(),
+        'build_figure': build_figure,
+        'render_chart': render_chart,
+        'portfolio': lambda: optimize_offers(200_000 * PORTFOLIO_POSITIONS, a, b, c, culture, cost_of_living),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, only=None, repeat=3, data_dir=None, seed=0):
+    """
+    Run the benchmark suite.
+
+    Parameters:
+    sizes: offer-history sizes (rows) for the data-dependent benchmarks
+    only: names of the benchmarks to run (default: all)
+    repeat: timed runs per case; the best is reported
+    data_dir: directory for the generated offer histories (default: a temporary directory)
+    seed: random seed for the generated histories
+
+    Returns:
+    Dictionary describing the run, with one result per (benchmark, size)
+    """
+    selected = set(only or SIZED_BENCHMARKS + FIXED_BENCHMARKS)
+    results = []
+
+    def record(name, n_rows, func):
+        measurement = _measure(func, repeat)
+        results.append({'benchmark': name, 'n_rows': n_rows, **measurement})
+        size = f"{n_rows:>10}" if n_rows is not None else f"{'-':>10}"
+        print(f"  {name:<18}{size} {measurement['wall_time']:>10.4f}s "
+              f"{measurement['peak_memory_mb']:>10.1f} MB")
+
+    print(f"  {'Benchmark':<18}{'Rows':>10} {'Best time':>11} {'Peak memory':>13}")
+    with tempfile.TemporaryDirectory(dir=data_dir) as workdir:
+        params_path = os.path.join(workdir, 'parameters.json')
+        with open(params_path, 'w') as f:
+            json.dump(DEFAULT_PARAMETERS, f)
+
+        if selected & set(SIZED_BENCHMARKS):
+            for n_rows in sizes:
+                data_path = os.path.join(workdir, f'offers_{n_rows}.offers')
+                generate_offers(data_path, n_rows, TRAINING_SALARY_BANDS, culture_std=20,
+                                noise_level=0.1, seed=seed)
+                for name, func in sized_cases(data_path, params_path, n_rows).items():
+                    if name in selected:
+                        record(name, n_rows, func)
+
+        for name, func in fixed_cases().items():
+            if name in selected:
+                record(name, None, func)
+
+    return {
+        'date': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare_runs(current, previous, ratio=REGRESSION_RATIO):
+    """
+    Cases whose best time grew by more than ratio since the previous run.
+
+    Returns:
+    List of (benchmark, n_rows, previous_time, current_time) tuples
+    """
+    before = {(r['benchmark'], r['n_rows']): r['wall_time'] for r in previous['results']}
+    regressions = []
+    for r in current['results']:
+        key = (r['benchmark'], r['n_rows'])
+        if key in before and r['wall_time'] > ratio * before[key]:
+            regressions.append((r['benchmark'], r['n_rows'], before[key], r['wall_time']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the recruitment model hot paths')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Offer-history sizes in rows (default: 100 to 10000000)')
+    parser.add_argument('--only', nargs='+', choices=SIZED_BENCHMARKS + FIXED_BENCHMARKS,
+                        help='Run only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated data')
+    parser.add_argument('--data-dir', default=None,
+                        help='Directory for the temporary offer histories (default: system temp)')
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help=f'JSON history file to append to (default: {DEFAULT_HISTORY})')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    run = run_benchmarks(args.sizes, args.only, args.repeat, args.data_dir, args.seed)
+
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history, 'r') as f:
+            history = json.load(f)
+
+    if history:
+        regressions = compare_runs(run, history[-1])
+        label = history[-1].get('commit') or history[-1]['date']
+        if regressions:
+            print(f"\nSlower than the previous run ({label}) by more than {REGRESSION_RATIO - 1:.0%}:")
+            for name, n_rows, before, after in regressions:
+                print(f"  {name} ({n_rows or '-'} rows): {before:.4f}s -> {after:.4f}s")
+        else:
+            print(f"\nNo regressions against the previous run ({label})")
+
+    history.append(run)
+    with open(args.history, 'w') as f:
+        json.dump(history, f, indent=2)
+
+    print(f"\nBenchmark results appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Bootstrap confidence intervals for the recruitment curve parameters.
+
+Resampling offers with replacement is equivalent to drawing multinomial
+counts over the (salary bin, outcome) cells, so each replicate is a small
+binomial fit on the salary bins rather than a refit on every row, and a
+whole block of replicates is fit in one batched Newton solve.
+Replicates are grouped into fixed-size blocks with their own seeds spawned
+from one SeedSequence, and the blocks are spread over a process pool, so
+results for a given seed do not depend on the number of workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from likelihood_fit import aggregate_offers, fit_batched
+from recruitment_core import find_salary_for_probability
+
+# Replicates per independently seeded block of work
+BLOCK_SIZE = 250
+
+
+def _bootstrap_block(task):
+    """Refit the curve on one block of multinomial resamples."""
+    salaries, n_accepted, n_rejected, p0, bounds, n_replicates, seed = task
+    rng = np.random.default_rng(seed)
+
+    total = int(n_accepted.sum() + n_rejected.sum())
+    cells = np.concatenate([n_accepted, n_rejected]) / total
+    draws = rng.multinomial(total, cells, size=n_replicates)
+    accepted, rejected = draws[:, :len(salaries)], draws[:, len(salaries):]
+
+    fit = fit_batched(salaries, accepted, accepted + rejected, p0, bounds)
+    params = fit['params']
+    params[~fit['converged']] = np.nan
+    return params
+
+
+def bootstrap_parameters(salaries, acceptances, n_offers=None, n_replicates=1000, p0=None,
+                         bounds=None, seed=0, n_workers=None):
+    """
+    Refit (a, b, c) on bootstrap resamples of the offers.
+
+    Parameters:
+    salaries: compensation in thousands
+    acceptances: 0/1 outcomes, or accepted counts per salary bin
+    n_offers: offers per salary bin (None for individual offers)
+    n_replicates: number of bootstrap replicates
+    p0: starting point for every refit, normally the full-data estimate
+    bounds: (lower, upper) parameter bounds shared by all refits
+    seed: seed for the SeedSequence the block seeds are spawned from
+    n_workers: number of worker processes (default: all cores)
+
+    Returns:
+    Array of shape (n_replicates, 3); replicates that failed to converge are NaN
+    """
+    if n_offers is None:
+        salaries, n_offers, acceptances = aggregate_offers(salaries, acceptances)
+    salaries = np.asarray(salaries, dtype=float)
+    n_accepted = np.asarray(acceptances, dtype=float)
+    n_rejected = np.asarray(n_offers, dtype=float) - n_accepted
+
+    sizes = [BLOCK_SIZE] * (n_replicates // BLOCK_SIZE)
+    if n_replicates % BLOCK_SIZE:
+        sizes.append(n_replicates % BLOCK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (salaries, n_accepted, n_rejected, p0, bounds, size, block_seed)
+        for size, block_seed in zip(sizes, seeds)
+    ]
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    if n_workers <= 1:
+        blocks = [_bootstrap_block(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            blocks = list(pool.map(_bootstrap_block, tasks))
+
+    return np.concatenate(blocks)
+
+
+def summarize_bootstrap(draws, target_probability=0.8, confidence=0.95, seed=0):
+    """
+    Percentile intervals for the parameters and the recommended salary.
+
+    Parameters:
+    draws: bootstrap parameter array of shape (n_replicates, 3)
+    target_probability: probability the recommended salary should achieve
+    confidence: coverage of the percentile intervals
+    seed: seed the draws were generated with (recorded for reproducibility)
+
+    Returns:
+    Dictionary suitable for the 'bootstrap' section of parameters.json
+    """
+    valid = draws[~np.isnan(draws).any(axis=1)]
+    if valid.size == 0:
+        raise ValueError(f"None of the {len(draws)} bootstrap replicates converged; "
+                         "no intervals can be computed")
+    tail = 100 * (1 - confidence) / 2
+    percentiles = [tail, 100 - tail]
+
+    intervals = {
+        name: [float(v) for v in np.percentile(valid[:, i], percentiles)]
+        for i, name in enumerate(['a', 'b', 'c'])
+    }
+
+    salaries = find_salary_for_probability(target_probability, valid[:, 0], valid[:, 1], valid[:, 2])
+    attainable = salaries[~np.isnan(salaries)]
+
+    return {
+        "n_replicates": int(len(draws)),
+        "n_converged": int(len(valid)),
+        "seed": seed,
+        "confidence": confidence,
+        "intervals": intervals,
+        "recommended_salary": {
+            "target_probability": target_probability,
+            "median": float(np.median(attainable)) if len(attainable) else None,
+            "interval": [float(v) for v in np.percentile(attainable, percentiles)] if len(attainable) else None,
+            "fraction_attainable": float(len(attainable) / len(valid)),
+            "description": "Salary ($1000s) reaching the target probability at culture 0"
+        }
+    }
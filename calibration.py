@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Calibration diagnostics for recruitment predictions.
+
+Checks whether a predicted 80% really means 80% of such offers are accepted.
+All metrics come from a small CalibrationAccumulator holding per-bin sums
+(offers, predicted probability, acceptances) and the total squared error.
+Accumulators are updated chunk by chunk, so holdouts larger than memory can
+be streamed, and two accumulators merge by adding their sums, so results
+from parallel workers or cross-validation folds combine exactly.
+
+Usage:
+    python calibration.py holdout.offers --params parameters.json --chunksize 1000000
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from recruitment_core import sigmoid_recruitment
+from covariate_model import covariate_columns, covariate_shift
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, OFFER_DTYPES, read_columns
+
+# Equal-width probability bins used for the reliability curve and ECE
+DEFAULT_BINS = 10
+
+
+class CalibrationAccumulator:
+    """
+    Mergeable running sums for the Brier score, ECE and reliability curve.
+
+    Parameters:
+    n_bins: number of equal-width predicted-probability bins on [0, 1]
+    """
+
+    def __init__(self, n_bins=DEFAULT_BINS):
+        self.n_bins = n_bins
+        self.n_offers = np.zeros(n_bins)
+        self.sum_predicted = np.zeros(n_bins)
+        self.n_accepted = np.zeros(n_bins)
+        self.squared_error = 0.0
+
+    def update(self, actual, probabilities, n_offers=None):
+        """
+        Add a chunk of predictions.
+
+        Parameters:
+        actual: 0/1 outcomes, or accepted offers per entry when n_offers is given
+        probabilities: predicted acceptance probabilities
+        n_offers: offers per entry (None for individual offers)
+
+        Returns:
+        self, so updates can be chained
+        """
+        actual = np.asarray(actual, dtype=float)
+        probabilities = np.asarray(probabilities, dtype=float)
+        weights = np.ones_like(probabilities) if n_offers is None else np.asarray(n_offers, dtype=float)
+
+        bins = np.minimum((probabilities * self.n_bins).astype(np.intp), self.n_bins - 1)
+        self.n_offers += np.bincount(bins, weights=weights, minlength=self.n_bins)
+        self.sum_predicted += np.bincount(bins, weights=weights * probabilities, minlength=self.n_bins)
+        self.n_accepted += np.bincount(bins, weights=actual, minlength=self.n_bins)
+
+        # Accepted offers contribute (1 - p)^2 and rejected offers p^2
+        self.squared_error += float(np.sum(
+            actual * (1 - probabilities) ** 2 + (weights - actual) * probabilities ** 2))
+        return self
+
+    def merge(self, other):
+        """Add another accumulator's sums into this one; returns self."""
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge accumulators with different bin counts")
+        self.n_offers += other.n_offers
+        self.sum_predicted += other.sum_predicted
+        self.n_accepted += other.n_accepted
+        self.squared_error += other.squared_error
+        return self
+
+    @property
+    def total(self):
+        """Number of offers accumulated."""
+        return float(self.n_offers.sum())
+
+    def brier_score(self):
+        """Mean squared difference between predicted probability and outcome."""
+        return self.squared_error / self.total if self.total else np.nan
+
+    def reliability(self):
+        """
+        Reliability curve.
+
+        Returns:
+        Dictionary of per-bin arrays: 'bin_lower', 'bin_upper', 'n_offers',
+        'mean_predicted' and 'observed_rate' (NaN for empty bins)
+        """
+        edges = np.linspace(0, 1, self.n_bins + 1)
+        occupied = self.n_offers > 0
+        mean_predicted = np.full(self.n_bins, np.nan)
+        observed_rate = np.full(self.n_bins, np.nan)
+        np.divide(self.sum_predicted, self.n_offers, out=mean_predicted, where=occupied)
+        np.divide(self.n_accepted, self.n_offers, out=observed_rate, where=occupied)
+        return {
+            'bin_lower': edges[:-1],
+            'bin_upper': edges[1:],
+            'n_offers': self.n_offers.copy(),
+            'mean_predicted': mean_predicted,
+            'observed_rate': observed_rate,
+        }
+
+    def _gaps(self):
+        occupied = self.n_offers > 0
+        gaps = np.abs(self.sum_predicted[occupied] - self.n_accepted[occupied]) / self.n_offers[occupied]
+        return gaps, self.n_offers[occupied]
+
+    def expected_calibration_error(self):
+        """Offer-weighted mean |mean predicted - observed rate| over the bins."""
+        gaps, counts = self._gaps()
+        return float(np.sum(gaps * counts) / counts.sum()) if counts.size else np.nan
+
+    def max_calibration_error(self):
+        """Largest |mean predicted - observed rate| over the occupied bins."""
+        gaps, _ = self._gaps()
+        return float(gaps.max()) if gaps.size else np.nan
+
+    def summary(self):
+        """JSON-ready dictionary of the calibration metrics and reliability bins."""
+        reliability = self.reliability()
+        return {
+            'n_offers': self.total,
+            'n_bins': self.n_bins,
+            'brier_score': self.brier_score(),
+            'expected_calibration_error': self.expected_calibration_error(),
+            'max_calibration_error': self.max_calibration_error(),
+            'reliability': {
+                key: [None if np.isnan(v) else float(v) for v in values]
+                for key, values in reliability.items()
+            },
+        }
+
+
+def stream_calibration(data_path, a, b, c, n_bins=DEFAULT_BINS, chunksize=1_000_000, covariates=None):
+    """
+    Calibration of the curve on an offer file, streamed in chunks.
+
+    Parameters:
+    data_path: Path to CSV file or '.offers' directory with offer data
+    a, b, c: curve parameters
+    n_bins: number of reliability bins
+    chunksize: rows read per chunk
+    covariates: optional 'covariates' section of a covariate fit; each offer
+                is shifted by the fitted coefficients applied to its columns
+
+    Returns:
+    CalibrationAccumulator over every offer in the file
+    """
+    columns = [SALARY_COLUMN, ACCEPTANCE_COLUMN]
+    if covariates:
+        columns += [column for column in covariate_columns(covariates['features']) if column not in columns]
+
+    accumulator = CalibrationAccumulator(n_bins)
+    for chunk in read_columns(data_path, columns, chunksize=chunksize, dtype=OFFER_DTYPES):
+        # Shift each offer by its fitted covariate effects (0 without covariates)
+        probabilities = sigmoid_recruitment(chunk[SALARY_COLUMN].to_numpy() / 1000, a, b, c,
+                                            k=covariate_shift(chunk, covariates))
+        accumulator.update(chunk[ACCEPTANCE_COLUMN].to_numpy(), probabilities)
+    return accumulator
+
+
+def print_calibration(accumulator):
+    """Print the calibration metrics and reliability table."""
+    reliability = accumulator.reliability()
+    print(f"\nCalibration ({accumulator.n_bins} bins):")
+    print(f"Brier score: {accumulator.brier_score():.4f}")
+    print(f"Expected calibration error: {accumulator.expected_calibration_error():.4f}")
+    print(f"Max calibration error: {accumulator.max_calibration_error():.4f}")
+    print(f"  Predicted bin       N   Mean predicted   Observed")
+    for lower, upper, n, predicted, observed in zip(*reliability.values()):
+        if n > 0:
+            print(f"  {lower:.2f}-{upper:.2f} {n:>10.0f} {predicted:>16.3f} {observed:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calibration diagnostics for recruitment predictions')
+    parser.add_argument('test_file', help='Path to CSV file or .offers directory with test data')
+    parser.add_argument('--params', default='parameters.json', help='Path to parameters file')
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS,
+                        help=f'Number of reliability bins (default: {DEFAULT_BINS})')
+    parser.add_argument('--chunksize', type=int, default=1_000_000,
+                        help='Rows read per chunk (default: 1000000)')
+    parser.add_argument('--output', default=None, help='Save the calibration summary to this JSON file')
+
+    args = parser.parse_args()
+
+    with open(args.params, 'r') as f:
+        params = json.load(f)
+    curve = params['curve_parameters']
+
+    accumulator = stream_calibration(args.test_file, curve['a'], curve['b'], curve['c'],
+                                     args.bins, args.chunksize, params.get('covariates'))
+    print(f"Scored {accumulator.total:.0f} offers")
+    print_calibration(accumulator)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(accumulator.summary(), f, indent=2)
+        print(f"\nCalibration summary saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
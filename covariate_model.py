@@ -0,0 +1,147 @@
+"""
+Offer covariates as fitted shifts of the recruitment curve.
+
+In the app, culture moves the inflection point by k ($1000s) and cost of
+living rescales the salary, both set by hand with sliders. Here culture,
+cost of living and faculty rank are columns of the offer data and each
+shifts the curve by a fitted amount:
+
+    P = a / (1 + exp(-b * (x - (c - k)))),    k = Z @ beta
+
+Z is the design matrix: numeric covariates enter centred (culture at 0,
+cost of living at the national index 100) and rank as one indicator per
+level other than the most common one, so (a, b, c) is the curve for a
+baseline offer and each beta is in $1000s of compensation per unit. The
+coefficients are stored in the parameters file's 'covariates' section,
+and scoring rebuilds Z from the same columns so every offer gets its own
+shift without slider tuning.
+"""
+
+import numpy as np
+
+from recruitment_core import sigmoid_recruitment, find_salary_for_probability
+
+# Covariate values at which there is no shift
+COVARIATE_CENTERS = {'culture': 0.0, 'cost_of_living': 100.0}
+
+
+def covariate_features(frame, culture_column=None, cost_of_living_column=None, rank_column=None):
+    """
+    Describe the design matrix columns for the given input columns.
+
+    Parameters:
+    frame: DataFrame holding the covariate columns
+    culture_column: column with each offer's culture score
+    cost_of_living_column: column with each offer's cost of living index
+    rank_column: column with each offer's faculty rank (categorical)
+
+    Returns:
+    List of feature dicts: numeric features have 'name', 'column' and
+    'center'; rank indicators have 'name', 'column' and 'level'
+    """
+    features = []
+    for name, column in (('culture', culture_column), ('cost_of_living', cost_of_living_column)):
+        if column:
+            features.append({'name': name, 'column': column, 'center': COVARIATE_CENTERS[name]})
+
+    if rank_column:
+        levels, counts = np.unique(frame[rank_column].astype(str).to_numpy(), return_counts=True)
+        baseline = levels[np.argmax(counts)]
+        features.extend({'name': f'rank={level}', 'column': rank_column, 'level': str(level)}
+                        for level in levels if level != baseline)
+    return features
+
+
+def covariate_columns(features):
+    """Input columns needed to build the design matrix, in order."""
+    return list(dict.fromkeys(feature['column'] for feature in features))
+
+
+def design_matrix(frame, features):
+    """
+    Build the (n_offers, n_features) design matrix.
+
+    Ranks not seen when the features were defined get no shift (baseline).
+    """
+    design = np.empty((len(frame), len(features)))
+    for j, feature in enumerate(features):
+        values = frame[feature['column']]
+        if 'level' in feature:
+            design[:, j] = values.astype(str).to_numpy() == feature['level']
+        else:
+            design[:, j] = values.to_numpy(dtype=float) - feature['center']
+    return design
+
+
+def covariate_section(features, coefficients, covariance):
+    """
+    'covariates' section of a parameters file.
+
+    Parameters:
+    features: feature dicts from covariate_features
+    coefficients: fitted shift per feature ($1000s per unit)
+    covariance: covariance matrix of the coefficients
+
+    Returns:
+    Dictionary with one entry per feature, each with its coefficient and standard error
+    """
+    errors = np.sqrt(np.abs(np.diag(covariance)))
+    return {
+        'features': [
+            {**feature, 'coefficient': float(coefficient), 'std_error': float(error)}
+            for feature, coefficient, error in zip(features, coefficients, errors)
+        ],
+        'description': "Shift of the inflection point in $1000s per unit of each covariate "
+                       "(positive = more likely to accept); (a, b, c) is the curve at culture 0, "
+                       "cost of living 100 and the baseline rank"
+    }
+
+
+def covariate_shift(frame, covariates):
+    """
+    Per-offer shift k from a parameters file's 'covariates' section.
+
+    Parameters:
+    frame: DataFrame holding the covariate columns
+    covariates: the 'covariates' section (None for no shift)
+
+    Returns:
+    Array of shifts in $1000s (zeros without covariates)
+    """
+    if not covariates:
+        return np.zeros(len(frame))
+    features = covariates['features']
+    coefficients = np.array([feature['coefficient'] for feature in features])
+    return design_matrix(frame, features) @ coefficients
+
+
+def score_covariate_offers(salary, a, b, c, shift, target_probability=0.8):
+    """
+    Score salary offers with fitted covariate shifts.
+
+    Mirrors recruitment_core.score_offers, with the fitted shift in place of
+    the culture factor and cost of living adjustment.
+
+    Parameters:
+    salary: salary offers in $USD
+    a, b, c: baseline curve parameters
+    shift: per-offer shift from covariate_shift
+    target_probability: probability the recommended salary should achieve
+
+    Returns:
+    Dictionary of arrays: 'probability' (baseline offer), 'culture_adjusted_probability'
+    (with the offer's covariates) and 'recommended_salary' ($USD reaching the
+    target for the offer's covariates; NaN if unattainable)
+    """
+    salary, shift = np.broadcast_arrays(np.asarray(salary, dtype=float), np.asarray(shift, dtype=float))
+    x = salary / 1000.0
+
+    recommended = np.empty(salary.shape)
+    find_salary_for_probability(target_probability, a, b, c, shift, out=recommended)
+    recommended *= 1000.0
+
+    return {
+        'probability': sigmoid_recruitment(x, a, b, c, out=np.empty(salary.shape)),
+        'culture_adjusted_probability': sigmoid_recruitment(x, a, b, c, shift, out=np.empty(salary.shape)),
+        'recommended_salary': recommended,
+    }
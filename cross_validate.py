@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Cross-validate the fit -> test pipeline on one offer file.
+
+Splits the offers into folds, fits the curve on each training split with
+the same fitting code as fit_parameters.py, scores the held-out split with
+the test_predictions.py metrics, and aggregates AUC, RMSE and calibration
+across folds into one report. Per-fold calibration accumulators are also
+merged into one reliability curve over all held-out predictions.
+
+Two split schemes are supported:
+    kfold     random k-fold: every offer is held out exactly once
+    rolling   rolling origin: offers are ordered in time (file order, or
+              --time-column) and cut into k + 1 consecutive blocks; fold i
+              trains on blocks 0..i and tests on block i + 1, so the model
+              is always evaluated on offers made after its training data
+
+Folds run in parallel across worker processes. Each worker loads the file
+once (a '.offers' directory is memory-mapped rather than parsed; a file
+rewritten at the same path is loaded again) and
+derives its split from the seed, so no row indices are shipped between
+processes and results do not depend on the number of workers.
+
+Usage:
+    python cross_validate.py offers.csv --folds 5
+    python cross_validate.py offers.offers --scheme rolling --folds 4 --time-column offer_date
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from recruitment_core import sigmoid_recruitment
+from likelihood_fit import aggregate_offers
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, data_files, read_offers, read_columns
+from fit_parameters import fit_offer_arrays
+from test_predictions import prediction_metrics
+from calibration import CalibrationAccumulator, DEFAULT_BINS
+
+SCHEMES = ('kfold', 'rolling')
+
+# Per-fold metrics averaged in the report
+SUMMARY_METRICS = ('auc', 'rmse', 'accuracy', 'precision', 'recall', 'f1_score',
+                   'brier_score', 'expected_calibration_error',
+                   'mean_predicted', 'observed_rate', 'calibration_in_the_large')
+
+
+def _load_offers(data_path, time_column=None):
+    """
+    Salaries ($1000s), outcomes and time order of an offer file, loaded once per process.
+
+    The cache is keyed on the mtime and size of the file's data files, like
+    fit_cache.py, so a file rewritten at the same path is read again.
+    """
+    columns = [SALARY_COLUMN, ACCEPTANCE_COLUMN] + ([time_column] if time_column else [])
+    stamps = tuple((stat.st_mtime_ns, stat.st_size)
+                   for stat in map(os.stat, data_files(data_path, columns)))
+    return _load_offer_file(data_path, time_column, stamps)
+
+
+@lru_cache(maxsize=1)
+def _load_offer_file(data_path, time_column, stamps):
+    df = read_offers(data_path)
+    salaries = df[SALARY_COLUMN].to_numpy() / 1000
+    acceptances = df[ACCEPTANCE_COLUMN].to_numpy(dtype=float)
+    if time_column:
+        times = read_columns(data_path, [time_column])[time_column].to_numpy()
+        order = np.argsort(times, kind='stable')
+    else:
+        order = None
+    return salaries, acceptances, order
+
+
+def fold_indices(n_rows, n_folds, fold, scheme='kfold', seed=0, order=None):
+    """
+    Training and test row indices of one fold.
+
+    Parameters:
+    n_rows: number of offers
+    n_folds: number of folds
+    fold: fold number (0-based)
+    scheme: 'kfold' or 'rolling'
+    seed: random seed for the k-fold assignment
+    order: row indices in time order for 'rolling' (default: file order)
+
+    Returns:
+    (train_indices, test_indices)
+    """
+    if scheme == 'kfold':
+        assignment = np.random.default_rng(seed).permutation(n_rows) % n_folds
+        return np.flatnonzero(assignment != fold), np.flatnonzero(assignment == fold)
+    if scheme == 'rolling':
+        order = np.arange(n_rows) if order is None else order
+        blocks = np.array_split(order, n_folds + 1)
+        return np.concatenate(blocks[:fold + 1]), blocks[fold + 1]
+    raise ValueError(f"Unknown scheme: {scheme}")
+
+
+def _run_fold(task):
+    """Fit on one training split and evaluate on its held-out offers."""
+    data_path, scheme, n_folds, fold, seed, time_column, bin_width, threshold, n_bins = task
+    salaries, acceptances, order = _load_offers(data_path, time_column)
+    train, test = fold_indices(len(salaries), n_folds, fold, scheme, seed, order)
+
+    # Fit on salary bins: identical to the row-level fit for exact salaries
+    bins = aggregate_offers(salaries[train], acceptances[train], bin_width / 1000)
+    fit = fit_offer_arrays(bins[0], bins[2], bins[1], verbose=False)
+    curve = fit['curve_parameters']
+
+    actual = acceptances[test]
+    probabilities = sigmoid_recruitment(salaries[test], curve['a'], curve['b'], curve['c'])
+
+    metrics = prediction_metrics(actual.astype(int), probabilities, threshold)
+    calibration = CalibrationAccumulator(n_bins).update(actual, probabilities)
+    mean_predicted = float(probabilities.mean())
+    observed_rate = float(actual.mean())
+    metrics.update({
+        'fold': fold,
+        'n_train': len(train),
+        'n_test': len(test),
+        'curve_parameters': {name: curve[name] for name in ('a', 'b', 'c')},
+        'rmse': float(np.sqrt(np.mean((actual - probabilities) ** 2))),
+        'mean_predicted': mean_predicted,
+        'observed_rate': observed_rate,
+        'calibration_in_the_large': observed_rate - mean_predicted,
+        'brier_score': calibration.brier_score(),
+        'expected_calibration_error': calibration.expected_calibration_error(),
+    })
+    return metrics, calibration
+
+
+def cross_validate(data_path, n_folds=5, scheme='kfold', seed=0, time_column=None,
+                   bin_width=0, threshold=0.5, n_workers=None, calibration_bins=DEFAULT_BINS):
+    """
+    Cross-validate the recruitment curve fit on an offer file.
+
+    Parameters:
+    data_path: Path to CSV file or '.offers' directory with offer data
+    n_folds: number of folds
+    scheme: 'kfold' (random folds) or 'rolling' (time-ordered expanding window)
+    seed: random seed for the k-fold assignment
+    time_column: column giving the time order for 'rolling' (default: file order)
+    bin_width: salary bin width in $USD for the per-fold fits (0 for exact salaries)
+    threshold: classification threshold for accuracy, precision and recall
+    n_workers: worker processes (default: all cores)
+    calibration_bins: number of reliability bins for the calibration metrics
+
+    Returns:
+    Dictionary with the per-fold metrics, their mean and standard deviation,
+    and the calibration of all held-out predictions pooled across folds
+    """
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown scheme: {scheme}")
+    if n_folds < 2:
+        raise ValueError("At least 2 folds are required")
+
+    tasks = [
+        (data_path, scheme, n_folds, fold, seed, time_column, bin_width, threshold, calibration_bins)
+        for fold in range(n_folds)
+    ]
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    if n_workers <= 1:
+        outputs = [_run_fold(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            outputs = list(pool.map(_run_fold, tasks))
+    folds = [metrics for metrics, _ in outputs]
+
+    # Calibration sums merge exactly, so pooling the folds needs no predictions
+    pooled = CalibrationAccumulator(calibration_bins)
+    for _, calibration in outputs:
+        pooled.merge(calibration)
+
+    summary = {}
+    for name in SUMMARY_METRICS:
+        values = np.array([fold[name] for fold in folds], dtype=float)
+        summary[name] = {'mean': float(np.nanmean(values)), 'std': float(np.nanstd(values))}
+
+    return {
+        'data_file': data_path,
+        'scheme': scheme,
+        'n_folds': n_folds,
+        'seed': seed,
+        'time_column': time_column,
+        'threshold': threshold,
+        'summary': summary,
+        'pooled_calibration': pooled.summary(),
+        'folds': folds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-validate the recruitment curve fit')
+    parser.add_argument('data_file', help='Path to CSV file or .offers directory with offer data')
+    parser.add_argument('--folds', type=int, default=5, help='Number of folds (default: 5)')
+    parser.add_argument('--scheme', choices=SCHEMES, default='kfold',
+                        help='Random k-fold or time-ordered rolling origin (default: kfold)')
+    parser.add_argument('--time-column', default=None,
+                        help='Column giving the time order for --scheme rolling (default: file order)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for k-fold assignment')
+    parser.add_argument('--bin-width', type=float, default=0,
+                        help='Salary bin width in $USD for the per-fold fits (default: 0, exact salaries)')
+    parser.add_argument('--threshold', type=float, default=0.5, help='Classification threshold')
+    parser.add_argument('--calibration-bins', type=int, default=DEFAULT_BINS,
+                        help=f'Number of reliability bins for calibration (default: {DEFAULT_BINS})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: all cores)')
+    parser.add_argument('--output', default='cv_results.json',
+                        help='Output JSON file (default: cv_results.json)')
+
+    args = parser.parse_args()
+
+    if args.folds < 2:
+        parser.error("--folds must be at least 2")
+
+    results = cross_validate(args.data_file, args.folds, args.scheme, args.seed, args.time_column,
+                             args.bin_width, args.threshold, args.workers, args.calibration_bins)
+
+    print(f"\n{args.folds}-fold cross-validation ({args.scheme}) on {args.data_file}:")
+    print(f"  Fold   N train   N test     AUC    RMSE  Accuracy    Brier     ECE")
+    for fold in results['folds']:
+        print(f"  {fold['fold']:>4} {fold['n_train']:>9} {fold['n_test']:>8} {fold['auc']:>7.3f} "
+              f"{fold['rmse']:>7.3f} {fold['accuracy']:>9.3f} {fold['brier_score']:>8.4f} "
+              f"{fold['expected_calibration_error']:>7.4f}")
+
+    print(f"\nMean (std) across folds:")
+    for name, stats in results['summary'].items():
+        print(f"  {name}: {stats['mean']:.3f} ({stats['std']:.3f})")
+
+    pooled = results['pooled_calibration']
+    print(f"\nPooled held-out calibration: Brier {pooled['brier_score']:.4f}, "
+          f"ECE {pooled['expected_calibration_error']:.4f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\nCross-validation results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+On-disk cache of curve fits keyed by the content of the offer data.
+
+The cache key is a SHA-256 over the bytes of the input's columns (the CSV
+file, or the column/part files of a '.offers' directory) and the fit
+options that change the result. Refitting an unchanged dataset therefore
+returns the stored parameters without parsing or fitting anything. File
+digests are memoized by (path, modification time, size), as in
+parameter_store, so an untouched file is not even reread.
+
+When the data has changed, the fit warm-starts from the cached solution
+whose data is most similar: closest salary mean, salary spread and
+acceptance rate. This usually saves most of the Newton iterations. Entries
+are JSON files in the cache directory. When their total size exceeds the
+limit, the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from offer_data import data_files
+
+DEFAULT_CACHE_DIR = '.fit_cache'
+DEFAULT_CACHE_BYTES = 64 * 2 ** 20
+
+# Memoized file digests, keyed by absolute path
+DIGEST_FILE = 'digests.json'
+
+_BLOCK_SIZE = 1 << 20
+
+
+def data_fingerprint(salaries, acceptances, n_offers=None):
+    """
+    Summary of an offer dataset used to find the most similar cached fit.
+
+    Returns:
+    List of (mean salary, salary standard deviation) in $100Ks and the acceptance rate
+    """
+    x = np.asarray(salaries, dtype=float)
+    weights = np.ones_like(x) if n_offers is None else np.asarray(n_offers, dtype=float)
+    mean = np.average(x, weights=weights)
+    spread = np.sqrt(np.average((x - mean) ** 2, weights=weights))
+    rate = np.sum(acceptances) / np.sum(weights)
+    return [float(mean / 100), float(spread / 100), float(rate)]
+
+
+class FitCache:
+    """
+    Fit results on disk, keyed by data content and fit options.
+
+    Parameters:
+    cache_dir: directory holding the cache entries
+    max_bytes: total size of the entries above which the least recently used are evicted
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._digest_path = os.path.join(cache_dir, DIGEST_FILE)
+        try:
+            with open(self._digest_path, 'r') as f:
+                self._digests = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._digests = {}
+
+    def _file_digest(self, path):
+        """SHA-256 of a file, recomputed only when its mtime or size changes."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        memo = self._digests.get(path)
+        if memo is not None and memo['stamp'] == stamp:
+            return memo['digest']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+                digest.update(block)
+        self._digests[path] = {'stamp': stamp, 'digest': digest.hexdigest()}
+
+        # Forget files that no longer exist
+        self._digests = {name: memo for name, memo in self._digests.items() if os.path.exists(name)}
+        with open(self._digest_path, 'w') as f:
+            json.dump(self._digests, f)
+        return self._digests[path]['digest']
+
+    def key(self, data_path, columns, options):
+        """
+        Cache key of a fit.
+
+        Parameters:
+        data_path: CSV file or '.offers' directory
+        columns: columns the fit reads
+        options: JSON-serializable fit options that affect the result
+        """
+        digest = hashlib.sha256()
+        for path in data_files(data_path, columns):
+            digest.update(self._file_digest(path).encode())
+        digest.update(json.dumps({'columns': columns, **options}, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def _entry_paths(self):
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if name.endswith('.json') and name != DIGEST_FILE]
+
+    def get(self, key):
+        """Cached fit results for a key, or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)  # mark as recently used
+        return entry['results']
+
+    def nearest(self, fingerprint):
+        """
+        (a, b, c) of the cached fit whose data fingerprint is closest.
+
+        Returns:
+        List of parameters, or None when the cache is empty
+        """
+        best, best_distance = None, np.inf
+        for path in self._entry_paths():
+            try:
+                with open(path, 'r') as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            distance = np.linalg.norm(np.subtract(entry['fingerprint'], fingerprint))
+            if distance < best_distance:
+                curve = entry['results']['curve_parameters']
+                best, best_distance = [curve['a'], curve['b'], curve['c']], distance
+        return best
+
+    def put(self, key, fingerprint, results):
+        """Store fit results, then evict old entries beyond the size limit."""
+        path = self._entry_path(key)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'results': results}, f)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self._entry_paths():
+            stat = os.stat(path)
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
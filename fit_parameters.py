@@ -3,110 +3,339 @@
 Fit sigmoid recruitment curve parameters from offer/acceptance data.
 
 This script reads a CSV file with 'salary offer ($USD)' and 'acceptance' columns,
-fits the sigmoid curve parameters, and updates the parameters.json file.
+fits the sigmoid curve parameters by maximum likelihood, and updates the
+parameters.json file.
 """
 
 import numpy as np
-import pandas as pd
-from scipy.optimize import curve_fit
-from scipy.stats import norm
 import json
+import os
 import argparse
 from datetime import datetime
 import matplotlib.pyplot as plt
 
+from recruitment_core import sigmoid_recruitment, find_salary_for_probability
+from likelihood_fit import aggregate_offers, default_start, fit_maximum_likelihood, fit_covariate_model
+from offer_data import (SALARY_COLUMN, ACCEPTANCE_COLUMN, read_offers, read_offer_bins, read_columns,
+                        read_group_offer_bins)
+from bootstrap_fit import bootstrap_parameters, summarize_bootstrap
+from hierarchical_fit import (PARAMETER_NAMES, fit_group_bins, fit_grouped, parameter_set_name, parameter_set_names,
+                              stack_group_bins)
+from covariate_model import covariate_features, design_matrix, covariate_section
+from fit_cache import FitCache, DEFAULT_CACHE_BYTES, data_fingerprint
+from parameter_store import PARAMETER_SETS_DIR
 
-def sigmoid_recruitment(x, a, b, c):
+
+def estimate_culture_effects(salaries, acceptances, a, b, c, n_offers=None, predictions=None):
     """
-    Calculate recruitment probability using sigmoidal dose-response curve
+    Estimate the culture effect implied by each surprising offer outcome.
+    
+    Accepted offers the model scored below 50% suggest a positive culture
+    effect: the gap between the salary that reaches 80% and the offer. Rejected
+    offers scored above 50% suggest a negative effect, measured against the
+    salary that reaches 20%. Both reference salaries are computed once and the
+    gaps for all offers in one vectorized pass.
     
     Parameters:
-    x: compensation in thousands
-    a: maximum probability (asymptote)
-    b: slope (steepness)
-    c: inflection point
+    salaries: compensation in thousands
+    acceptances: 0/1 outcomes, or accepted counts per salary bin
+    a, b, c: fitted curve parameters
+    n_offers: offers per salary bin (None for individual offers)
+    predictions: model probabilities at salaries, if already computed
+    
+    Returns:
+    Tuple of (culture_effects, weights) arrays; weights count the offers
+    behind each effect (all ones for individual offers)
     """
-    return a / (1 + np.exp(-b * (x - c)))
+    x = np.asarray(salaries, dtype=float)
+    accepted = np.asarray(acceptances, dtype=float)
+    rejected = (1 if n_offers is None else np.asarray(n_offers, dtype=float)) - accepted
+    if predictions is None:
+        predictions = sigmoid_recruitment(x, a, b, c)
+    
+    effects = []
+    weights = []
+    
+    # For accepted offers where model predicted low probability
+    # these might indicate positive culture effects
+    positive_salary = find_salary_for_probability(0.8, a, b, c)
+    if positive_salary is not None:
+        positive_mask = (accepted > 0) & (predictions < 0.5)
+        effects.append(positive_salary - x[positive_mask])
+        weights.append(accepted[positive_mask])
+    
+    # For rejected offers where model predicted high probability
+    # these might indicate negative culture effects
+    negative_salary = find_salary_for_probability(0.2, a, b, c)
+    if negative_salary is not None:
+        negative_mask = (rejected > 0) & (predictions > 0.5)
+        effects.append(negative_salary - x[negative_mask])
+        weights.append(rejected[negative_mask])
+    
+    if not effects:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(effects), np.concatenate(weights)
 
 
-def fit_curve_parameters(data_path, plot=False):
+def fit_curve_parameters(data_path, plot=False, aggregate=False, bin_width=0, chunksize=None,
+                         culture_output=None, bootstrap=0, seed=0, n_workers=None,
+                         target_probability=0.8, culture_column=None, cost_of_living_column=None,
+                         rank_column=None, cache_dir=None, cache_bytes=DEFAULT_CACHE_BYTES):
     """
     Fit sigmoid curve parameters from offer/acceptance data.
     
     Parameters:
-    data_path: Path to CSV file with 'salary offer ($USD)' and 'acceptance' columns
+    data_path: Path to CSV file with 'salary offer ($USD)' and 'acceptance' columns,
+               or to a columnar '.offers' directory (memory-mapped)
     plot: Whether to show a plot of the fitted curve
+    aggregate: Fit on (salary, n_offers, n_accepted) bins instead of individual rows
+    bin_width: Bin width in $USD when aggregating (0 groups identical salaries only)
+    chunksize: Stream the CSV in chunks of this many rows straight into salary
+               bins, so memory stays flat for files larger than RAM (implies aggregate)
+    culture_output: Optional .npz path to save the culture effect distribution
+    bootstrap: Number of bootstrap replicates for percentile intervals (0 to skip)
+    seed: Random seed for the bootstrap replicates
+    n_workers: Worker processes for the bootstrap (default: all cores)
+    target_probability: Target probability for the bootstrapped recommended salary
+    culture_column, cost_of_living_column, rank_column: Optional covariate columns
+               whose curve shifts are fitted jointly with (a, b, c)
+    cache_dir: Optional fit cache directory: unchanged data with the same options
+               returns the cached fit, changed data warm-starts from the most
+               similar cached fit (not used with plot or culture_output)
+    cache_bytes: Size above which the least recently used cache entries are evicted
     
     Returns:
     Dictionary with fitted parameters and metadata
     """
-    # Load data
-    df = pd.read_csv(data_path)
+    covariate_names = (culture_column, cost_of_living_column, rank_column)
+    columns = [SALARY_COLUMN, ACCEPTANCE_COLUMN] + [column for column in covariate_names if column]
+    
+    # The plot and culture distribution are side effects a cached result cannot replay
+    cache = FitCache(cache_dir, cache_bytes) if cache_dir and not plot and not culture_output else None
+    if cache:
+        options = {
+            'binned': bool(aggregate or bin_width > 0 or chunksize),
+            'bin_width': bin_width,
+            'bootstrap': bootstrap,
+            'seed': seed if bootstrap else None,
+            'target_probability': target_probability if bootstrap else None,
+            'covariates': covariate_names,
+        }
+        cache_key = cache.key(data_path, columns, options)
+        results = cache.get(cache_key)
+        if results is not None:
+            print(f"Unchanged data: using the cached fit from {results['fit_metadata']['date']}")
+            return results
+    
+    covariates = features = None
+    if any(covariate_names):
+        if chunksize:
+            raise ValueError("Covariate fits cannot stream chunks; use --aggregate instead")
+        df = read_columns(data_path, columns)
+        missing = df.isna().any(axis=1)
+        if missing.any():
+            print(f"Skipping {int(missing.sum())} offers with missing covariates")
+            df = df[~missing]
+        features = covariate_features(df, *covariate_names)
+        covariates = design_matrix(df, features)
+        salaries = df[SALARY_COLUMN].to_numpy() / 1000
+        acceptances = df[ACCEPTANCE_COLUMN].to_numpy(dtype=float)
+        n_offers = None
+        n_samples = len(df)
+        del df
+        
+        # Offers sharing a salary and covariate row collapse into one bin
+        if aggregate or bin_width > 0:
+            salaries, n_offers, acceptances, covariates = aggregate_offers(
+                salaries, acceptances, bin_width / 1000, covariates)
+            print(f"Aggregated {n_samples} offers into {len(salaries)} (salary, covariate) bins")
+    elif chunksize:
+        # Single pass over the file, keeping only per-bin sufficient statistics
+        salaries, n_offers, acceptances = read_offer_bins(data_path, bin_width, chunksize)
+        n_samples = int(n_offers.sum())
+        print(f"Streamed {n_samples} offers into {len(salaries)} salary bins")
+    else:
+        # Load data
+        df = read_offers(data_path)
+        n_samples = len(df)
+        
+        # Convert salary to thousands
+        salaries = df['salary offer ($USD)'].to_numpy() / 1000
+        acceptances = df['acceptance'].to_numpy(dtype=float)
+        n_offers = None
+        del df
+        
+        # Collapse rows into weighted bins so the fit scales with distinct salaries
+        if aggregate or bin_width > 0:
+            salaries, n_offers, acceptances = aggregate_offers(salaries, acceptances, bin_width / 1000)
+            print(f"Aggregated {n_samples} offers into {len(salaries)} salary bins")
+    
+    p0 = None
+    if cache:
+        fingerprint = data_fingerprint(salaries, acceptances, n_offers)
+        p0 = cache.nearest(fingerprint)
+    
+    results = fit_offer_arrays(salaries, acceptances, n_offers, plot=plot, culture_output=culture_output,
+                               bootstrap=bootstrap, seed=seed, n_workers=n_workers,
+                               target_probability=target_probability, covariates=covariates,
+                               covariate_features=features, p0=p0)
+    if cache:
+        results['fit_metadata']['warm_start'] = p0
+        cache.put(cache_key, fingerprint, results)
+    return results
+
+
+def fit_group_parameters(data_path, group_column, shared_results, bin_width=0, pooling_scale=None,
+                         output_dir=PARAMETER_SETS_DIR, chunksize=None):
+    """
+    Fit partially pooled curves per department/region and save one parameter set each.
+    
+    Parameters:
+    data_path: Path to CSV file or '.offers' directory with offer data
+    group_column: Column holding each offer's department or region
+    shared_results: Results of fit_curve_parameters on all offers (the pooling target)
+    bin_width: Salary bin width in $USD for the group fits (0 for exact salaries)
+    pooling_scale: Prior standard deviations for (a, b, c) (default: estimated from the groups)
+    output_dir: Directory for the per-group parameter files (read by the app)
+    chunksize: If given, stream the file in chunks of this many rows into
+               per-group salary bins instead of loading it whole
+    
+    Returns:
+    Dictionary mapping each group label to its saved parameter file
+    """
+    shared = shared_results['curve_parameters']
+    shared_params = [shared[name] for name in PARAMETER_NAMES]
+    if chunksize:
+        group_bins, n_skipped = read_group_offer_bins(data_path, group_column, bin_width, chunksize)
+        fit = fit_group_bins(*stack_group_bins(group_bins), shared_params, pooling_scale)
+    else:
+        df = read_columns(data_path, [SALARY_COLUMN, ACCEPTANCE_COLUMN, group_column])
+        missing = df[group_column].isna()
+        n_skipped = int(missing.sum())
+        df = df[~missing]
+        fit = fit_grouped(df[group_column].astype(str).to_numpy(),
+                          df[SALARY_COLUMN].to_numpy() / 1000,
+                          df[ACCEPTANCE_COLUMN].to_numpy(dtype=float),
+                          bin_width / 1000,
+                          shared_params=shared_params,
+                          pooling_scale=pooling_scale)
+        del df
+    if n_skipped:
+        print(f"Skipping {n_skipped} offers without a {group_column}")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    scale = dict(zip(PARAMETER_NAMES, fit['pooling_scale'].tolist()))
+    saved = {}
+    
+    print(f"\nPartially pooled fits by {group_column} "
+          f"(prior scale a={scale['a']:.3g}, b={scale['b']:.3g}, c={scale['c']:.3g}):")
+    print(f"  {'Group':<20}{'Offers':>9}{'a':>8}{'b':>9}{'c':>8}   (unpooled a, b, c)")
+    names = parameter_set_names(fit['groups'])
+    for i, group in enumerate(fit['groups']):
+        params = dict(zip(PARAMETER_NAMES, fit['params'][i].tolist()))
+        unpooled = dict(zip(PARAMETER_NAMES, fit['unpooled_params'][i].tolist()))
+        if not fit['converged'][i]:
+            print(f"Warning: pooled fit for {group} did not converge")
+        
+        results = {
+            "curve_parameters": {**params, "description": shared['description']},
+            "culture_bounds": shared_results['culture_bounds'],
+            "fitted": True,
+            "fit_metadata": {
+                "date": datetime.now().isoformat(),
+                "n_samples": int(fit['n_offers'][i]),
+                "method": "partially_pooled_maximum_likelihood",
+                "group_column": group_column,
+                "group": str(group),
+                "log_likelihood": float(fit['log_likelihood'][i]),
+                "shared_parameters": {name: shared[name] for name in PARAMETER_NAMES},
+                "pooling_scale": scale,
+                "unpooled_parameters": unpooled,
+                "parameter_covariance": fit['covariance'][i].tolist()
+            }
+        }
+        if names[i] != parameter_set_name(group):
+            print(f"Note: saving {group} as parameter set '{names[i]}' to avoid a name collision")
+        path = os.path.join(output_dir, names[i] + '.json')
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        saved[str(group)] = path
+        
+        print(f"  {str(group):<20}{int(fit['n_offers'][i]):>9}{params['a']:>8.3f}{params['b']:>9.4f}"
+              f"{params['c']:>8.1f}   ({unpooled['a']:.3f}, {unpooled['b']:.4f}, {unpooled['c']:.1f})")
+    
+    print(f"\n{len(saved)} group parameter sets saved to {output_dir}/")
+    return saved
+
+
+def fit_offer_arrays(salaries, acceptances, n_offers=None, plot=False, culture_output=None,
+                     bootstrap=0, seed=0, n_workers=None, target_probability=0.8, verbose=True,
+                     covariates=None, covariate_features=None, p0=None):
+    """
+    Fit sigmoid curve parameters to offers already in memory.
     
-    # Convert salary to thousands
-    salaries = df['salary offer ($USD)'] / 1000
-    acceptances = df['acceptance']
+    Parameters:
+    salaries: Salary offers in $1000s (or bin salaries when n_offers is given)
+    acceptances: 0/1 outcomes (or accepted offers per bin)
+    n_offers: Offers per salary bin (None for individual offers)
+    plot, culture_output, bootstrap, seed, n_workers, target_probability:
+        see fit_curve_parameters
+    verbose: Print the fit summary
+    covariates: Optional design matrix (one row per entry) of covariate shifts to fit
+    covariate_features: Feature descriptions of the covariate columns (from covariate_features)
+    p0: Starting (a, b, c), e.g. a previous fit to warm-start from (default: from the data)
+    
+    Returns:
+    Dictionary with fitted parameters and metadata
+    """
+    if covariates is not None and bootstrap > 0:
+        raise ValueError("Bootstrap intervals are not available for covariate fits")
+    salaries = np.asarray(salaries, dtype=float)
+    acceptances = np.asarray(acceptances, dtype=float)
+    n_samples = len(salaries) if n_offers is None else int(np.sum(n_offers))
     
-    # Initial parameter estimates
-    p0 = [0.9, 0.02, np.median(salaries)]
+    # Offers represented by each entry (1 per row when not aggregated)
+    weights = 1 if n_offers is None else n_offers
     
-    # Bounds for parameters
-    bounds = (
-        [0.5, 0.001, salaries.min()],  # Lower bounds
-        [1.0, 0.1, salaries.max()]      # Upper bounds
-    )
+    # Initial parameter estimates and bounds
+    start, bounds = default_start(salaries, n_offers)
+    p0 = start if p0 is None else np.asarray(p0, dtype=float)
     
-    # Fit the curve
+    # Fit the curve by maximizing the Bernoulli likelihood of the outcomes
     try:
-        popt, pcov = curve_fit(
-            sigmoid_recruitment, 
-            salaries, 
-            acceptances, 
-            p0=p0,
-            bounds=bounds,
-            maxfev=5000
-        )
+        if covariates is None:
+            fit = fit_maximum_likelihood(salaries, acceptances, n_offers, p0=p0, bounds=bounds)
+            shift = 0
+        else:
+            fit = fit_covariate_model(salaries, acceptances, n_offers, covariates, p0=p0, bounds=bounds)
+            shift = covariates @ fit['params'][3:]
+        if not fit['converged']:
+            print(f"Warning: likelihood fit did not converge after {fit['n_iterations']} iterations")
         
+        popt, pcov = fit['params'][:3], fit['covariance'][:3, :3]
         a_fit, b_fit, c_fit = popt
         
-        # Calculate RMSE
-        predictions = sigmoid_recruitment(salaries, *popt)
-        rmse = np.sqrt(np.mean((acceptances - predictions) ** 2))
+        # Calculate RMSE over offers: each entry contributes its accepted
+        # offers with residual (1 - p) and its rejected offers with residual -p
+        predictions = sigmoid_recruitment(salaries, *popt, shift)
+        rejections = weights - acceptances
+        squared_error = acceptances * (1 - predictions) ** 2 + rejections * predictions ** 2
+        rmse = np.sqrt(squared_error.sum() / n_samples)
         
         # Estimate culture parameter bounds from residuals
         # Residuals represent unexplained variance that could be due to culture
-        residuals = acceptances - predictions
-        
-        # For accepted offers where model predicted low probability
-        # these might indicate positive culture effects
-        positive_culture_samples = salaries[
-            (acceptances == 1) & (predictions < 0.5)
-        ]
-        
-        # For rejected offers where model predicted high probability
-        # these might indicate negative culture effects
-        negative_culture_samples = salaries[
-            (acceptances == 0) & (predictions > 0.5)
-        ]
-        
-        # Estimate culture impact as salary equivalent
-        culture_effects = []
-        
-        # For positive culture effects
-        for salary in positive_culture_samples:
-            # Find what salary would give the observed acceptance
-            equiv_salary = c_fit - (1/b_fit) * np.log(a_fit/0.8 - 1)
-            culture_effects.append(equiv_salary - salary)
-        
-        # For negative culture effects
-        for salary in negative_culture_samples:
-            # Find what salary would give the observed rejection
-            equiv_salary = c_fit - (1/b_fit) * np.log(a_fit/0.2 - 1)
-            culture_effects.append(equiv_salary - salary)
+        # (beyond any fitted covariate shifts, which move each offer's effective salary)
+        culture_effects, culture_weights = estimate_culture_effects(
+            salaries + shift, acceptances, a_fit, b_fit, c_fit, n_offers, predictions)
+        
+        if culture_output:
+            np.savez(culture_output, effects=culture_effects, weights=culture_weights)
         
         # Estimate standard deviation of culture effects
         if len(culture_effects) > 0:
-            culture_std = np.std(culture_effects)
+            culture_mean = np.average(culture_effects, weights=culture_weights)
+            culture_std = np.sqrt(np.average(
+                (culture_effects - culture_mean) ** 2, weights=culture_weights))
             # Use 2 standard deviations for bounds (95% confidence)
             culture_bound = min(2 * culture_std, 100)  # Cap at 100k
         else:
@@ -133,21 +362,41 @@ def fit_curve_parameters(data_path, plot=False):
             "fitted": True,
             "fit_metadata": {
                 "date": datetime.now().isoformat(),
-                "n_samples": len(df),
+                "n_samples": n_samples,
+                "n_bins": len(salaries) if n_offers is not None else None,
                 "rmse": float(rmse),
+                "method": "maximum_likelihood",
+                "log_likelihood": float(fit['log_likelihood']),
+                "n_iterations": fit['n_iterations'],
                 "culture_std_estimate": float(culture_std) if len(culture_effects) > 0 else None,
+                "culture_distribution": culture_output,
                 "parameter_covariance": pcov.tolist()
             }
         }
         
+        if covariates is not None:
+            results["covariates"] = covariate_section(
+                covariate_features, fit['params'][3:], fit['covariance'][3:, 3:])
+        
+        if bootstrap > 0:
+            draws = bootstrap_parameters(salaries, acceptances, n_offers, bootstrap,
+                                         p0=popt, bounds=bounds, seed=seed, n_workers=n_workers)
+            results["bootstrap"] = summarize_bootstrap(draws, target_probability, seed=seed)
+        
         if plot:
             plt.figure(figsize=(10, 6))
             
             # Plot data points
-            plt.scatter(salaries[acceptances == 1], acceptances[acceptances == 1], 
-                       color='green', alpha=0.6, label='Accepted', s=50)
-            plt.scatter(salaries[acceptances == 0], acceptances[acceptances == 0], 
-                       color='red', alpha=0.6, label='Rejected', s=50)
+            if n_offers is None:
+                plt.scatter(salaries[acceptances == 1], acceptances[acceptances == 1], 
+                           color='green', alpha=0.6, label='Accepted', s=50)
+                plt.scatter(salaries[acceptances == 0], acceptances[acceptances == 0], 
+                           color='red', alpha=0.6, label='Rejected', s=50)
+            else:
+                # Acceptance rate per bin, sized by number of offers
+                sizes = 20 + 180 * n_offers / n_offers.max()
+                plt.scatter(salaries, acceptances / n_offers, s=sizes,
+                           color='purple', alpha=0.6, label='Bin acceptance rate')
             
             # Plot fitted curve
             x_range = np.linspace(salaries.min() - 50, salaries.max() + 50, 500)
@@ -155,10 +404,16 @@ def fit_curve_parameters(data_path, plot=False):
             plt.plot(x_range, y_fit, 'b-', linewidth=2, label='Fitted Curve')
             
             # Plot confidence bands
-            # Calculate standard errors
-            perr = np.sqrt(np.diag(pcov))
-            y_upper = sigmoid_recruitment(x_range, a_fit + perr[0], b_fit, c_fit)
-            y_lower = sigmoid_recruitment(x_range, a_fit - perr[0], b_fit, c_fit)
+            if bootstrap > 0:
+                # Pointwise 95% band over all bootstrap curves
+                valid = draws[~np.isnan(draws).any(axis=1)]
+                curves = sigmoid_recruitment(x_range, valid[:, :1], valid[:, 1:2], valid[:, 2:])
+                y_lower, y_upper = np.percentile(curves, [2.5, 97.5], axis=0)
+            else:
+                # Calculate standard errors
+                perr = np.sqrt(np.diag(pcov))
+                y_upper = sigmoid_recruitment(x_range, a_fit + perr[0], b_fit, c_fit)
+                y_lower = sigmoid_recruitment(x_range, a_fit - perr[0], b_fit, c_fit)
             plt.fill_between(x_range, y_lower, y_upper, alpha=0.2, color='blue')
             
             plt.xlabel('Salary Offer ($1000s)', fontsize=12)
@@ -176,10 +431,26 @@ def fit_curve_parameters(data_path, plot=False):
             plt.tight_layout()
             plt.show()
         
+        if not verbose:
+            return results
+        
         print(f"Fitting successful!")
         print(f"Parameters: a={a_fit:.3f}, b={b_fit:.3f}, c={c_fit:.1f}")
         print(f"RMSE: {rmse:.3f}")
         print(f"Culture bounds: [{-culture_bound:.0f}, {culture_bound:.0f}]")
+        if covariates is not None:
+            print("Covariate shifts ($1000s per unit):")
+            for feature in results["covariates"]["features"]:
+                print(f"  {feature['name']}: {feature['coefficient']:+.3f} (SE {feature['std_error']:.3f})")
+        if bootstrap > 0:
+            summary = results["bootstrap"]
+            print(f"Bootstrap ({summary['n_converged']}/{summary['n_replicates']} replicates converged):")
+            for name, (low, high) in summary["intervals"].items():
+                print(f"  {name}: [{low:.4g}, {high:.4g}]")
+            salary = summary["recommended_salary"]
+            if salary["interval"]:
+                print(f"  Salary for {target_probability:.0%}: ${salary['median']:.0f}K "
+                      f"[{salary['interval'][0]:.0f}, {salary['interval'][1]:.0f}]")
         
         return results
         
@@ -190,20 +461,74 @@ def fit_curve_parameters(data_path, plot=False):
 
 def main():
     parser = argparse.ArgumentParser(description='Fit recruitment curve parameters from data')
-    parser.add_argument('data_file', help='Path to CSV file with salary and acceptance data')
+    parser.add_argument('data_file', help='Path to CSV file or .offers directory with salary and acceptance data')
     parser.add_argument('--plot', action='store_true', help='Show plot of fitted curve')
     parser.add_argument('--output', default='parameters.json', help='Output JSON file (default: parameters.json)')
+    parser.add_argument('--aggregate', action='store_true',
+                        help='Fit on (salary, offers, acceptances) bins instead of individual rows')
+    parser.add_argument('--bin-width', type=float, default=0,
+                        help='Salary bin width in $USD for --aggregate (default: 0, exact salaries)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Stream the CSV in chunks of this many rows (implies --aggregate)')
+    parser.add_argument('--culture-output', default=None,
+                        help='Save the per-offer culture effect distribution to this .npz file')
+    parser.add_argument('--bootstrap', type=int, default=0,
+                        help='Number of bootstrap replicates for parameter intervals (default: 0, off)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for bootstrap replicates')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for bootstrap (default: all cores)')
+    parser.add_argument('--target-probability', type=float, default=0.8,
+                        help='Target probability for the bootstrapped recommended salary (default: 0.8)')
+    parser.add_argument('--culture-column', default=None,
+                        help='Column with a culture score per offer; its curve shift is fitted')
+    parser.add_argument('--cost-of-living-column', default=None,
+                        help='Column with a cost of living index per offer; its curve shift is fitted')
+    parser.add_argument('--rank-column', default=None,
+                        help='Column with the faculty rank of each offer; a shift per rank is fitted')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Cache fits here: unchanged data returns instantly, changed data warm-starts')
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_CACHE_BYTES / 2 ** 20,
+                        help=f'Cache size limit in MB before old fits are evicted '
+                             f'(default: {DEFAULT_CACHE_BYTES // 2 ** 20})')
+    parser.add_argument('--group-column', default=None,
+                        help='Also fit partially pooled curves per value of this column (department/region)')
+    parser.add_argument('--pooling-scale', type=float, nargs=3, default=None, metavar=('A', 'B', 'C'),
+                        help='Prior standard deviations of the group parameters (default: estimated)')
+    parser.add_argument('--sets-dir', default=PARAMETER_SETS_DIR,
+                        help=f'Directory for the per-group parameter files (default: {PARAMETER_SETS_DIR})')
     
     args = parser.parse_args()
     
+    covariate_names = (args.culture_column, args.cost_of_living_column, args.rank_column)
+    if any(covariate_names) and args.bootstrap > 0:
+        parser.error("--bootstrap cannot be combined with covariate columns")
+    if any(covariate_names) and args.chunksize:
+        parser.error("--chunksize cannot be combined with covariate columns (use --aggregate)")
+    if any(covariate_names) and args.group_column:
+        # The group curves ignore covariates, so a covariate baseline is the wrong pooling target
+        parser.error("--group-column cannot be combined with covariate columns")
+    
     # Fit the parameters
-    results = fit_curve_parameters(args.data_file, plot=args.plot)
+    results = fit_curve_parameters(args.data_file, plot=args.plot,
+                                   aggregate=args.aggregate, bin_width=args.bin_width,
+                                   chunksize=args.chunksize, culture_output=args.culture_output,
+                                   bootstrap=args.bootstrap, seed=args.seed, n_workers=args.workers,
+                                   target_probability=args.target_probability,
+                                   culture_column=args.culture_column,
+                                   cost_of_living_column=args.cost_of_living_column,
+                                   rank_column=args.rank_column, cache_dir=args.cache_dir,
+                                   cache_bytes=int(args.cache_size * 2 ** 20))
     
     # Save to JSON
     with open(args.output, 'w') as f:
         json.dump(results, f, indent=2)
     
     print(f"\nParameters saved to {args.output}")
+    
+    if args.group_column:
+        fit_group_parameters(args.data_file, args.group_column, results, bin_width=args.bin_width,
+                             pooling_scale=args.pooling_scale, output_dir=args.sets_dir,
+                             chunksize=args.chunksize)
 
 
 if __name__ == "__main__":
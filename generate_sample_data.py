@@ -4,132 +4,291 @@ Generate sample recruitment data for testing the fitting script.
 
 This script creates synthetic offer/acceptance data based on the sigmoid model
 with some noise to simulate real-world variation.
+
+Offers are generated in fixed-size chunks, each from its own random stream
+spawned from one SeedSequence, so load-test histories of 10^7-10^9 rows are
+produced chunk by chunk across worker processes with bounded memory, and the
+output for a given seed and chunk size is identical for any number of
+workers. Columnar '.offers' output is written in parallel, either into
+memory-mappable .npy columns or, with --compress, as compressed .npz parts.
 """
 
 import numpy as np
 import pandas as pd
 import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from recruitment_core import sigmoid_recruitment
+from offer_data import (SALARY_COLUMN, ACCEPTANCE_COLUMN, OFFER_DTYPES, COLUMNAR_SUFFIX,
+                        column_file, clear_columnar, write_offers, write_part)
+
+# True parameters (similar to defaults)
+TRUE_PARAMETERS = (0.92, 0.023, 383)
+
+# Salary ranges ($1000s), sampled with equal probability; denser around the inflection point
+TRAINING_SALARY_BANDS = [(280, 350), (350, 450), (450, 600)]
+TEST_SALARY_BANDS = [(300, 550)]
+
+# Salary bands ($1000s) for the printed acceptance-rate summary
+SUMMARY_BAND_EDGES = np.array([280, 350, 400, 450, 500, 600])
+
+# Offers generated per independently seeded chunk
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Chunks submitted to the pool per worker before the oldest result is collected
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def _generate_chunk(rng, n_rows, salary_bands, culture_std, noise_level):
+    """Salaries ($1000s) and 0/1 acceptances for one chunk of offers."""
+    a, b, c = TRUE_PARAMETERS
+    low, high = np.asarray(salary_bands, dtype=float).T
+    band = rng.integers(len(salary_bands), size=n_rows)
+    salaries = low[band] + (high - low)[band] * rng.random(n_rows)
+
+    # Generate hidden culture factors for each offer
+    culture_factors = rng.normal(0, culture_std, n_rows)
+
+    # Calculate true probabilities including culture effects, then add noise
+    probs = sigmoid_recruitment(salaries, a, b, c, culture_factors)
+    probs += rng.normal(0, noise_level, n_rows)
+    np.clip(probs, 0, 1, out=probs)
+
+    # Generate binary acceptances based on probabilities
+    acceptances = (rng.random(n_rows) < probs).astype(np.uint8)
+    return salaries, acceptances
+
+
+def _chunk_summary(salaries, acceptances):
+    """Mergeable summary counts for one chunk."""
+    band = np.searchsorted(SUMMARY_BAND_EDGES, salaries, side='right') - 1
+    in_band = (band >= 0) & (band < len(SUMMARY_BAND_EDGES) - 1)
+    n_bands = len(SUMMARY_BAND_EDGES) - 1
+    return {
+        'n': len(salaries),
+        'accepted': int(acceptances.sum()),
+        'salary_sum': float(salaries.sum()),
+        'salary_min': float(salaries.min()) if len(salaries) else np.inf,
+        'salary_max': float(salaries.max()) if len(salaries) else -np.inf,
+        'band_offers': np.bincount(band[in_band], minlength=n_bands),
+        'band_accepted': np.bincount(band[in_band], weights=acceptances[in_band], minlength=n_bands),
+    }
+
+
+def _merge_summaries(summaries):
+    return {
+        'n': sum(s['n'] for s in summaries),
+        'accepted': sum(s['accepted'] for s in summaries),
+        'salary_sum': sum(s['salary_sum'] for s in summaries),
+        'salary_min': min(s['salary_min'] for s in summaries),
+        'salary_max': max(s['salary_max'] for s in summaries),
+        'band_offers': sum(s['band_offers'] for s in summaries),
+        'band_accepted': sum(s['band_accepted'] for s in summaries),
+    }
+
+
+def _generate_task(task):
+    """Generate one chunk and write it (columnar) or return it (CSV)."""
+    output_file, layout, index, start, n_rows, seed, salary_bands, culture_std, noise_level = task
+    salaries, acceptances = _generate_chunk(
+        np.random.default_rng(seed), n_rows, salary_bands, culture_std, noise_level)
+    salary_usd = (salaries * 1000).astype(OFFER_DTYPES[SALARY_COLUMN])
+
+    if layout == 'npy':
+        # Fill this chunk's slice of the preallocated memory-mapped columns
+        for column, values in ((SALARY_COLUMN, salary_usd), (ACCEPTANCE_COLUMN, acceptances)):
+            target = np.load(os.path.join(output_file, column_file(column)), mmap_mode='r+')
+            target[start:start + n_rows] = values
+            target.flush()
+            del target
+        frame = None
+    elif layout == 'parts':
+        write_part(output_file, index, {SALARY_COLUMN: salary_usd, ACCEPTANCE_COLUMN: acceptances})
+        frame = None
+    else:
+        frame = pd.DataFrame({SALARY_COLUMN: salary_usd, ACCEPTANCE_COLUMN: acceptances})
+
+    return _chunk_summary(salaries, acceptances), frame
+
+
+def _ordered_results(pool, tasks, window):
+    """
+    Results of _generate_task in task order, with at most window tasks in flight.
+
+    pool.map would submit every task up front and hold every finished CSV
+    chunk until the writer reached it, so memory would grow with the number
+    of chunks; here a new task is only submitted once the oldest result has
+    been taken.
+    """
+    tasks = iter(tasks)
+    pending = deque(pool.submit(_generate_task, task) for task in _take(tasks, window))
+    while pending:
+        result = pending.popleft().result()
+        pending.extend(pool.submit(_generate_task, task) for task in _take(tasks, 1))
+        yield result
+
 
+def _take(iterator, n):
+    """Up to the next n items of an iterator."""
+    return [item for _, item in zip(range(n), iterator)]
 
-def sigmoid_recruitment(x, a, b, c, k=0):
+
+def generate_offers(output_file, n_samples, salary_bands, culture_std, noise_level, seed,
+                    chunk_rows=DEFAULT_CHUNK_ROWS, n_workers=None, compress=False):
     """
-    Calculate recruitment probability using sigmoidal dose-response curve
+    Generate synthetic offers in independently seeded chunks and write them.
+
+    Parameters:
+    output_file: Output CSV filename, or a '.offers' directory for columnar output
+    n_samples: Number of offers to generate
+    salary_bands: (low, high) salary ranges in $1000s, sampled with equal probability
+    culture_std: Standard deviation for culture effects
+    noise_level: Standard deviation of the noise added to the probabilities
+    seed: Random seed; chunk i uses the i-th stream spawned from it
+    chunk_rows: Offers per chunk (the output depends on it, not on n_workers)
+    n_workers: Worker processes (default: all cores)
+    compress: Write columnar output as compressed .npz parts instead of .npy columns
+
+    Returns:
+    Dictionary of summary counts (offers, acceptances, salary range, per-band counts)
     """
-    return a / (1 + np.exp(-b * (x - (c - k))))
+    n_chunks = max(-(-n_samples // chunk_rows), 1)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    starts = [i * chunk_rows for i in range(n_chunks)]
+    sizes = [min(chunk_rows, n_samples - start) for start in starts]
+
+    if output_file.rstrip(os.sep).endswith(COLUMNAR_SUFFIX):
+        layout = 'parts' if compress else 'npy'
+        os.makedirs(output_file, exist_ok=True)
+        clear_columnar(output_file)
+        if layout == 'npy':
+            # Preallocate the columns so workers can fill their slices in place
+            for column, dtype in OFFER_DTYPES.items():
+                np.lib.format.open_memmap(os.path.join(output_file, column_file(column)),
+                                          mode='w+', dtype=dtype, shape=(n_samples,))
+    else:
+        layout = 'csv'
+
+    tasks = [
+        (output_file, layout, i, start, size, chunk_seed, salary_bands, culture_std, noise_level)
+        for i, (start, size, chunk_seed) in enumerate(zip(starts, sizes, seeds))
+    ]
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        if pool:
+            results = _ordered_results(pool, tasks, CHUNKS_IN_FLIGHT_PER_WORKER * n_workers)
+        else:
+            results = map(_generate_task, tasks)
+
+        if layout == 'csv':
+            # Chunks arrive in order and are appended as they complete; at most
+            # a couple of chunks per worker are held in memory at once
+            summaries = []
+
+            def frames():
+                for summary, frame in results:
+                    summaries.append(summary)
+                    yield frame
+
+            write_offers(frames(), output_file)
+        else:
+            summaries = [summary for summary, _ in results]
+    finally:
+        if pool:
+            pool.shutdown()
 
+    return _merge_summaries(summaries)
 
-def generate_sample_data(n_samples=200, noise_level=0.1, culture_std=20, 
-                        output_file='sample_recruitment_data.csv', seed=42):
+
+def generate_sample_data(n_samples=200, noise_level=0.1, culture_std=20,
+                        output_file='sample_recruitment_data.csv', seed=42, n_test=50,
+                        chunk_rows=DEFAULT_CHUNK_ROWS, n_workers=None, compress=False):
     """
     Generate synthetic recruitment data.
-    
+
     Parameters:
     n_samples: Number of samples to generate
     noise_level: Amount of noise to add to the model
     culture_std: Standard deviation for culture effects
-    output_file: Output CSV filename
+    output_file: Output CSV filename, or a '.offers' directory for columnar output
     seed: Random seed for reproducibility
+    n_test: Number of samples in the separate test set (0 to skip it)
+    chunk_rows: Offers generated per independently seeded chunk
+    n_workers: Worker processes (default: all cores)
+    compress: Write columnar output as compressed .npz parts
     """
-    np.random.seed(seed)
-    
-    # True parameters (similar to defaults)
-    a_true = 0.92
-    b_true = 0.023
-    c_true = 383
-    
-    # Generate salary offers
-    # Sample more densely around the inflection point
-    salaries_low = np.random.uniform(280, 350, n_samples // 3)
-    salaries_mid = np.random.uniform(350, 450, n_samples // 3)
-    salaries_high = np.random.uniform(450, 600, n_samples - 2 * (n_samples // 3))
-    salaries = np.concatenate([salaries_low, salaries_mid, salaries_high])
-    np.random.shuffle(salaries)
-    
-    # Generate hidden culture factors for each offer
-    culture_factors = np.random.normal(0, culture_std, n_samples)
-    
-    # Calculate true probabilities including culture effects
-    true_probs = sigmoid_recruitment(salaries, a_true, b_true, c_true, culture_factors)
-    
-    # Add noise to probabilities
-    noisy_probs = true_probs + np.random.normal(0, noise_level, n_samples)
-    noisy_probs = np.clip(noisy_probs, 0, 1)
-    
-    # Generate binary acceptances based on probabilities
-    acceptances = np.random.binomial(1, noisy_probs)
-    
-    # Create dataframe
-    df = pd.DataFrame({
-        'salary offer ($USD)': (salaries * 1000).astype(int),
-        'acceptance': acceptances
-    })
-    
-    # Save to CSV
-    df.to_csv(output_file, index=False)
-    
+    summary = generate_offers(output_file, n_samples, TRAINING_SALARY_BANDS, culture_std,
+                              noise_level, seed, chunk_rows, n_workers, compress)
+
     # Print summary statistics
     print(f"Generated {n_samples} samples")
-    print(f"Acceptance rate: {acceptances.mean():.2%}")
-    print(f"Salary range: ${salaries.min():.0f}K - ${salaries.max():.0f}K")
-    print(f"Mean salary: ${salaries.mean():.0f}K")
-    
+    print(f"Acceptance rate: {summary['accepted'] / max(summary['n'], 1):.2%}")
+    print(f"Salary range: ${summary['salary_min']:.0f}K - ${summary['salary_max']:.0f}K")
+    print(f"Mean salary: ${summary['salary_sum'] / max(summary['n'], 1):.0f}K")
+
     # Print acceptance rates by salary band
     print("\nAcceptance rates by salary band:")
-    bands = [(280, 350), (350, 400), (400, 450), (450, 500), (500, 600)]
-    for low, high in bands:
-        mask = (salaries >= low) & (salaries < high)
-        if mask.sum() > 0:
-            rate = acceptances[mask].mean()
-            count = mask.sum()
-            print(f"  ${low}K-${high}K: {rate:.1%} ({count} offers)")
-    
+    for low, high, count, accepted in zip(SUMMARY_BAND_EDGES[:-1], SUMMARY_BAND_EDGES[1:],
+                                          summary['band_offers'], summary['band_accepted']):
+        if count > 0:
+            print(f"  ${low}K-${high}K: {accepted / count:.1%} ({count} offers)")
+
     print(f"\nData saved to {output_file}")
-    
+
     # Generate a separate test set
-    test_file = output_file.replace('.csv', '_test.csv')
-    generate_test_data(test_file, a_true, b_true, c_true, culture_std, seed+1)
-
-
-def generate_test_data(output_file, a, b, c, culture_std, seed):
-    """Generate a smaller test dataset"""
-    np.random.seed(seed)
-    
-    n_test = 50
-    test_salaries = np.random.uniform(300, 550, n_test)
-    test_culture = np.random.normal(0, culture_std * 0.8, n_test)  # Slightly less variation
-    
-    test_probs = sigmoid_recruitment(test_salaries, a, b, c, test_culture)
-    test_probs = np.clip(test_probs + np.random.normal(0, 0.05, n_test), 0, 1)
-    test_acceptances = np.random.binomial(1, test_probs)
-    
-    test_df = pd.DataFrame({
-        'salary offer ($USD)': (test_salaries * 1000).astype(int),
-        'acceptance': test_acceptances
-    })
-    
-    test_df.to_csv(output_file, index=False)
+    if n_test > 0:
+        base, ext = os.path.splitext(output_file.rstrip(os.sep))
+        test_file = base + '_test' + ext
+        generate_test_data(test_file, culture_std, seed+1, n_test, chunk_rows, n_workers, compress)
+
+
+def generate_test_data(output_file, culture_std, seed, n_test=50, chunk_rows=DEFAULT_CHUNK_ROWS,
+                       n_workers=None, compress=False):
+    """Generate a separate test dataset"""
+    # Slightly less culture variation and noise than the training data
+    summary = generate_offers(output_file, n_test, TEST_SALARY_BANDS, culture_std * 0.8, 0.05,
+                              seed, chunk_rows, n_workers, compress)
     print(f"\nTest data ({n_test} samples) saved to {output_file}")
-    print(f"Test acceptance rate: {test_acceptances.mean():.2%}")
+    print(f"Test acceptance rate: {summary['accepted'] / max(summary['n'], 1):.2%}")
 
 
 def main():
     parser = argparse.ArgumentParser(description='Generate sample recruitment data')
     parser.add_argument('--samples', type=int, default=200, help='Number of samples')
+    parser.add_argument('--test-samples', type=int, default=50,
+                        help='Number of samples in the separate test set (default: 50, 0 to skip)')
     parser.add_argument('--noise', type=float, default=0.1, help='Noise level (0-1)')
     parser.add_argument('--culture-std', type=float, default=20, help='Culture effect std dev')
-    parser.add_argument('--output', default='sample_recruitment_data.csv', help='Output filename')
+    parser.add_argument('--output', default='sample_recruitment_data.csv', help='Output filename (.csv, or .offers for columnar)')
     parser.add_argument('--seed', type=int, default=42, help='Random seed')
-    
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f'Offers per independently seeded chunk (default: {DEFAULT_CHUNK_ROWS})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: all cores)')
+    parser.add_argument('--compress', action='store_true',
+                        help='Write .offers output as compressed .npz parts instead of .npy columns')
+
     args = parser.parse_args()
-    
+
+    if args.chunk_rows <= 0:
+        parser.error("--chunk-rows must be positive")
+
     generate_sample_data(
         n_samples=args.samples,
         noise_level=args.noise,
         culture_std=args.culture_std,
         output_file=args.output,
-        seed=args.seed
+        seed=args.seed,
+        n_test=args.test_samples,
+        chunk_rows=args.chunk_rows,
+        n_workers=args.workers,
+        compress=args.compress
     )
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,225 @@
+"""
+Partially pooled recruitment curves for many departments or regions.
+
+Each group's (a, b, c) is fit by penalized maximum likelihood: its binomial
+likelihood plus a Gaussian prior centred on the curve fitted to all offers.
+Large groups are dominated by their own data, while small groups borrow
+strength from the shared curve instead of producing noisy fits. The prior
+scale is estimated from the data (empirical Bayes): the spread of the
+unpooled group estimates minus their typical sampling variance.
+
+All groups are binned on salary, padded with zero-count entries to a common
+length and stacked into one (G, K) batch, so the unpooled and the pooled
+fits are each a single call to the batched Newton solver. Bins streamed
+from a file (offer_data.read_group_offer_bins) go through stack_group_bins
+and fit_group_bins, so the offers never have to be in memory at once.
+"""
+
+import re
+
+import numpy as np
+
+from likelihood_fit import aggregate_offers, default_start, fit_batched, fit_maximum_likelihood
+from parameter_store import DEFAULT_SET_NAME
+
+PARAMETER_NAMES = ('a', 'b', 'c')
+
+# Smallest prior scale, as a fraction of the typical group's standard error; a
+# prior much tighter than the data adds nothing but an ill-conditioned Hessian
+MIN_SCALE_FRACTION = 0.1
+
+
+def group_offer_bins(groups, salaries, acceptances, bin_width=0):
+    """
+    Bin offers by (group, salary) and stack the groups into padded arrays.
+
+    Parameters:
+    groups: group label of each offer
+    salaries: compensation in thousands
+    acceptances: 0/1 outcome of each offer
+    bin_width: salary grid width in thousands (0 for exact salaries)
+
+    Returns:
+    Tuple of (group_names, bin_salaries, n_offers, n_accepted); the last three
+    have shape (G, K) with zero-count padding after each group's bins
+    """
+    names, group_index = np.unique(np.asarray(groups), return_inverse=True)
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(acceptances, dtype=float)
+    keys = np.round(x / bin_width) if bin_width > 0 else x
+
+    # Sort by (group, salary key) and number the distinct pairs
+    order = np.lexsort((keys, group_index))
+    g, k = group_index[order], keys[order]
+    first = np.r_[True, (g[1:] != g[:-1]) | (k[1:] != k[:-1])]
+    bin_id = np.cumsum(first) - 1
+    bin_group = g[first]
+
+    n_offers = np.bincount(bin_id).astype(float)
+    n_accepted = np.bincount(bin_id, weights=y[order])
+    bin_salaries = np.bincount(bin_id, weights=x[order]) / n_offers
+
+    # Position of each bin within its group's row
+    group_start = np.searchsorted(bin_group, np.arange(len(names)))
+    position = np.arange(len(bin_group)) - group_start[bin_group]
+    width = int(np.bincount(bin_group).max())
+
+    # Padding repeats each group's first salary with zero offers
+    x_out = np.repeat(bin_salaries[group_start][:, None], width, axis=1)
+    n_out = np.zeros((len(names), width))
+    y_out = np.zeros((len(names), width))
+    x_out[bin_group, position] = bin_salaries
+    n_out[bin_group, position] = n_offers
+    y_out[bin_group, position] = n_accepted
+    return names, x_out, n_out, y_out
+
+
+def stack_group_bins(group_bins):
+    """
+    Stack per-group salary bins into padded arrays, as group_offer_bins does.
+
+    Parameters:
+    group_bins: dictionary mapping each group name to its
+                (bin_salaries, n_offers, n_accepted), e.g. from
+                offer_data.read_group_offer_bins
+
+    Returns:
+    Tuple of (group_names, bin_salaries, n_offers, n_accepted); the last three
+    have shape (G, K) with zero-count padding after each group's bins
+    """
+    names = np.array(list(group_bins))
+    width = max(len(bins[0]) for bins in group_bins.values())
+    x_out = np.empty((len(names), width))
+    n_out = np.zeros((len(names), width))
+    y_out = np.zeros((len(names), width))
+    for i, (x, n, y) in enumerate(group_bins.values()):
+        # Padding repeats the group's first salary with zero offers
+        x_out[i] = x[0]
+        x_out[i, :len(x)], n_out[i, :len(n)], y_out[i, :len(y)] = x, n, y
+    return names, x_out, n_out, y_out
+
+
+def estimate_pooling_scale(params, covariance, converged=None):
+    """
+    Empirical-Bayes prior scale for each parameter.
+
+    tau^2 = variance of the group estimates - median sampling variance,
+    floored at MIN_SCALE_FRACTION of the median standard error.
+
+    Parameters:
+    params: unpooled group estimates, shape (G, 3)
+    covariance: their covariance matrices, shape (G, 3, 3)
+    converged: optional mask of groups to use
+
+    Returns:
+    Array of prior standard deviations, shape (3,); infinite (no pooling)
+    with fewer than two groups
+    """
+    use = np.ones(len(params), dtype=bool) if converged is None else np.asarray(converged)
+    if use.sum() < 2:
+        return np.full(params.shape[1], np.inf)
+    between = params[use].var(axis=0, ddof=1)
+    within = np.median(np.diagonal(covariance[use], axis1=1, axis2=2), axis=0)
+    floor = MIN_SCALE_FRACTION * np.sqrt(within)
+    return np.maximum(np.sqrt(np.maximum(between - within, 0.0)), floor)
+
+
+def fit_grouped(groups, salaries, acceptances, bin_width=0, shared_params=None, pooling_scale=None):
+    """
+    Fit partially pooled (a, b, c) for every group in one batched solve.
+
+    Parameters:
+    groups: group label of each offer
+    salaries: compensation in thousands
+    acceptances: 0/1 outcome of each offer
+    bin_width: salary grid width in thousands (0 for exact salaries)
+    shared_params: (a, b, c) fitted to all offers (fitted here if not given)
+    pooling_scale: prior standard deviations for (a, b, c); estimated from the
+                   groups when not given (smaller means stronger pooling)
+
+    Returns:
+    Dictionary with 'groups' (names), 'params' (G, 3), 'covariance' (G, 3, 3),
+    'unpooled_params' (G, 3), 'log_likelihood', 'converged', 'n_offers' and
+    'n_accepted' per group, 'shared_params' and 'pooling_scale'
+    """
+    names, x, n, y = group_offer_bins(groups, salaries, acceptances, bin_width)
+    if shared_params is None:
+        p0, bounds = default_start(x.ravel(), n.ravel())
+        all_x, all_n, all_y = aggregate_offers(salaries, acceptances, bin_width)
+        shared_params = fit_maximum_likelihood(all_x, all_y, all_n, p0=p0, bounds=bounds)['params']
+    return fit_group_bins(names, x, n, y, shared_params, pooling_scale)
+
+
+def fit_group_bins(names, x, n, y, shared_params, pooling_scale=None):
+    """
+    Fit partially pooled (a, b, c) for every group from padded salary bins.
+
+    Parameters:
+    names: group names
+    x, n, y: bin salaries in thousands, offers and acceptances, shape (G, K),
+             from group_offer_bins or stack_group_bins
+    shared_params: (a, b, c) fitted to all offers (the pooling target)
+    pooling_scale: prior standard deviations for (a, b, c); estimated from the
+                   groups when not given (smaller means stronger pooling)
+
+    Returns:
+    Same dictionary as fit_grouped
+    """
+    _, bounds = default_start(x.ravel(), n.ravel())
+    shared_params = np.asarray(shared_params, dtype=float)
+
+    # Unpooled fits inform the prior scale
+    unpooled = fit_batched(x, y, n, shared_params, bounds)
+    if pooling_scale is None:
+        pooling_scale = estimate_pooling_scale(
+            unpooled['params'], unpooled['covariance'], unpooled['converged'])
+    pooling_scale = np.asarray(pooling_scale, dtype=float)
+
+    pooled = fit_batched(x, y, n, shared_params, bounds, prior_mean=shared_params,
+                         prior_precision=np.diag(1.0 / pooling_scale ** 2))
+
+    return {
+        'groups': names,
+        'params': pooled['params'],
+        'covariance': pooled['covariance'],
+        'unpooled_params': unpooled['params'],
+        'log_likelihood': pooled['log_likelihood'],
+        'converged': pooled['converged'],
+        'n_offers': n.sum(axis=1),
+        'n_accepted': y.sum(axis=1),
+        'shared_params': shared_params,
+        'pooling_scale': pooling_scale,
+    }
+
+
+def parameter_set_name(group):
+    """File-safe parameter set name for a group label."""
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(group)).strip('._') or 'group'
+    # 'default' is the name of parameters.json in the registry
+    return name + '_group' if name == DEFAULT_SET_NAME else name
+
+
+def parameter_set_names(groups):
+    """
+    Distinct file-safe parameter set names for a list of group labels.
+
+    Labels such as 'A B' and 'A/B' map to the same name, and names that
+    differ only in case share a file on case-insensitive file systems, so
+    later labels in a collision get a numeric suffix ('A_B', 'A_B_2', ...).
+
+    Parameters:
+    groups: group labels, e.g. the 'groups' of fit_grouped (sorted, distinct)
+
+    Returns:
+    List of names in the order of groups
+    """
+    names, taken = [], set()
+    for group in groups:
+        base = name = parameter_set_name(group)
+        suffix = 2
+        while name.lower() in taken:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        taken.add(name.lower())
+        names.append(name)
+    return names
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Update fitted parameters as new offers are appended to the history.
+
+The likelihood fit only needs per-salary sufficient statistics (offers,
+acceptances and salary sum per bin). This script keeps them in a state file
+next to the parameters, together with the position reached in the offer
+file. Each run folds in only the offers appended since then and refits
+(a, b, c), the covariance and the culture bounds from the updated bins.
+It warm-starts from the previous parameters, so Newton usually converges
+in two or three iterations.
+
+The cost is one pass over the new offers plus a fit over the distinct
+salary bins, independent of how long the history is, and the result
+equals a full fit on the same bins. The first run, or a run without a
+state file, makes that full pass and writes the state. A history that was
+rewritten rather than appended to needs a fresh state (--rebuild).
+
+Usage:
+    python incremental_fit.py offers.csv
+    python incremental_fit.py offers.offers --params parameters.json --bin-width 1000
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from offer_data import merge_offer_bins, offer_bins, offers_end, read_offers_after
+from fit_parameters import fit_offer_arrays
+
+STATE_SUFFIX = '.state.npz'
+
+
+def state_path(params_path):
+    """State file stored next to a parameters file."""
+    return os.path.splitext(params_path)[0] + STATE_SUFFIX
+
+
+def load_state(path):
+    """Sufficient statistics and file position saved by save_state."""
+    with np.load(path) as saved:
+        return {
+            'keys': saved['keys'],
+            'totals': saved['totals'],
+            'bin_width': float(saved['bin_width']),
+            'data_file': str(saved['data_file']),
+            'position': json.loads(str(saved['position'])),
+        }
+
+
+def save_state(path, state):
+    """Write the state atomically, so an interrupted run leaves the old state intact."""
+    temp_path = path + '.tmp.npz'
+    np.savez(temp_path, keys=state['keys'], totals=state['totals'], bin_width=state['bin_width'],
+             data_file=state['data_file'], position=json.dumps(state['position']))
+    os.replace(temp_path, path)
+
+
+def update_parameters(data_path, params_path='parameters.json', bin_width=0, chunksize=1_000_000,
+                      state_file=None, rebuild=False):
+    """
+    Fold newly appended offers into the stored statistics and refit.
+
+    Parameters:
+    data_path: offer history (CSV file or '.offers' directory) that grows by appending
+    params_path: parameters file to update
+    bin_width: salary bin width in $USD (0 for exact salaries); fixed by the first run
+    chunksize: rows read per chunk
+    state_file: sufficient-statistics file (default: next to params_path)
+    rebuild: ignore any existing state and make a full pass
+
+    Returns:
+    Dictionary with the fitted parameters, or None when there were no new offers
+    """
+    state_file = state_file or state_path(params_path)
+    data_file = os.path.abspath(data_path)
+    end = offers_end(data_path)
+
+    if os.path.exists(state_file) and not rebuild:
+        state = load_state(state_file)
+        if state['data_file'] != data_file:
+            raise ValueError(f"{state_file} tracks {state['data_file']}, not {data_file}; use --rebuild")
+        if state['bin_width'] != bin_width:
+            raise ValueError(f"{state_file} uses bin width {state['bin_width']:g}; use --rebuild to change it")
+    else:
+        state = {'keys': None, 'totals': None, 'bin_width': bin_width, 'data_file': data_file,
+                 'position': None}
+
+    # Warm start from the current parameters when they describe this history
+    p0 = None
+    if state['position'] is not None and os.path.exists(params_path):
+        with open(params_path, 'r') as f:
+            curve = json.load(f)['curve_parameters']
+        p0 = [curve['a'], curve['b'], curve['c']]
+
+    n_before = 0 if state['totals'] is None else int(state['totals'][0].sum())
+    keys, totals = merge_offer_bins(read_offers_after(data_path, state['position'], end, chunksize),
+                                    bin_width, state['keys'], state['totals'])
+    n_new = int(totals[0].sum()) - n_before
+    if n_new == 0 and p0 is not None:
+        print(f"No new offers in {data_path} since the last update")
+        return None
+    print(f"Folded {n_new} new offers into {len(keys)} salary bins ({n_before + n_new} offers in total)")
+
+    salaries, n_offers, n_accepted = offer_bins(totals)
+    results = fit_offer_arrays(salaries, n_accepted, n_offers, p0=p0)
+    results['fit_metadata']['incremental'] = {
+        'new_offers': n_new,
+        'warm_start': p0 is not None,
+        'state_file': state_file,
+    }
+
+    # State first: if writing the parameters fails, the next run refits the same bins
+    save_state(state_file, {'keys': keys, 'totals': totals, 'bin_width': bin_width,
+                            'data_file': data_file, 'position': end})
+    with open(params_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update fitted parameters with newly appended offers')
+    parser.add_argument('data_file', help='Offer history (CSV file or .offers directory) that grows by appending')
+    parser.add_argument('--params', default='parameters.json',
+                        help='Parameters file to update (default: parameters.json)')
+    parser.add_argument('--state', default=None,
+                        help=f'Sufficient-statistics file (default: next to --params, *{STATE_SUFFIX})')
+    parser.add_argument('--bin-width', type=float, default=0,
+                        help='Salary bin width in $USD, fixed by the first run (default: 0, exact salaries)')
+    parser.add_argument('--chunksize', type=int, default=1_000_000,
+                        help='Rows read per chunk (default: 1000000)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Discard the stored statistics and make a full pass')
+
+    args = parser.parse_args()
+
+    if args.chunksize <= 0:
+        parser.error("--chunksize must be positive")
+
+    start = time.perf_counter()
+    results = update_parameters(args.data_file, args.params, args.bin_width, args.chunksize,
+                                args.state, args.rebuild)
+    elapsed = time.perf_counter() - start
+
+    if results is not None:
+        print(f"\nParameters updated in {elapsed * 1000:.0f} ms and saved to {args.params}")
+
+
+if __name__ == "__main__":
+    main()
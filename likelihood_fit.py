@@ -0,0 +1,469 @@
+"""
+Maximum-likelihood fitting of the sigmoid recruitment curve.
+
+Offer outcomes are Bernoulli (or, for grouped data, binomial) draws with
+success probability a / (1 + exp(-b * (x - c))). The negative
+log-likelihood, its gradient and its Hessian are computed in closed form
+and minimized with a bound-constrained Newton method, which typically
+converges in well under twenty iterations regardless of row count. The
+solver is vectorized over a leading batch axis, so many independent curves
+(bootstrap replicates, groups) are fit together in one set of array operations.
+"""
+
+import numpy as np
+from scipy.special import expit, log_expit
+
+# Keeps p(1 - p) away from zero when forming gradient/Hessian weights
+_PROB_EPS = 1e-12
+
+
+def default_start(salaries, n_offers=None):
+    """
+    Initial estimates and bounds for (a, b, c).
+
+    Parameters:
+    salaries: compensation in thousands
+    n_offers: optional number of offers at each salary (defaults to 1)
+
+    Returns:
+    Tuple of (p0, (lower_bounds, upper_bounds))
+    """
+    x = np.asarray(salaries, dtype=float)
+    n = np.ones_like(x) if n_offers is None else np.asarray(n_offers, dtype=float)
+    present = n > 0
+    x, n = x[present], n[present]
+
+    order = np.argsort(x, kind='stable')
+    cumulative = np.cumsum(n[order])
+    median = x[order][np.searchsorted(cumulative, cumulative[-1] / 2)]
+
+    p0 = np.array([0.9, 0.02, median])
+    bounds = (
+        np.array([0.5, 0.001, x.min()]),  # Lower bounds
+        np.array([1.0, 0.1, x.max()])     # Upper bounds
+    )
+    return p0, bounds
+
+
+def _batched_nll(theta, x, y, n, derivatives):
+    """
+    Negative log-likelihood of G curves at once.
+
+    theta has shape (G, 3); x, y and n broadcast to (G, K) (n may be None
+    for one offer per entry). Returns arrays of shape (G,), (G, 3), (G, 3, 3).
+    """
+    a, b, c = theta[:, 0:1], theta[:, 1:2], theta[:, 2:3]
+
+    d = x - c
+    z = b * d
+    # log p = log a + log s and log(1 - p) = log((1 - a) + e^-z) + log s,
+    # both finite for any z even when a == 1
+    log_s = log_expit(z)
+    with np.errstate(divide='ignore'):
+        log_rest = np.logaddexp(np.log1p(-a), -z)
+    n_failed = (1 if n is None else n) - y
+    nll = -(
+        (log_s if n is None else n * log_s).sum(axis=-1)
+        + np.log(a[:, 0]) * np.broadcast_to(y, d.shape).sum(axis=-1)
+        + (n_failed * log_rest).sum(axis=-1)
+    )
+    if derivatives == 0:
+        return nll
+
+    s = expit(z)
+    u = s * (1 - s)
+    p = np.clip(a * s, _PROB_EPS, 1 - _PROB_EPS)
+
+    # dl/dp for each entry and the Jacobian of p with respect to (a, b, c)
+    r = (y - (1 if n is None else n) * p) / (p * (1 - p))
+    jac = np.stack([np.broadcast_to(s, d.shape), a * u * d, -a * u * b], axis=1)
+    gradient = -(jac @ r[..., None])[..., 0]
+    if derivatives == 1:
+        return nll, gradient
+
+    # d2l/dp2 and the second derivatives of p
+    w = -y / p ** 2 - n_failed / (1 - p) ** 2
+    v = u * (1 - 2 * s)
+    p_ab = u * d
+    p_ac = -u * b
+    p_bb = a * v * d ** 2
+    p_bc = -a * (u + b * d * v)
+    p_cc = a * b ** 2 * v
+
+    hessian = (jac * w[:, None, :]) @ jac.transpose(0, 2, 1)
+    second = np.zeros_like(hessian)
+    second[:, 0, 1] = second[:, 1, 0] = (r * p_ab).sum(axis=-1)
+    second[:, 0, 2] = second[:, 2, 0] = (r * p_ac).sum(axis=-1)
+    second[:, 1, 1] = (r * p_bb).sum(axis=-1)
+    second[:, 1, 2] = second[:, 2, 1] = (r * p_bc).sum(axis=-1)
+    second[:, 2, 2] = (r * p_cc).sum(axis=-1)
+    hessian = -(hessian + second)
+    return nll, gradient, hessian
+
+
+def negative_log_likelihood(theta, salaries, n_accepted, n_offers=None, derivatives=0):
+    """
+    Binomial negative log-likelihood of the recruitment curve.
+
+    Parameters:
+    theta: (a, b, c)
+    salaries: compensation in thousands
+    n_accepted: number of accepted offers at each salary (0/1 for raw rows)
+    n_offers: number of offers at each salary (defaults to 1)
+    derivatives: 0 for the value only, 1 to add the gradient, 2 to add the Hessian
+
+    Returns:
+    nll, or (nll, gradient) or (nll, gradient, hessian)
+    """
+    theta = np.asarray(theta, dtype=float).reshape(1, 3)
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(n_accepted, dtype=float)
+    n = None if n_offers is None else np.asarray(n_offers, dtype=float)
+
+    result = _batched_nll(theta, x, y, n, derivatives)
+    if derivatives == 0:
+        return float(result[0])
+    return (float(result[0][0]),) + tuple(part[0] for part in result[1:])
+
+
+def batched_log_likelihood(theta, salaries, n_accepted, n_offers=None):
+    """
+    Binomial log-likelihood of many (a, b, c) rows on the same offers.
+
+    Parameters:
+    theta: parameters, shape (G, 3)
+    salaries, n_accepted, n_offers: as in negative_log_likelihood
+
+    Returns:
+    Array of log-likelihoods, shape (G,)
+    """
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(n_accepted, dtype=float)
+    n = None if n_offers is None else np.asarray(n_offers, dtype=float)
+    return -_batched_nll(np.asarray(theta, dtype=float), x, y, n, derivatives=0)
+
+
+def _newton_directions(gradient, hessian, free):
+    """Newton steps on the free coordinates, made descent by eigenvalue flooring."""
+    # Pinned coordinates get a unit diagonal and zero gradient, so their step is 0
+    fixed = ~free
+    hessian = hessian.copy()
+    hessian[fixed[:, :, None] | fixed[:, None, :]] = 0.0
+    diagonal = np.arange(hessian.shape[-1])
+    hessian[:, diagonal, diagonal] += fixed
+    gradient = np.where(free, gradient, 0.0)
+
+    eigval, eigvec = np.linalg.eigh(hessian)
+    floor = np.maximum(np.abs(eigval).max(axis=-1, keepdims=True) * 1e-10, 1e-12)
+    eigval = np.maximum(np.abs(eigval), floor)
+    coefficients = (eigvec.transpose(0, 2, 1) @ gradient[..., None])[..., 0] / eigval
+    return -(eigvec @ coefficients[..., None])[..., 0]
+
+
+def _rows(arr, index):
+    """Select batch rows of a per-curve array, passing shared arrays through."""
+    if arr is None or arr.ndim < 2 or arr.shape[0] == 1:
+        return arr
+    return arr[index]
+
+
+def _projected_newton(objective, theta, lower, upper, tol, max_iter):
+    """
+    Minimize G bounded objectives with one vectorized projected Newton loop.
+
+    objective(theta_rows, rows, derivatives) evaluates the curves in rows
+    (indices into the batch) and returns the values, plus gradients and
+    Hessians when derivatives == 2. Curves drop out of the active set as
+    they converge.
+
+    Returns:
+    Tuple of (theta, iterations, converged)
+    """
+    theta = theta.copy()
+    n_curves = len(theta)
+    converged = np.zeros(n_curves, dtype=bool)
+    iterations = np.zeros(n_curves, dtype=int)
+    active = np.arange(n_curves)
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        lo, hi, th = lower[active], upper[active], theta[active]
+        nll, gradient, hessian = objective(th, active, derivatives=2)
+
+        # Coordinates pinned at a bound with the gradient pushing outward stay fixed
+        free = ~(((th <= lo) & (gradient > 0)) | ((th >= hi) & (gradient < 0)))
+        step = _newton_directions(gradient, hessian, free)
+
+        # Backtracking line search on the projected step, per curve
+        slope = (gradient * step).sum(axis=1)
+        t = np.ones(len(active))
+        candidate = np.clip(th + step, lo, hi)
+        candidate_nll = objective(candidate, active, derivatives=0)
+        failing = candidate_nll > nll + 1e-4 * t * slope
+        while failing.any() and t.min() >= 1e-10:
+            t[failing] *= 0.5
+            idx = np.flatnonzero(failing)
+            candidate[idx] = np.clip(th[idx] + t[idx, None] * step[idx], lo[idx], hi[idx])
+            candidate_nll[idx] = objective(candidate[idx], active[idx], derivatives=0)
+            failing[idx] = (candidate_nll[idx] > nll[idx] + 1e-4 * t[idx] * slope[idx]) & (t[idx] >= 1e-10)
+
+        change = (np.abs(candidate - th) / np.maximum(np.abs(th), 1e-8)).max(axis=1)
+        done = (change < tol) | (np.abs(nll - candidate_nll) <= tol * np.maximum(np.abs(nll), 1.0))
+        theta[active] = candidate
+        iterations[active] += 1
+        converged[active[done]] = True
+        active = active[~done]
+
+    return theta, iterations, converged
+
+
+def fit_batched(salaries, n_accepted, n_offers, p0, bounds, tol=1e-9, max_iter=100,
+                prior_mean=None, prior_precision=None):
+    """
+    Fit G independent curves with one vectorized Newton iteration.
+
+    Every curve is advanced by the same array operations, so many small fits
+    (bootstrap replicates, per-group curves) cost little more than one.
+    Curves drop out of the active set as they converge.
+
+    An optional Gaussian prior adds 0.5 * (theta - prior_mean)' P (theta - prior_mean)
+    to each curve's objective, shrinking it toward prior_mean (partial pooling
+    of group curves toward a shared curve).
+
+    Parameters:
+    salaries: compensation in thousands, shape (K,) shared or (G, K)
+    n_accepted: accepted counts, shape (G, K) or broadcastable to it
+    n_offers: offer counts, same shape rules (None for one offer per entry);
+              zero-count entries may be used to pad groups to a common length
+    p0: initial parameters, shape (G, 3) or (3,)
+    bounds: (lower, upper), each of shape (G, 3) or (3,)
+    tol: convergence tolerance on the relative parameter or objective change
+    max_iter: maximum number of Newton iterations
+    prior_mean: optional prior mean, shape (G, 3) or (3,)
+    prior_precision: prior precision matrix P, shape (3, 3) (required with prior_mean)
+
+    Returns:
+    Dictionary with 'params' (G, 3), 'covariance' (G, 3, 3; inverse of the
+    penalized Hessian when a prior is given), 'log_likelihood' (G,; excluding
+    the prior), 'n_iterations' (G,) and 'converged' (G,)
+    """
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(n_accepted, dtype=float)
+    n = None if n_offers is None else np.asarray(n_offers, dtype=float)
+    y = y if y.ndim == 2 else y[None, :]
+    x = x if x.ndim == 2 else x[None, :]
+    n = n if n is None or n.ndim == 2 else n[None, :]
+
+    n_curves = max(arr.shape[0] for arr in (x, y, n) if arr is not None)
+    if np.ndim(p0) == 1:
+        p0 = np.tile(p0, (n_curves, 1))
+    lower, upper = (np.broadcast_to(np.asarray(v, dtype=float), (n_curves, 3)) for v in bounds)
+    theta = np.clip(np.asarray(p0, dtype=float), lower, upper)
+    if prior_mean is not None:
+        prior_mean = np.broadcast_to(np.asarray(prior_mean, dtype=float), (n_curves, 3))
+        prior_precision = np.asarray(prior_precision, dtype=float)
+
+    def objective(th, rows, derivatives):
+        """Objective of the curves in rows (indices into the batch) at th."""
+        result = _batched_nll(th, _rows(x, rows), _rows(y, rows), _rows(n, rows), derivatives)
+        if prior_mean is None:
+            return result
+        offset = th - prior_mean[rows]
+        weighted = offset @ prior_precision
+        penalty = 0.5 * (offset * weighted).sum(axis=1)
+        if derivatives == 0:
+            return result + penalty
+        nll, gradient, hessian = result
+        return nll + penalty, gradient + weighted, hessian + prior_precision
+
+    theta, iterations, converged = _projected_newton(objective, theta, lower, upper, tol, max_iter)
+
+    everything = np.arange(n_curves)
+    nll = _batched_nll(theta, x, y, n, derivatives=0)
+    _, _, hessian = objective(theta, everything, derivatives=2)
+    covariance = np.linalg.pinv(hessian)
+
+    return {
+        'params': theta,
+        'covariance': covariance,
+        'log_likelihood': -nll,
+        'n_iterations': iterations,
+        'converged': converged
+    }
+
+
+def fit_maximum_likelihood(salaries, n_accepted, n_offers=None, p0=None, bounds=None,
+                           tol=1e-9, max_iter=100):
+    """
+    Fit (a, b, c) by maximizing the binomial likelihood.
+
+    Parameters:
+    salaries: compensation in thousands
+    n_accepted: number of accepted offers at each salary (0/1 for raw rows)
+    n_offers: number of offers at each salary (defaults to 1)
+    p0: initial (a, b, c); defaults from default_start
+    bounds: (lower, upper) bounds; defaults from default_start
+    tol: convergence tolerance on the relative parameter change
+    max_iter: maximum number of Newton iterations
+
+    Returns:
+    Dictionary with 'params', 'covariance' (inverse observed information),
+    'log_likelihood', 'n_iterations' and 'converged'
+    """
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(n_accepted, dtype=float)
+    n = None if n_offers is None else np.asarray(n_offers, dtype=float)
+
+    if p0 is None or bounds is None:
+        start, default_bounds = default_start(x, n)
+        p0 = start if p0 is None else p0
+        bounds = default_bounds if bounds is None else bounds
+
+    fit = fit_batched(x, y, n, np.asarray(p0, dtype=float), bounds, tol=tol, max_iter=max_iter)
+    return {
+        'params': fit['params'][0],
+        'covariance': fit['covariance'][0],
+        'log_likelihood': float(fit['log_likelihood'][0]),
+        'n_iterations': int(fit['n_iterations'][0]),
+        'converged': bool(fit['converged'][0])
+    }
+
+
+def _covariate_nll(theta, x, y, n, covariates, derivatives):
+    """
+    Negative log-likelihood of one curve whose inflection point shifts with covariates.
+
+    theta is (a, b, c, beta_1..beta_m) and covariates has shape (K, m); each
+    offer is scored at d = x + covariates @ beta - c. Returns a float, plus
+    the gradient (P,) and Hessian (P, P) when derivatives > 0.
+    """
+    a, b, c, beta = theta[0], theta[1], theta[2], theta[3:]
+
+    # Derivatives of d with respect to (c, beta)
+    shift = np.column_stack([-np.ones(len(x)), covariates])
+    d = x + covariates @ beta - c
+    z = b * d
+    log_s = log_expit(z)
+    with np.errstate(divide='ignore'):
+        log_rest = np.logaddexp(np.log1p(-a), -z)
+    n_failed = (1 if n is None else n) - y
+    nll = -((log_s if n is None else n * log_s).sum() + np.log(a) * y.sum() + (n_failed * log_rest).sum())
+    if derivatives == 0:
+        return nll
+
+    s = expit(z)
+    u = s * (1 - s)
+    p = np.clip(a * s, _PROB_EPS, 1 - _PROB_EPS)
+
+    r = (y - (1 if n is None else n) * p) / (p * (1 - p))
+    jac = np.column_stack([s, a * u * d, (a * u * b)[:, None] * shift])
+    gradient = -(r @ jac)
+    if derivatives == 1:
+        return nll, gradient
+
+    w = -y / p ** 2 - n_failed / (1 - p) ** 2
+    v = u * (1 - 2 * s)
+
+    hessian = (jac * w[:, None]).T @ jac
+    second = np.zeros_like(hessian)
+    second[0, 1] = second[1, 0] = r @ (u * d)
+    second[0, 2:] = second[2:, 0] = (r * u * b) @ shift
+    second[1, 1] = r @ (a * v * d ** 2)
+    second[1, 2:] = second[2:, 1] = (r * a * (u + b * d * v)) @ shift
+    second[2:, 2:] = (shift * (r * a * b ** 2 * v)[:, None]).T @ shift
+    return nll, gradient, -(hessian + second)
+
+
+def fit_covariate_model(salaries, n_accepted, n_offers, covariates, p0=None, bounds=None,
+                        tol=1e-9, max_iter=100):
+    """
+    Fit (a, b, c) jointly with covariate shifts of the inflection point.
+
+    P = a / (1 + exp(-b * (x - (c - covariates @ beta))))
+
+    Each beta is the shift, in $1000s of compensation, per unit of its
+    covariate (the fitted counterpart of the app's culture factor k), so
+    (a, b, c) describe offers whose covariates are all zero.
+
+    Parameters:
+    salaries: compensation in thousands
+    n_accepted: number of accepted offers per entry (0/1 for raw rows)
+    n_offers: number of offers per entry (None for one offer each)
+    covariates: design matrix of shape (K, m)
+    p0: initial (a, b, c); defaults from default_start (betas start at 0)
+    bounds: (lower, upper) bounds on (a, b, c); the betas are unbounded
+
+    Returns:
+    Dictionary with 'params' (a, b, c, beta...), 'covariance', 'log_likelihood',
+    'n_iterations' and 'converged'
+    """
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(n_accepted, dtype=float)
+    n = None if n_offers is None else np.asarray(n_offers, dtype=float)
+    covariates = np.asarray(covariates, dtype=float).reshape(len(x), -1)
+    n_covariates = covariates.shape[1]
+
+    start, default_bounds = default_start(x, n)
+    p0 = start if p0 is None else np.asarray(p0, dtype=float)
+    lower, upper = default_bounds if bounds is None else bounds
+    lower = np.r_[lower, np.full(n_covariates, -np.inf)][None, :]
+    upper = np.r_[upper, np.full(n_covariates, np.inf)][None, :]
+    theta = np.clip(np.r_[p0, np.zeros(n_covariates)][None, :], lower, upper)
+
+    def objective(th, rows, derivatives):
+        result = _covariate_nll(th[0], x, y, n, covariates, derivatives)
+        if derivatives == 0:
+            return np.array([result])
+        return tuple(np.asarray(part)[None] for part in result)
+
+    theta, iterations, converged = _projected_newton(objective, theta, lower, upper, tol, max_iter)
+
+    nll, _, hessian = _covariate_nll(theta[0], x, y, n, covariates, derivatives=2)
+    return {
+        'params': theta[0],
+        'covariance': np.linalg.pinv(hessian),
+        'log_likelihood': -float(nll),
+        'n_iterations': int(iterations[0]),
+        'converged': bool(converged[0])
+    }
+
+
+def aggregate_offers(salaries, acceptances, bin_width=0, covariates=None):
+    """
+    Collapse individual offers into (salary, n_offers, n_accepted) bins.
+
+    The binomial likelihood of the bins equals the Bernoulli likelihood of
+    the rows (up to a constant) when bin_width is 0, so fitting the bins
+    gives the row-level fit at a cost proportional to the number of distinct
+    salaries. A positive bin_width groups salaries onto a grid of that width
+    first; each bin is represented by the mean salary of its offers.
+
+    Parameters:
+    salaries: compensation in thousands
+    acceptances: 0/1 outcome for each offer
+    bin_width: grid width in thousands (0 for exact distinct salaries)
+    covariates: optional design matrix (n, m); offers are then binned on
+                (salary, covariate row) so each bin has one covariate row
+
+    Returns:
+    Tuple of (bin_salaries, n_offers, n_accepted) arrays sorted by salary,
+    followed by the bins' covariate rows when covariates are given
+    """
+    x = np.asarray(salaries, dtype=float)
+    y = np.asarray(acceptances, dtype=float)
+
+    keys = np.round(x / bin_width) if bin_width > 0 else x
+    if covariates is None:
+        _, inverse = np.unique(keys, return_inverse=True)
+    else:
+        covariates = np.asarray(covariates, dtype=float).reshape(len(x), -1)
+        rows, inverse = np.unique(np.column_stack([keys, covariates]), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+    n_offers = np.bincount(inverse).astype(float)
+    n_accepted = np.bincount(inverse, weights=y)
+    bin_salaries = np.bincount(inverse, weights=x) / n_offers
+
+    if covariates is None:
+        return bin_salaries, n_offers, n_accepted
+    return bin_salaries, n_offers, n_accepted, rows[:, 1:]
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Loading and converting offer histories for fitting and evaluation.
+
+Offer files carry a 'salary offer ($USD)' column and a 0/1 'acceptance'
+column. Only those two columns are read, with compact dtypes, and large
+files can be streamed in chunks into per-salary sufficient statistics so
+memory use depends on the number of distinct salaries rather than rows.
+
+Besides CSV, offers can be stored in a columnar '.offers' directory holding
+one .npy file per column (salary.npy, acceptance.npy, plus '<column>.npy'
+for any other column). These are memory-mapped on load, so repeated fits
+and evaluations over the same history skip CSV parsing entirely. Very large
+generated histories may instead hold compressed 'part-NNNNN.npz' chunk files
+(one array per column, named like the .npy files), which are read back
+chunk by chunk. Run this module as a script to convert a CSV:
+
+    python offer_data.py offers.csv            # writes offers.offers/
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import argparse
+
+import numpy as np
+import pandas as pd
+
+SALARY_COLUMN = 'salary offer ($USD)'
+ACCEPTANCE_COLUMN = 'acceptance'
+
+OFFER_DTYPES = {SALARY_COLUMN: np.int32, ACCEPTANCE_COLUMN: np.uint8}
+
+# Columnar layout: a directory with one .npy file per column
+COLUMNAR_SUFFIX = '.offers'
+COLUMN_FILES = {SALARY_COLUMN: 'salary.npy', ACCEPTANCE_COLUMN: 'acceptance.npy'}
+
+# Compressed chunked layout: numbered .npz parts holding every column
+PART_PREFIX = 'part-'
+PART_SUFFIX = '.npz'
+
+
+def _part_files(data_path):
+    """Sorted paths of the compressed parts in a '.offers' directory."""
+    return [
+        os.path.join(data_path, name) for name in sorted(os.listdir(data_path))
+        if name.startswith(PART_PREFIX) and name.endswith(PART_SUFFIX)
+    ]
+
+
+def is_columnar(data_path):
+    """Whether data_path is a columnar '.offers' directory."""
+    return os.path.isdir(data_path) and any(
+        name.endswith('.npy') or (name.startswith(PART_PREFIX) and name.endswith(PART_SUFFIX))
+        for name in os.listdir(data_path)
+    )
+
+
+def columnar_path(data_path):
+    """Default '.offers' directory name for an offer file."""
+    return os.path.splitext(data_path.rstrip(os.sep))[0] + COLUMNAR_SUFFIX
+
+
+def column_file(column):
+    """File name of a column in a '.offers' directory."""
+    return COLUMN_FILES.get(column, column + '.npy')
+
+
+def part_file(data_path, index):
+    """Path of the index-th compressed part in a '.offers' directory."""
+    return os.path.join(data_path, f"{PART_PREFIX}{index:05d}{PART_SUFFIX}")
+
+
+def _column_names(file_names):
+    """Map '.offers' file names (or part array names) to column names."""
+    file_columns = {name: column for column, name in COLUMN_FILES.items()}
+    return {file_columns.get(name, name[:-len('.npy')]): name for name in file_names}
+
+
+def _select_columns(data_path, available, columns):
+    columns = list(available) if columns is None else columns
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Columns not found in {data_path}: {missing}")
+    return columns
+
+
+def write_part(data_path, index, columns):
+    """
+    Write one compressed chunk of a '.offers' directory.
+
+    Parameters:
+    data_path: Path to the '.offers' directory
+    index: part number; parts are read back in this order
+    columns: dictionary of equal-length column arrays keyed by column name
+    """
+    np.savez_compressed(part_file(data_path, index), **{
+        column_file(column)[:-len('.npy')]: values for column, values in columns.items()
+    })
+
+
+def _iter_part_chunks(data_path, columns=None, chunksize=None):
+    """Yield DataFrames from the compressed parts, at most chunksize rows each."""
+    for path in _part_files(data_path):
+        with np.load(path) as part:
+            available = _column_names(name + '.npy' for name in part.files)
+            selected = _select_columns(data_path, available, columns)
+            data = {column: part[available[column][:-len('.npy')]] for column in selected}
+        yield from _iter_column_chunks(data, chunksize or max(len(next(iter(data.values()))), 1))
+
+
+def load_columns(data_path, columns=None):
+    """
+    Memory-map the columns of a '.offers' directory.
+
+    Compressed parts cannot be memory-mapped; they are decompressed and
+    concatenated instead (stream them with read_columns(chunksize=...)).
+
+    Parameters:
+    data_path: Path to the '.offers' directory
+    columns: Column names to load (default: all)
+
+    Returns:
+    Dictionary of read-only column arrays keyed by column name
+    """
+    if _part_files(data_path):
+        chunks = list(_iter_part_chunks(data_path, columns))
+        return {column: np.concatenate([chunk[column].to_numpy() for chunk in chunks])
+                for column in chunks[0].columns}
+
+    available = _column_names(name for name in sorted(os.listdir(data_path)) if name.endswith('.npy'))
+    return {
+        column: np.load(os.path.join(data_path, available[column]), mmap_mode='r')
+        for column in _select_columns(data_path, available, columns)
+    }
+
+
+def data_files(data_path, columns):
+    """Files whose bytes hold the given columns of a CSV file or '.offers' directory."""
+    if not is_columnar(data_path):
+        return [data_path]
+    parts = _part_files(data_path)
+    if parts:
+        return parts
+    return [os.path.join(data_path, column_file(column)) for column in columns]
+
+
+def clear_columnar(data_path):
+    """Remove column and part files left in a '.offers' directory by an earlier write."""
+    for name in os.listdir(data_path):
+        if name.endswith('.npy') or (name.startswith(PART_PREFIX) and name.endswith(PART_SUFFIX)):
+            os.remove(os.path.join(data_path, name))
+
+
+def available_columns(data_path):
+    """Column names present in a CSV file or '.offers' directory."""
+    parts = _part_files(data_path) if os.path.isdir(data_path) else []
+    if parts:
+        with np.load(parts[0]) as part:
+            return list(_column_names(name + '.npy' for name in part.files))
+    if is_columnar(data_path):
+        return list(load_columns(data_path))
+    return list(pd.read_csv(data_path, nrows=0).columns)
+
+
+def _iter_column_chunks(columns, chunksize):
+    n_rows = len(next(iter(columns.values())))
+    for start in range(0, n_rows, chunksize):
+        yield pd.DataFrame(
+            {column: values[start:start + chunksize] for column, values in columns.items()},
+            copy=False
+        )
+
+
+def read_columns(data_path, columns=None, chunksize=None, dtype=None):
+    """
+    Read selected columns of a CSV file or '.offers' directory.
+
+    Parameters:
+    data_path: Path to a CSV file or a columnar '.offers' directory
+    columns: Column names to read (default: all)
+    chunksize: If given, return an iterator of DataFrames of this many rows
+    dtype: Optional column dtypes applied when parsing CSV
+
+    Returns:
+    DataFrame, or an iterator of them. Columnar data is memory-mapped
+    rather than copied into memory.
+    """
+    if is_columnar(data_path):
+        if chunksize and _part_files(data_path):
+            return _iter_part_chunks(data_path, columns, chunksize)
+        data = load_columns(data_path, columns)
+        if chunksize:
+            return _iter_column_chunks(data, chunksize)
+        return pd.DataFrame(data, copy=False)
+
+    return pd.read_csv(data_path, usecols=columns, dtype=dtype, chunksize=chunksize)
+
+
+def read_offers(data_path, chunksize=None):
+    """
+    Read the salary and acceptance columns of an offer file.
+
+    Parameters:
+    data_path: Path to a CSV file with 'salary offer ($USD)' and 'acceptance'
+               columns, or to a columnar '.offers' directory
+    chunksize: If given, return an iterator of DataFrames of this many rows
+
+    Returns:
+    DataFrame (int32 salary, uint8 acceptance), or an iterator of them.
+    Columnar data is memory-mapped rather than copied into memory.
+    """
+    return read_columns(data_path, [SALARY_COLUMN, ACCEPTANCE_COLUMN], chunksize, OFFER_DTYPES)
+
+
+def _write_npy_from_raw(raw_file, npy_path, dtype, n_rows):
+    """Prefix raw little-endian column data with an .npy header."""
+    with open(npy_path, 'wb') as out:
+        header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                  'fortran_order': False, 'shape': (n_rows,)}
+        np.lib.format.write_array_header_1_0(out, header)
+        raw_file.seek(0)
+        shutil.copyfileobj(raw_file, out)
+
+
+def write_columns(chunks, output_path, dtypes=None):
+    """
+    Write a table to a CSV file or a columnar '.offers' directory.
+
+    Parameters:
+    chunks: a DataFrame, or an iterable of DataFrames with the same columns
+    output_path: destination; a path ending in '.offers' selects the columnar format
+    dtypes: optional dtypes for columnar output (default: each column's own dtype)
+
+    Returns:
+    Number of rows written
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    dtypes = dtypes or {}
+
+    if not output_path.rstrip(os.sep).endswith(COLUMNAR_SUFFIX):
+        n_rows = 0
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            n_rows += len(chunk)
+        return n_rows
+
+    # Stream each column to a raw scratch file, then add the .npy header once
+    # the row count is known, so conversion never holds the whole table
+    os.makedirs(output_path, exist_ok=True)
+    clear_columnar(output_path)
+    scratch = {}
+    column_dtypes = {}
+    try:
+        n_rows = 0
+        for chunk in chunks:
+            for column in chunk.columns:
+                if column not in scratch:
+                    scratch[column] = tempfile.TemporaryFile(dir=output_path)
+                    dtype = np.dtype(dtypes.get(column, chunk[column].dtype))
+                    column_dtypes[column] = dtype.newbyteorder('<')
+                values = np.ascontiguousarray(chunk[column].to_numpy(), dtype=column_dtypes[column])
+                scratch[column].write(values.tobytes())
+            n_rows += len(chunk)
+
+        for column, handle in scratch.items():
+            _write_npy_from_raw(handle, os.path.join(output_path, column_file(column)),
+                                column_dtypes[column], n_rows)
+    finally:
+        for handle in scratch.values():
+            handle.close()
+
+    return n_rows
+
+
+def write_offers(chunks, output_path):
+    """
+    Write offers to a CSV file or a columnar '.offers' directory.
+
+    Parameters:
+    chunks: a DataFrame, or an iterable of DataFrames, with the offer columns
+    output_path: destination; a path ending in '.offers' selects the columnar format
+
+    Returns:
+    Number of rows written
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    offer_chunks = (chunk[[SALARY_COLUMN, ACCEPTANCE_COLUMN]] for chunk in chunks)
+    return write_columns(offer_chunks, output_path, OFFER_DTYPES)
+
+
+def convert_offers(data_path, output_path=None, chunksize=1_000_000):
+    """
+    Convert an offer CSV to the columnar '.offers' format in one streaming pass.
+
+    Parameters:
+    data_path: Path to CSV file with 'salary offer ($USD)' and 'acceptance' columns
+    output_path: Destination directory (default: data_path with a '.offers' suffix)
+    chunksize: Number of rows parsed per chunk
+
+    Returns:
+    Path of the written '.offers' directory
+    """
+    output_path = output_path or columnar_path(data_path)
+    n_rows = write_offers(read_offers(data_path, chunksize=chunksize), output_path)
+    print(f"Converted {n_rows} offers from {data_path} to {output_path}")
+    return output_path
+
+
+def merge_offer_bins(chunks, bin_width=0, keys=None, totals=None):
+    """
+    Fold a stream of offer chunks into per-bin sufficient statistics.
+
+    Each chunk is grouped on its own and merged into the running totals, so
+    only one chunk and the distinct bins are held in memory at a time. Bins
+    are keyed on the exact dollar salary, or on round(salary / bin_width)
+    when bin_width is positive. Passing the keys and totals of an earlier
+    call continues from them, so appended offers can be folded in later.
+
+    Parameters:
+    chunks: iterable of DataFrames with the offer columns
+    bin_width: bin width in $USD (0 for exact salaries)
+    keys: bin keys of earlier totals (None to start empty)
+    totals: earlier totals, shape (3, n_bins): offers, acceptances and salary sum in $USD
+
+    Returns:
+    Tuple of (keys, totals) sorted by key
+    """
+    if keys is None:
+        keys = np.empty(0, dtype=np.int64)
+        totals = np.empty((3, 0))
+
+    for chunk in chunks:
+        salary = chunk[SALARY_COLUMN].to_numpy()
+        accepted = chunk[ACCEPTANCE_COLUMN].to_numpy()
+        if bin_width > 0:
+            chunk_keys = np.round(salary / bin_width).astype(np.int64)
+        else:
+            chunk_keys = salary.astype(np.int64)
+
+        chunk_keys, inverse = np.unique(chunk_keys, return_inverse=True)
+        chunk_totals = np.stack([
+            np.bincount(inverse, minlength=len(chunk_keys)).astype(float),
+            np.bincount(inverse, weights=accepted, minlength=len(chunk_keys)),
+            np.bincount(inverse, weights=salary, minlength=len(chunk_keys)),
+        ])
+
+        # Merge this chunk's bins into the running totals
+        keys, inverse = np.unique(np.concatenate([keys, chunk_keys]), return_inverse=True)
+        combined = np.concatenate([totals, chunk_totals], axis=1)
+        totals = np.stack([
+            np.bincount(inverse, weights=row, minlength=len(keys)) for row in combined
+        ])
+
+    return keys, totals
+
+
+def offer_bins(totals):
+    """(bin_salaries in thousands, n_offers, n_accepted) from merge_offer_bins totals."""
+    n_offers, n_accepted, salary_sums = totals
+    return salary_sums / n_offers / 1000, n_offers, n_accepted
+
+
+def accumulate_offer_bins(chunks, bin_width=0):
+    """
+    Reduce a stream of offer chunks to (salary, n_offers, n_accepted) bins.
+
+    Bins are represented by the mean salary of their offers (see merge_offer_bins).
+
+    Parameters:
+    chunks: iterable of DataFrames with the offer columns
+    bin_width: bin width in $USD (0 for exact salaries)
+
+    Returns:
+    Tuple of (bin_salaries in thousands, n_offers, n_accepted) sorted by salary
+    """
+    _, totals = merge_offer_bins(chunks, bin_width)
+    return offer_bins(totals)
+
+
+def read_offer_bins(data_path, bin_width=0, chunksize=1_000_000):
+    """
+    Stream an offer CSV into salary bins in a single pass.
+
+    Parameters:
+    data_path: Path to CSV file with 'salary offer ($USD)' and 'acceptance' columns
+    bin_width: bin width in $USD (0 for exact salaries)
+    chunksize: number of rows parsed per chunk
+
+    Returns:
+    Tuple of (bin_salaries in thousands, n_offers, n_accepted) sorted by salary
+    """
+    return accumulate_offer_bins(read_offers(data_path, chunksize=chunksize), bin_width)
+
+
+def read_group_offer_bins(data_path, group_column, bin_width=0, chunksize=1_000_000):
+    """
+    Stream an offer file into salary bins per group in a single pass.
+
+    Each chunk is split by group and folded into that group's running totals
+    with merge_offer_bins, so memory is bounded by the chunk size and the
+    distinct (group, salary) bins.
+
+    Parameters:
+    data_path: Path to CSV file or '.offers' directory with the offer columns
+    group_column: Column holding each offer's group (e.g. department)
+    bin_width: bin width in $USD (0 for exact salaries)
+    chunksize: number of rows read per chunk
+
+    Returns:
+    Tuple of (dictionary mapping each group label, as a string and in sorted
+    order, to its (bin_salaries in thousands, n_offers, n_accepted), number
+    of offers skipped for a missing group)
+    """
+    merged = {}
+    n_skipped = 0
+    for chunk in read_columns(data_path, [SALARY_COLUMN, ACCEPTANCE_COLUMN, group_column], chunksize=chunksize):
+        missing = chunk[group_column].isna()
+        n_skipped += int(missing.sum())
+        chunk = chunk[~missing]
+        for group, rows in chunk.groupby(chunk[group_column].astype(str), sort=False):
+            merged[group] = merge_offer_bins([rows], bin_width, *merged.get(group, (None, None)))
+    return {group: offer_bins(merged[group][1]) for group in sorted(merged)}, n_skipped
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only stream over bytes [current position, end) of an open file."""
+
+    def __init__(self, f, end):
+        self._file = f
+        self._remaining = end - f.tell()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._file.readinto(memoryview(buffer)[:max(min(len(buffer), self._remaining), 0)])
+        self._remaining -= n
+        return n
+
+
+def _csv_end(data_path, block_size=1 << 16):
+    """Byte offset just past the last complete line of a CSV file."""
+    size = os.path.getsize(data_path)
+    with open(data_path, 'rb') as f:
+        f.seek(max(size - block_size, 0))
+        tail = f.read()
+    newline = tail.rfind(b'\n')
+    return size if newline < 0 else size - len(tail) + newline + 1
+
+
+def offers_end(data_path):
+    """
+    Current end of an offer file, for reading only offers appended later.
+
+    Returns:
+    Position dict: {'bytes': offset past the last complete line} for CSV,
+    {'rows': length} for .npy columns, {'parts': count} for compressed parts
+    """
+    if not is_columnar(data_path):
+        return {'bytes': _csv_end(data_path)}
+    parts = _part_files(data_path)
+    if parts:
+        return {'parts': len(parts)}
+    return {'rows': len(load_columns(data_path, [SALARY_COLUMN])[SALARY_COLUMN])}
+
+
+def read_offers_after(data_path, position=None, end=None, chunksize=1_000_000):
+    """
+    Stream the offers appended to a file between two positions.
+
+    CSV files are read from the stored byte offset, '.npy' columns from the
+    stored row and compressed parts from the first new part, so the cost is
+    proportional to the new offers rather than the whole history.
+
+    Parameters:
+    data_path: Path to a CSV file or '.offers' directory
+    position: offers_end at the previous read (None for the start of the file)
+    end: position to stop at, from offers_end
+    chunksize: rows per chunk
+
+    Returns:
+    Iterator of DataFrames with the salary and acceptance columns
+    """
+    if position is not None and (set(position) != set(end) or
+                                 any(position[key] > end[key] for key in end)):
+        raise ValueError(f"{data_path} was rewritten since it was last read")
+
+    if 'bytes' in end:
+        if position and position['bytes'] == end['bytes']:
+            return
+        columns = list(pd.read_csv(data_path, nrows=0).columns)
+        with open(data_path, 'rb') as f:
+            if position:
+                f.seek(position['bytes'])
+            stream = io.BufferedReader(_ByteRange(f, end['bytes']))
+            header = None if position else 0
+            yield from pd.read_csv(stream, header=header, names=columns, usecols=list(OFFER_DTYPES),
+                                   dtype=OFFER_DTYPES, chunksize=chunksize)
+    elif 'parts' in end:
+        for path in _part_files(data_path)[position['parts'] if position else 0:end['parts']]:
+            with np.load(path) as part:
+                data = {column: part[column_file(column)[:-len('.npy')]] for column in OFFER_DTYPES}
+            yield from _iter_column_chunks(data, chunksize)
+    else:
+        data = load_columns(data_path, list(OFFER_DTYPES))
+        start = position['rows'] if position else 0
+        yield from _iter_column_chunks(
+            {column: values[start:end['rows']] for column, values in data.items()}, chunksize)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert offer CSV files to the columnar .offers format')
+    parser.add_argument('data_files', nargs='+', help='CSV files with salary and acceptance data')
+    parser.add_argument('--output', default=None,
+                        help='Output .offers directory (only with a single input file)')
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help='Rows parsed per chunk')
+
+    args = parser.parse_args()
+
+    if args.output and len(args.data_files) > 1:
+        parser.error('--output can only be used with a single input file')
+
+    for data_file in args.data_files:
+        convert_offers(data_file, args.output, args.chunksize)
+
+
+if __name__ == "__main__":
+    main()
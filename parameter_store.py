@@ -0,0 +1,121 @@
+"""
+Registry of named, versioned model parameter sets with hot reload.
+
+The default set is parameters.json; additional sets (one per department or
+specialty) are JSON files in the parameter_sets/ directory, named after the
+file stem, e.g. parameter_sets/cardiac.json is the 'cardiac' set. Files are
+written by fit_parameters.py (--output parameter_sets/<name>.json).
+
+Each set is parsed once per version. A lookup only stats the file; it is
+reread when its modification time or size changes, and reparsed only when
+the content hash differs, so refits are picked up without a restart and
+unchanged files are never reparsed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_PARAMETER_FILE = 'parameters.json'
+PARAMETER_SETS_DIR = 'parameter_sets'
+DEFAULT_SET_NAME = 'default'
+
+# Used when no parameter file exists
+DEFAULT_PARAMETERS = {
+    "curve_parameters": {
+        "a": 0.92,
+        "b": 0.023,
+        "c": 383.0
+    },
+    "culture_bounds": {
+        "min": -50,
+        "max": 50,
+        "default": 0
+    },
+    "fitted": False
+}
+
+
+class ParameterRegistry:
+    """
+    Named parameter sets loaded from disk with mtime/content-hash invalidation.
+
+    Parameters:
+    default_file: path of the default parameter set
+    sets_dir: directory scanned for additional '<name>.json' parameter sets
+    """
+
+    def __init__(self, default_file=DEFAULT_PARAMETER_FILE, sets_dir=PARAMETER_SETS_DIR):
+        self.default_file = default_file
+        self.sets_dir = sets_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def paths(self):
+        """Mapping of set name to file path for every available set."""
+        paths = {DEFAULT_SET_NAME: self.default_file}
+        if os.path.isdir(self.sets_dir):
+            for filename in sorted(os.listdir(self.sets_dir)):
+                stem, ext = os.path.splitext(filename)
+                if ext == '.json' and stem != DEFAULT_SET_NAME:
+                    paths[stem] = os.path.join(self.sets_dir, filename)
+        return paths
+
+    def names(self):
+        """Names of the available parameter sets, default first."""
+        return list(self.paths())
+
+    def _load(self, name, path):
+        """Return the cached entry for a set, rereading it only if the file changed."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if name == DEFAULT_SET_NAME:
+                return {'params': DEFAULT_PARAMETERS, 'version': 'builtin', 'stamp': None}
+            raise KeyError(f"Unknown parameter set: {name}")
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(name)
+        if entry is not None and entry['path'] == path and entry['stamp'] == stamp:
+            return entry
+
+        with open(path, 'rb') as f:
+            content = f.read()
+        version = hashlib.sha256(content).hexdigest()[:12]
+
+        if entry is not None and entry['path'] == path and entry['version'] == version:
+            # Touched but unchanged: keep the parsed parameters
+            entry['stamp'] = stamp
+            return entry
+
+        entry = {
+            'path': path,
+            'stamp': stamp,
+            'version': version,
+            'params': json.loads(content),
+        }
+        self._entries[name] = entry
+        return entry
+
+    def get(self, name=DEFAULT_SET_NAME):
+        """
+        Parameters of a named set, reloaded if its file has changed.
+
+        The returned dictionary is shared between callers and must not be modified;
+        use copy.deepcopy if a private copy is needed.
+        """
+        paths = self.paths()
+        if name not in paths:
+            raise KeyError(f"Unknown parameter set: {name}")
+        with self._lock:
+            return self._load(name, paths[name])['params']
+
+    def version(self, name=DEFAULT_SET_NAME):
+        """Content-hash version of a named set ('builtin' for the fallback defaults)."""
+        paths = self.paths()
+        if name not in paths:
+            raise KeyError(f"Unknown parameter set: {name}")
+        with self._lock:
+            return self._load(name, paths[name])['version']
+
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Batch parameter sweeps over the recruitment model's what-if inputs.
+
+Computes recommended salaries for every combination of curve parameters
+(a, b, c), culture score and target probability in one broadcast call to
+the shared inverse sigmoid, and optionally recruitment probabilities over a
+salary axis. Cost of living only rescales salaries (regional = national *
+index / 100), so it is stored as an axis and applied at lookup time instead
+of multiplying the grid size. Results are saved to a compact .npz file that
+load_sweep turns into a table the app can index into: when the app's curve
+sliders sit on a grid point, its salary metrics are read from the saved
+grid instead of being recomputed.
+"""
+
+import argparse
+
+import numpy as np
+
+from recruitment_core import sigmoid_recruitment, find_salary_for_probability, outer_axes
+
+# Axis order of the recommended-salary grid
+SALARY_AXES = ('a', 'b', 'c', 'culture_score', 'target_probability')
+
+# Sweep file written by default and read by the app when present
+DEFAULT_SWEEP_FILE = 'parameter_sweep.npz'
+
+# Default ranges mirror the sliders in recruitment_model_app.py (start, stop, step)
+DEFAULT_RANGES = {
+    'a': (0.8, 1.0, 0.01),
+    'b': (0.01, 0.05, 0.001),
+    'c': (300.0, 500.0, 5.0),
+    'culture_score': (-50, 50, 5),
+    'target_probability': (0.5, 0.95, 0.05),
+    'cost_of_living': (77, 231, 1),
+}
+
+
+def inclusive_range(start, stop, step):
+    """Evenly spaced values from start to stop inclusive, rounded to avoid float drift."""
+    return np.round(np.arange(start, stop + step / 2, step), 10)
+
+
+def sweep_recommended_salaries(a_values, b_values, c_values, culture_scores,
+                               target_probabilities, dtype=np.float32, out=None):
+    """
+    Salary needed for each target probability over the full parameter grid.
+
+    Parameters:
+    a_values, b_values, c_values: 1-D arrays of curve parameters
+    culture_scores: 1-D array of culture factors
+    target_probabilities: 1-D array of target probabilities
+    dtype: dtype of the result when out is not given
+    out: optional preallocated array of shape (A, B, C, K, T)
+
+    Returns:
+    Array of national salaries ($1000s) with axes SALARY_AXES; unattainable
+    targets (at or above a) are NaN
+    """
+    a, b, c, k, target = outer_axes(a_values, b_values, c_values, culture_scores,
+                                    target_probabilities)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(a.shape, b.shape, c.shape, k.shape, target.shape),
+                       dtype=dtype)
+    return find_salary_for_probability(target, a, b, c, k, out=out)
+
+
+def sweep_probabilities(a_values, b_values, c_values, culture_scores, salaries,
+                        dtype=np.float32, out=None):
+    """
+    Recruitment probability at each salary over the full parameter grid.
+
+    Parameters:
+    a_values, b_values, c_values: 1-D arrays of curve parameters
+    culture_scores: 1-D array of culture factors
+    salaries: 1-D array of national salaries ($1000s)
+    dtype: dtype of the result when out is not given
+    out: optional preallocated array of shape (A, B, C, K, S)
+
+    Returns:
+    Array of probabilities with axes (a, b, c, culture_score, salary)
+    """
+    a, b, c, k, x = outer_axes(a_values, b_values, c_values, culture_scores, salaries)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(a.shape, b.shape, c.shape, k.shape, x.shape),
+                       dtype=dtype)
+    return sigmoid_recruitment(x, a, b, c, k, out=out)
+
+
+def run_sweep(ranges=None, salaries=None):
+    """
+    Run a sweep over the given (start, stop, step) ranges.
+
+    Parameters:
+    ranges: dict overriding entries of DEFAULT_RANGES
+    salaries: optional 1-D salary axis ($1000s) to also tabulate probabilities
+
+    Returns:
+    Dictionary of axis arrays plus 'recommended_salary' and, if salaries were
+    given, 'salary' and 'probability' arrays
+    """
+    ranges = {**DEFAULT_RANGES, **(ranges or {})}
+    sweep = {name: inclusive_range(*ranges[name]) for name in ranges}
+
+    sweep['recommended_salary'] = sweep_recommended_salaries(
+        *(sweep[name] for name in SALARY_AXES))
+    if salaries is not None:
+        sweep['salary'] = np.asarray(salaries, dtype=float)
+        sweep['probability'] = sweep_probabilities(
+            sweep['a'], sweep['b'], sweep['c'], sweep['culture_score'], sweep['salary'])
+    return sweep
+
+
+def save_sweep(path, sweep):
+    """Save a sweep dictionary to an uncompressed .npz file."""
+    np.savez(path, **sweep)
+
+
+def _nearest_index(axis, value):
+    """Index of the grid point in a sorted axis closest to value."""
+    i = int(np.clip(np.searchsorted(axis, value), 1, len(axis) - 1))
+    return i if abs(axis[i] - value) < abs(value - axis[i - 1]) else i - 1
+
+
+def _exact_index(axis, value):
+    """Index of value in a sorted axis, or None if it is not a grid point."""
+    i = _nearest_index(axis, value)
+    return i if np.isclose(axis[i], value, rtol=1e-9, atol=1e-9) else None
+
+
+class SweepTable:
+    """
+    Read-only view of a saved sweep with nearest-grid-point lookups.
+
+    Parameters:
+    sweep: dictionary (or NpzFile) produced by run_sweep
+    """
+
+    def __init__(self, sweep):
+        self.axes = {name: np.asarray(sweep[name]) for name in SALARY_AXES + ('cost_of_living',)}
+        self.recommended_salary = np.asarray(sweep['recommended_salary'])
+        self.salary = np.asarray(sweep['salary']) if 'salary' in sweep else None
+        self.probability = np.asarray(sweep['probability']) if 'probability' in sweep else None
+
+    def index(self, **values):
+        """Grid indices nearest to the given axis values, in SALARY_AXES order."""
+        return tuple(_nearest_index(self.axes[name], values[name]) for name in SALARY_AXES)
+
+    def lookup(self, a, b, c, culture_score, target_probability, cost_of_living=100):
+        """
+        Recommended salary at the grid point nearest to the inputs.
+
+        Returns:
+        Regional salary in $1000s, or None if the target is unattainable
+        """
+        salary = self.recommended_salary[self.index(
+            a=a, b=b, c=c, culture_score=culture_score, target_probability=target_probability)]
+        if np.isnan(salary):
+            return None
+        return float(salary) * cost_of_living / 100.0
+
+    def salary_lookup(self, a, b, c):
+        """
+        SalaryLookup for (a, b, c) read from the saved grid instead of recomputed.
+
+        Returns:
+        SalaryLookup over this sweep's culture, cost of living and target axes,
+        or None when (a, b, c) is not a grid point (e.g. fitted values between
+        slider steps)
+        """
+        indices = tuple(_exact_index(self.axes[name], value) for name, value in zip('abc', (a, b, c)))
+        if None in indices:
+            return None
+        return SalaryLookup(a, b, c, self.axes['culture_score'], self.axes['cost_of_living'],
+                            self.axes['target_probability'],
+                            national=self.recommended_salary[indices].astype(np.float64))
+
+
+class SalaryLookup:
+    """
+    Recommended-salary table for one fitted (a, b, c).
+
+    Tabulates national and regional salaries for every slider position of
+    culture score, cost of living and target probability, so the app's
+    sidebar metrics are dictionary and array lookups. Off-grid inputs fall
+    back to evaluating the inverse sigmoid directly.
+
+    Parameters:
+    a, b, c: curve parameters
+    culture_scores: 1-D culture axis (default: DEFAULT_RANGES)
+    cost_of_living: 1-D cost-of-living index axis (default: DEFAULT_RANGES)
+    target_probabilities: 1-D target axis (default: DEFAULT_RANGES)
+    national: optional precomputed (culture, target) national salaries, e.g. a
+              slice of a saved sweep (default: computed here)
+    """
+
+    def __init__(self, a, b, c, culture_scores=None, cost_of_living=None, target_probabilities=None,
+                 national=None):
+        self.a, self.b, self.c = a, b, c
+        axes = {
+            'culture_score': culture_scores,
+            'cost_of_living': cost_of_living,
+            'target_probability': target_probabilities,
+        }
+        axes = {
+            name: inclusive_range(*DEFAULT_RANGES[name]) if values is None else np.asarray(values, dtype=float)
+            for name, values in axes.items()
+        }
+        self.positions = {
+            name: {self._key(value): i for i, value in enumerate(values)}
+            for name, values in axes.items()
+        }
+
+        # (culture, target) national salaries and (culture, cost of living, target) regional ones
+        if national is None:
+            national = sweep_recommended_salaries(
+                [a], [b], [c], axes['culture_score'], axes['target_probability'], dtype=np.float64)[0, 0, 0]
+        self.national = national
+        self.regional = self.national[:, None, :] * (axes['cost_of_living'][None, :, None] / 100.0)
+
+    @staticmethod
+    def _key(value):
+        return round(float(value), 6)
+
+    def _position(self, name, value):
+        return self.positions[name].get(self._key(value))
+
+    def national_salary(self, culture_score, target_probability):
+        """National salary ($1000s) for the target, or None if unattainable."""
+        i = self._position('culture_score', culture_score)
+        t = self._position('target_probability', target_probability)
+        if i is None or t is None:
+            return find_salary_for_probability(target_probability, self.a, self.b, self.c, k=culture_score)
+        salary = self.national[i, t]
+        return None if np.isnan(salary) else float(salary)
+
+    def regional_salary(self, culture_score, target_probability, cost_of_living):
+        """Regional salary ($1000s) for the target, or None if unattainable."""
+        i = self._position('culture_score', culture_score)
+        j = self._position('cost_of_living', cost_of_living)
+        t = self._position('target_probability', target_probability)
+        if i is None or j is None or t is None:
+            salary = self.national_salary(culture_score, target_probability)
+            return None if salary is None else salary * cost_of_living / 100.0
+        salary = self.regional[i, j, t]
+        return None if np.isnan(salary) else float(salary)
+
+
+def load_sweep(path):
+    """Load a sweep saved by save_sweep into a SweepTable."""
+    with np.load(path) as data:
+        return SweepTable({name: data[name] for name in data.files})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep recruitment model inputs over a grid')
+    for name, (start, stop, step) in DEFAULT_RANGES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, nargs=3,
+                            metavar=('START', 'STOP', 'STEP'), default=None,
+                            help=f'Range for {name} (default: {start} {stop} {step})')
+    parser.add_argument('--salaries', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                        default=None, help='Also tabulate probabilities over this salary range ($1000s)')
+    parser.add_argument('--output', default=DEFAULT_SWEEP_FILE,
+                        help=f'Output .npz file (default: {DEFAULT_SWEEP_FILE}, which the app reads)')
+
+    args = parser.parse_args()
+
+    ranges = {name: tuple(getattr(args, name)) for name in DEFAULT_RANGES
+              if getattr(args, name) is not None}
+    salaries = inclusive_range(*args.salaries) if args.salaries else None
+
+    sweep = run_sweep(ranges, salaries)
+    save_sweep(args.output, sweep)
+
+    grid = sweep['recommended_salary']
+    print(f"Swept {grid.size:,} combinations of {', '.join(SALARY_AXES)}")
+    print(f"Grid shape: {grid.shape} ({grid.nbytes / 1e6:.1f} MB)")
+    if 'probability' in sweep:
+        print(f"Probability grid shape: {sweep['probability'].shape}")
+    print(f"Unattainable targets: {np.isnan(grid).mean():.1%}")
+    print(f"\nSweep saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Allocate a fixed compensation budget across open positions.
+
+Each position has its own culture score and regional cost of living index.
+Position i offered regional salary s (in $1000s) is filled with probability
+
+    P_i(s) = a * sigmoid(b * (s / m_i - (c - k_i))),    m_i = cost of living / 100
+
+and the optimizer maximizes the expected number of hires, sum P_i(s_i),
+subject to sum s_i <= budget. With multiplier lam on the budget, each
+funded position maximizes P_i(s) - lam * s. The sigmoid's derivative is
+closed-form: dP_i/ds = a * b * q * (1 - q) / m_i, with q = P_i / a. Setting
+it to lam gives
+
+    q = (1 +/- sqrt(1 - 4 * lam * m_i / (a * b))) / 2
+
+with the + root on the concave upper half of the curve. For a fixed set of
+funded positions on that half, total spend falls as lam grows, so one
+bisection spends the budget exactly, and the optimum has that form except
+that at most one funded position may sit below its inflection point.
+
+Funding is all-or-nothing, so the optimizer compares funded sets. Each
+position is worth funding for every lam below its own break-even
+multiplier, so sorting by it gives nested candidate sets (prefixes). The
+smallest budget a prefix needs grows with its length, so a binary search
+bounds the feasible ones. Cumulative sums over a log-spaced grid of lam
+give a Lagrangian upper bound for every prefix at once, and prefixes are
+solved exactly in order of that bound until none can beat the best, so
+every feasible prefix is covered. Two more kinds of plan are compared:
+one extra position taking whatever a prefix leaves, which covers the
+position below its inflection point, and the whole budget on the single
+position it helps most, the only option when the budget is below every
+inflection salary. 10^4 positions take well under a second, and the
+allocation never exceeds the budget.
+
+Because the curve is S-shaped, money is not spread thinly. Funded positions
+are offered at least their regional inflection point, apart from the one
+taking a remainder, and the budget decides how many positions are funded
+as well as how much each gets.
+
+Usage:
+    python portfolio_optimizer.py --budget 20000000 --positions 40 --cost-of-living 91
+    python portfolio_optimizer.py --budget 150000000 --positions-file positions.csv \\
+        --culture-column culture --cost-of-living-column cost_of_living --output allocation.csv
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import logit
+
+from recruitment_core import sigmoid_recruitment
+
+# Bisection steps on the budget multiplier; each halves the bracket
+BISECTION_STEPS = 60
+
+# Golden-section steps when refining a split with a remainder position
+GOLDEN_SECTION_STEPS = 40
+
+# Multipliers in the grid for the prefix bounds and the remainder splits
+BOUND_MULTIPLIERS = 256
+
+# Remainder splits picked on the grid that are then refined exactly
+REMAINDER_CANDIDATES = 8
+
+
+def _break_even_multipliers(a, b, shift, col_adjustment):
+    """
+    Largest lam at which funding each position still beats leaving it unfunded.
+
+    P_i(s) - lam * s at the best response falls as lam grows, so each
+    position's break-even point is found by a vectorized bisection.
+    """
+    unfunded_value = sigmoid_recruitment(0, a, b, shift)
+    low, high = np.zeros(shift.shape), a * b / (4 * col_adjustment)
+    for _ in range(BISECTION_STEPS):
+        lam = (low + high) / 2
+        q = (1 + np.sqrt(1 - 4 * lam * col_adjustment / (a * b))) / 2
+        salary = np.maximum(col_adjustment * (shift + logit(q) / b), 0)
+        net_value = sigmoid_recruitment(salary / col_adjustment, a, b, shift) - lam * salary
+        worth_funding = net_value > unfunded_value
+        low = np.where(worth_funding, lam, low)
+        high = np.where(worth_funding, high, lam)
+    return low
+
+
+def _spread_salaries(lam, a, b, shift, col_adjustment):
+    """Salaries ($1000s) on the concave upper branch of each curve at multiplier lam."""
+    q = (1 + np.sqrt(np.maximum(1 - 4 * lam * col_adjustment / (a * b), 0))) / 2
+    return np.maximum(col_adjustment * (shift + logit(q) / b), 0)
+
+
+def _minimum_spend(a, b, shift, col_adjustment):
+    """
+    Least budget that funds every given position on its concave branch.
+
+    The multiplier cannot exceed min(a * b / (4 * m_i)), where the position
+    with the largest cost of living sits at its inflection point and the
+    others sit above theirs.
+    """
+    lam_max = float(np.min(a * b / (4 * col_adjustment)))
+    return float(_spread_salaries(lam_max, a, b, shift, col_adjustment).sum())
+
+
+def _spread_budget(budget_K, a, b, shift, col_adjustment):
+    """
+    Best split of the whole budget over positions that are all funded.
+
+    The budget must cover _minimum_spend of the positions; spend then falls
+    from above the budget at lam = 0 to at most the budget at the upper end.
+
+    Returns:
+    Tuple of (salaries in $1000s, multiplier lam)
+    """
+    lam_low, lam_high = 0.0, float(np.min(a * b / (4 * col_adjustment)))
+    for _ in range(BISECTION_STEPS):
+        lam = (lam_low + lam_high) / 2
+        if _spread_salaries(lam, a, b, shift, col_adjustment).sum() > budget_K:
+            lam_low = lam
+        else:
+            lam_high = lam
+    return _spread_salaries(lam_high, a, b, shift, col_adjustment), lam_high
+
+
+def _spread_with_remainder(budget_K, a, b, shift, col_adjustment, lam_low, lam_high):
+    """
+    Best split giving all but the last position their concave-branch salary
+    at a common multiplier and the last position what is left of the budget.
+
+    The multiplier is searched by golden section within [lam_low, lam_high],
+    each step shrinking the range by about 0.618.
+
+    Returns:
+    Tuple of (salaries in $1000s, multiplier lam, expected hires gained over
+    leaving the positions unfunded), or None when no multiplier in the range
+    fits the budget
+    """
+    unfunded_value = sigmoid_recruitment(0, a, b, shift)
+
+    def split(lam):
+        salary = _spread_salaries(lam, a, b, shift[:-1], col_adjustment[:-1])
+        salary = np.append(salary, budget_K - salary.sum())
+        if salary[-1] < 0:
+            return salary, -np.inf
+        gain = sigmoid_recruitment(salary / col_adjustment, a, b, shift) - unfunded_value
+        return salary, float(gain.sum())
+
+    ratio = (np.sqrt(5) - 1) / 2
+    low, high = lam_low, lam_high
+    left, right = high - ratio * (high - low), low + ratio * (high - low)
+    left_gain, right_gain = split(left)[1], split(right)[1]
+    for _ in range(GOLDEN_SECTION_STEPS):
+        if left_gain >= right_gain:
+            high, right, right_gain = right, left, left_gain
+            left = high - ratio * (high - low)
+            left_gain = split(left)[1]
+        else:
+            low, left, left_gain = left, right, right_gain
+            right = low + ratio * (high - low)
+            right_gain = split(right)[1]
+    best = max((lam_low, lam_high, (low + high) / 2), key=lambda lam: split(lam)[1])
+    salary, gain = split(best)
+    return None if gain == -np.inf else (salary, best, gain)
+
+
+def _multiplier_grid(lam_max, a, b, shift, col_adjustment):
+    """
+    Concave-branch salary and gain of every position on a log-spaced grid of
+    multipliers up to lam_max.
+
+    Returns:
+    Tuple of (multipliers as a column, salaries in $1000s, gain P_i(s) - P_i(0)),
+    the last two with one row per multiplier and one column per position
+    """
+    lam = np.geomspace(lam_max * 1e-6, lam_max, BOUND_MULTIPLIERS)[:, None]
+    salary = _spread_salaries(lam, a, b, shift, col_adjustment)
+    gain = (sigmoid_recruitment(salary / col_adjustment, a, b, shift)
+            - sigmoid_recruitment(0, a, b, shift))
+    return lam, salary, gain
+
+
+def optimize_offers(budget, a, b, c, culture=0, cost_of_living=100, n_positions=None):
+    """
+    Split a budget across positions to maximize the expected number of hires.
+
+    Parameters:
+    budget: total compensation budget in $USD
+    a, b, c: curve parameters
+    culture: culture factor of each position (scalar or array)
+    cost_of_living: cost of living index of each position (scalar or array)
+    n_positions: number of positions when culture and cost_of_living are both scalars
+
+    Returns:
+    Dictionary with 'salary' (regional $USD per position, 0 if unfunded),
+    'probability' (per position), 'expected_hires', 'spent' ($USD, never
+    above the budget), 'n_funded' and 'marginal_hires' (expected hires per
+    extra $1000 at the optimum)
+    """
+    culture, cost_of_living = np.broadcast_arrays(
+        np.asarray(culture, dtype=float), np.asarray(cost_of_living, dtype=float))
+    if culture.ndim == 0:
+        shape = (1 if n_positions is None else n_positions,)
+        culture, cost_of_living = np.broadcast_to(culture, shape), np.broadcast_to(cost_of_living, shape)
+    shift = c - culture
+    col_adjustment = cost_of_living / 100.0
+    budget_K = max(budget / 1000.0, 0.0)
+
+    # Candidate funded sets are prefixes of the break-even order
+    order = np.argsort(-_break_even_multipliers(a, b, shift, col_adjustment), kind='stable')
+    shift, col_adjustment = shift[order], col_adjustment[order]
+    unfunded_value = sigmoid_recruitment(0, a, b, shift)
+
+    # Boundary solution: the whole budget on the one position it helps most.
+    # This is the best use of a budget below every inflection salary, where no
+    # prefix can be funded on its concave branch.
+    gain = sigmoid_recruitment(budget_K / col_adjustment, a, b, shift) - unfunded_value
+    single = int(np.argmax(gain))
+    q = (unfunded_value[single] + gain[single]) / a
+    best_salary = np.zeros(shift.shape)
+    best_salary[single] = budget_K
+    best_hires = float(unfunded_value.sum() + max(gain[single], 0.0))
+    best_marginal = float(a * b * q * (1 - q) / col_adjustment[single])
+    if gain[single] <= 0:
+        best_salary[single], best_marginal = 0.0, 0.0
+
+    # The minimum spend grows with the prefix, so the feasible prefixes are 1..n_feasible
+    low, high = 0, len(shift)
+    while low < high:
+        k = (low + high + 1) // 2
+        if _minimum_spend(a, b, shift[:k], col_adjustment[:k]) <= budget_K:
+            low = k
+        else:
+            high = k - 1
+    n_feasible = low
+
+    # Only the first n positions can be funded on their concave branch, even
+    # with one of them left out, so the multiplier grid covers just those
+    lam_max = float(np.max(a * b / (4 * col_adjustment)))
+    least_salary = _spread_salaries(lam_max, a, b, shift, col_adjustment)
+    n = min(len(shift), 1 + int(np.searchsorted(
+        np.cumsum(least_salary), budget_K + least_salary.max(), side='right')))
+
+    # Every feasible prefix is searched. For any lam >= 0, lam * budget plus
+    # the concave-branch peaks of P_i(s) - P_i(0) - lam * s over a prefix
+    # bounds its best split, and the smallest such value is the split itself,
+    # so prefixes are solved in order of their bound on the grid until none
+    # can beat the best found.
+    lam, spread, spread_gain = _multiplier_grid(lam_max, a, b, shift[:n], col_adjustment[:n])
+    start = np.zeros((len(lam), 1))
+    cumulative_spend = np.concatenate([start, np.cumsum(spread, axis=1)], axis=1)
+    cumulative_gain = np.concatenate([start, np.cumsum(spread_gain, axis=1)], axis=1)
+    total_unfunded = float(unfunded_value.sum())
+    bounds = (lam * budget_K + cumulative_gain - lam * cumulative_spend).min(axis=0) + total_unfunded
+    for k in np.argsort(-bounds[1:n_feasible + 1], kind='stable') + 1:
+        if bounds[k] <= best_hires:
+            break
+        salary, multiplier = _spread_budget(budget_K, a, b, shift[:k], col_adjustment[:k])
+        hires = total_unfunded + float(np.sum(
+            sigmoid_recruitment(salary / col_adjustment[:k], a, b, shift[:k]) - unfunded_value[:k]))
+        if hires > best_hires:
+            best_salary = np.concatenate([salary, np.zeros(len(shift) - k)])
+            best_hires, best_marginal = hires, multiplier
+
+    # At the optimum one funded position may sit below its inflection point,
+    # on the convex branch, so concave splits are also tried with one more
+    # position taking whatever they leave: a prefix with the next position,
+    # and a prefix without its highest cost of living position, which limits
+    # the prefix's multiplier. The grid picks the most promising of these,
+    # which are then refined exactly.
+    def remainder_value(concave_spend, concave_gain, remainder):
+        leftover = budget_K - concave_spend
+        with np.errstate(invalid='ignore'):
+            return np.where(leftover >= 0, concave_gain - unfunded_value[remainder] + sigmoid_recruitment(
+                leftover / col_adjustment[remainder], a, b, shift[remainder]), -np.inf)
+
+    record = col_adjustment[:n] > np.maximum.accumulate(np.concatenate([[-np.inf], col_adjustment[:n - 1]]))
+    highest_cost = np.maximum.accumulate(np.where(record, np.arange(n), 0))[1:]
+    values = np.concatenate([
+        remainder_value(cumulative_spend[:, 1:-1], cumulative_gain[:, 1:-1], np.arange(1, n)),
+        remainder_value(cumulative_spend[:, 2:] - spread[:, highest_cost],
+                        cumulative_gain[:, 2:] - spread_gain[:, highest_cost], highest_cost),
+    ], axis=1)
+    grid_best = np.argmax(values, axis=0)
+    candidate_best = values[grid_best, np.arange(values.shape[1])]
+
+    splits = []
+    for candidate in np.argsort(-candidate_best, kind='stable')[:REMAINDER_CANDIDATES]:
+        if not np.isfinite(candidate_best[candidate]):
+            break
+        g = grid_best[candidate]
+        if candidate < n - 1:
+            # The remainder goes to whichever later position gains most from it
+            k = candidate + 1
+            leftover = budget_K - cumulative_spend[g, k]
+            remainder = k + int(np.argmax(sigmoid_recruitment(leftover / col_adjustment[k:], a, b, shift[k:])
+                                          - unfunded_value[k:]))
+            g = int(np.argmax(remainder_value(cumulative_spend[:, k], cumulative_gain[:, k], remainder)))
+            concave = np.arange(k)
+        else:
+            k = candidate - (n - 1) + 2
+            remainder = highest_cost[k - 2]
+            concave = np.delete(np.arange(k), remainder)
+        positions = np.append(concave, remainder)
+        splits.append((positions, _spread_with_remainder(
+            budget_K, a, b, shift[positions], col_adjustment[positions],
+            float(lam[max(g - 1, 0), 0]), float(lam[min(g + 1, len(lam) - 1), 0]))))
+
+    for positions, split in splits:
+        if split is not None and total_unfunded + split[2] > best_hires:
+            best_salary = np.zeros(shift.shape)
+            best_salary[positions] = split[0]
+            best_hires, best_marginal = total_unfunded + split[2], split[1]
+
+    if best_salary.sum() > budget_K * (1 + 1e-12):
+        raise RuntimeError(f"Allocation of ${best_salary.sum() * 1000:,.0f} exceeds the "
+                           f"${budget_K * 1000:,.0f} budget")
+    salary, probability = np.zeros(shift.shape), np.zeros(shift.shape)
+    salary[order] = best_salary
+    probability[order] = sigmoid_recruitment(best_salary / col_adjustment, a, b, shift)
+    return {
+        'salary': salary * 1000.0,
+        'probability': probability,
+        'expected_hires': float(probability.sum()),
+        'spent': float(salary.sum() * 1000.0),
+        'n_funded': int((best_salary > 0).sum()),
+        'marginal_hires': best_marginal,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Allocate a compensation budget across open positions')
+    parser.add_argument('--budget', type=float, required=True, help='Total compensation budget in $USD')
+    parser.add_argument('--params', default='parameters.json', help='Path to parameters file')
+    parser.add_argument('--positions', type=int, default=None,
+                        help='Number of identical positions (when no --positions-file is given)')
+    parser.add_argument('--positions-file', default=None,
+                        help='CSV file with one row per open position')
+    parser.add_argument('--culture', type=float, default=0,
+                        help='Culture factor for every position (default: 0)')
+    parser.add_argument('--culture-column', help='Positions-file column with a culture factor per position')
+    parser.add_argument('--cost-of-living', type=float, default=100,
+                        help='Cost of living index for every position (default: 100)')
+    parser.add_argument('--cost-of-living-column',
+                        help='Positions-file column with a cost of living index per position')
+    parser.add_argument('--output', default=None, help='CSV file for the per-position allocation')
+
+    args = parser.parse_args()
+
+    if (args.positions is None) == (args.positions_file is None):
+        parser.error("give exactly one of --positions and --positions-file")
+    if args.positions is not None and args.positions <= 0:
+        parser.error("--positions must be positive")
+    if (args.culture_column or args.cost_of_living_column) and not args.positions_file:
+        parser.error("--culture-column and --cost-of-living-column need --positions-file")
+
+    with open(args.params, 'r') as f:
+        curve = json.load(f)['curve_parameters']
+
+    if args.positions_file:
+        positions = pd.read_csv(args.positions_file)
+        for column in (args.culture_column, args.cost_of_living_column):
+            if column and column not in positions.columns:
+                parser.error(f"column '{column}' not found in {args.positions_file}")
+    else:
+        positions = pd.DataFrame(index=range(args.positions))
+    culture = positions[args.culture_column].to_numpy() if args.culture_column else args.culture
+    cost_of_living = (positions[args.cost_of_living_column].to_numpy()
+                      if args.cost_of_living_column else args.cost_of_living)
+
+    start = time.perf_counter()
+    result = optimize_offers(args.budget, curve['a'], curve['b'], curve['c'], culture, cost_of_living,
+                             n_positions=len(positions))
+    elapsed = time.perf_counter() - start
+
+    funded = result['salary'] > 0
+    print(f"Allocated ${result['spent']:,.0f} of ${args.budget:,.0f} across {len(positions)} positions "
+          f"in {elapsed * 1000:.1f} ms")
+    print(f"  Funded positions: {result['n_funded']}")
+    print(f"  Expected hires:   {result['expected_hires']:.2f}")
+    if funded.any():
+        print(f"  Offers:           ${result['salary'][funded].min() / 1000:.0f}K - "
+              f"${result['salary'][funded].max() / 1000:.0f}K "
+              f"(probability {result['probability'][funded].min():.0%} - "
+              f"{result['probability'][funded].max():.0%})")
+        print(f"  Marginal value:   {result['marginal_hires'] * 100:.3f} expected hires per extra $100K")
+
+    if args.output:
+        positions['salary'] = result['salary']
+        positions['probability'] = result['probability']
+        positions.to_csv(args.output, index=False)
+        print(f"\nAllocation saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Bayesian posterior sampling of the recruitment curve parameters.
+
+The Gaussian parameter_covariance from the likelihood fit is a poor
+summary when the asymptote a sits near its upper limit of 1: the fit is
+clamped at the bound and the curvature there says little about the
+uncertainty. This script samples the posterior of (a, b, c) instead:
+
+    a ~ Beta(alpha, beta)                 (support (0, 1), so a <= 1 holds exactly)
+    b ~ LogNormal(log(median), log_sd)    (positive slope)
+    c ~ Normal(mean, sd)                  (inflection point, $1000s)
+
+The likelihood is the binomial likelihood of the salary bins, the same
+likelihood the fit maximizes. Sampling happens in the unconstrained
+coordinates (logit a, log b, c) by random-walk Metropolis. Every step
+advances a whole block of chains with one batched likelihood evaluation.
+During warm-up the proposal covariance adapts to the pooled chain history.
+Chain blocks have their own seeds spawned from one SeedSequence and run
+across a process pool (as in bootstrap_fit), so the draws for a given seed
+do not depend on the number of workers.
+
+The draws are written to a compact float32 .npz file together with their
+priors, diagnostics (split R-hat, effective sample size) and the maximum
+likelihood curve of the sampled data. The app and batch_score.py read it
+for credible bands on the recommended salary. Each parameter set has its
+own file (posterior_path): posterior_draws.npz for the default set and
+parameter_sets/<name>.posterior.npz for the others, and the app shows the
+band only while its curve sliders sit on the sampled curve.
+
+Usage:
+    python posterior_sampler.py offers.csv --chains 32 --draws 1000
+    python posterior_sampler.py cardiac.offers --parameter-set cardiac
+    python posterior_sampler.py offers.offers --bin-width 1000 --prior-a 20 2 --output posterior.npz
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from scipy.special import expit, log_expit, logit
+
+from recruitment_core import find_salary_for_probability
+from likelihood_fit import aggregate_offers, batched_log_likelihood, fit_maximum_likelihood
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, read_offers
+from parameter_store import DEFAULT_SET_NAME, PARAMETER_SETS_DIR
+
+PARAMETER_NAMES = ('a', 'b', 'c')
+DEFAULT_POSTERIOR_FILE = 'posterior_draws.npz'
+
+# Suffix of the posterior file stored next to a named parameter set
+POSTERIOR_SUFFIX = '.posterior.npz'
+
+# Largest difference per parameter for a curve to count as the sampled one
+# (half a step of the app's curve sliders)
+CURVE_MATCH_TOLERANCE = {'a': 0.005, 'b': 0.0005, 'c': 2.5}
+
+# Chains advanced together in one independently seeded block of work
+CHAINS_PER_BLOCK = 8
+
+# Warm-up steps between proposal covariance updates
+ADAPT_INTERVAL = 100
+
+# Optimal random-walk scaling for a 3-dimensional target
+PROPOSAL_SCALE = 2.38 ** 2 / 3
+
+
+def posterior_path(parameter_set=DEFAULT_SET_NAME, sets_dir=PARAMETER_SETS_DIR):
+    """Posterior draws file of a parameter set (DEFAULT_POSTERIOR_FILE for the default set)."""
+    if parameter_set == DEFAULT_SET_NAME:
+        return DEFAULT_POSTERIOR_FILE
+    return os.path.join(sets_dir, parameter_set + POSTERIOR_SUFFIX)
+
+
+def default_priors(salaries, n_offers=None):
+    """
+    Weakly informative priors: uniform a, slope within a factor e of 0.02
+    (one sd), and the inflection point within $100K of the median salary.
+    """
+    x = np.asarray(salaries, dtype=float)
+    weights = np.ones_like(x) if n_offers is None else np.asarray(n_offers, dtype=float)
+    order = np.argsort(x, kind='stable')
+    cumulative = np.cumsum(weights[order])
+    median = x[order][np.searchsorted(cumulative, cumulative[-1] / 2)]
+    return {
+        'a': {'alpha': 1.0, 'beta': 1.0},
+        'b': {'median': 0.02, 'log_sd': 1.0},
+        'c': {'mean': float(median), 'sd': 100.0},
+    }
+
+
+def to_parameters(u):
+    """(a, b, c) from unconstrained (logit a, log b, c), row-wise."""
+    return np.column_stack([expit(u[:, 0]), np.exp(u[:, 1]), u[:, 2]])
+
+
+def to_unconstrained(theta):
+    """(logit a, log b, c) from (a, b, c), row-wise."""
+    theta = np.atleast_2d(theta)
+    return np.column_stack([logit(theta[:, 0]), np.log(theta[:, 1]), theta[:, 2]])
+
+
+def log_posterior(u, salaries, n_accepted, n_offers, priors):
+    """
+    Unnormalized log posterior density in the unconstrained coordinates.
+
+    Includes the log-Jacobian of the transform: log a + log(1 - a) for the
+    logit and log b for the log (which cancels the log-normal's 1/b).
+    """
+    theta = to_parameters(u)
+    log_likelihood = batched_log_likelihood(theta, salaries, n_accepted, n_offers)
+
+    prior_a, prior_b, prior_c = priors['a'], priors['b'], priors['c']
+    log_prior = (prior_a['alpha'] * log_expit(u[:, 0]) + prior_a['beta'] * log_expit(-u[:, 0])
+                 - 0.5 * ((u[:, 1] - np.log(prior_b['median'])) / prior_b['log_sd']) ** 2
+                 - 0.5 * ((u[:, 2] - prior_c['mean']) / prior_c['sd']) ** 2)
+    return np.where(np.isfinite(log_likelihood), log_likelihood + log_prior, -np.inf)
+
+
+def _sample_block(task):
+    """Run one block of chains: adaptive warm-up, then the kept draws."""
+    salaries, n_accepted, n_offers, priors, start, start_cov, n_chains, n_warmup, n_draws, seed = task
+    rng = np.random.default_rng(seed)
+
+    # Starting points scattered around the maximum-likelihood estimate
+    u = start + rng.multivariate_normal(np.zeros(3), start_cov, size=n_chains)
+    log_p = log_posterior(u, salaries, n_accepted, n_offers, priors)
+    cov = PROPOSAL_SCALE * start_cov
+    chol = np.linalg.cholesky(cov)
+    floor = 1e-6 * np.diag(np.diag(start_cov))
+
+    # Warm-up history, with its first interval (still near the start points) dropped
+    history = []
+    draws = np.empty((n_chains, n_draws, 3))
+    n_accepted_moves = 0
+    for step in range(n_warmup + n_draws):
+        proposal = u + rng.standard_normal((n_chains, 3)) @ chol.T
+        proposal_log_p = log_posterior(proposal, salaries, n_accepted, n_offers, priors)
+        accept = np.log(rng.random(n_chains)) < proposal_log_p - log_p
+        u[accept] = proposal[accept]
+        log_p[accept] = proposal_log_p[accept]
+
+        if step < n_warmup:
+            if step >= ADAPT_INTERVAL:
+                history.append(u.copy())
+            if history and (step + 1) % ADAPT_INTERVAL == 0:
+                cov = PROPOSAL_SCALE * np.cov(np.concatenate(history).T) + floor
+                chol = np.linalg.cholesky(cov)
+        else:
+            draws[:, step - n_warmup] = u
+            n_accepted_moves += int(accept.sum())
+
+    draws = to_parameters(draws.reshape(-1, 3)).reshape(n_chains, n_draws, 3)
+    return draws, n_accepted_moves
+
+
+def split_rhat(draws):
+    """
+    Split R-hat per parameter for draws of shape (chains, draws, parameters).
+
+    Values near 1 (below about 1.05) indicate the chains agree.
+    """
+    half = draws.shape[1] // 2
+    chains = np.concatenate([draws[:, :half], draws[:, half:2 * half]])
+    within = chains.var(axis=1, ddof=1).mean(axis=0)
+    between = half * chains.mean(axis=1).var(axis=0, ddof=1)
+    pooled = (half - 1) / half * within + between / half
+    return np.sqrt(pooled / within)
+
+
+def effective_sample_size(draws):
+    """
+    Effective number of independent draws per parameter.
+
+    Uses the chain-averaged autocorrelation (by FFT), summed over lags until
+    it first drops below zero.
+    """
+    n_chains, n_draws, _ = draws.shape
+    centered = draws - draws.mean(axis=1, keepdims=True)
+    size = 2 ** int(np.ceil(np.log2(2 * n_draws)))
+    spectrum = np.fft.rfft(centered, n=size, axis=1)
+    autocovariance = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=1)[:, :n_draws]
+    autocorrelation = (autocovariance / autocovariance[:, :1]).mean(axis=0)
+
+    ess = np.empty(draws.shape[2])
+    for j in range(draws.shape[2]):
+        rho = autocorrelation[1:, j]
+        negative = np.flatnonzero(rho < 0)
+        tau = 1 + 2 * rho[:negative[0] if len(negative) else len(rho)].sum()
+        ess[j] = n_chains * n_draws / max(tau, 1e-12)
+    return ess
+
+
+def sample_posterior(salaries, acceptances, n_offers=None, priors=None, n_chains=32, n_draws=1000,
+                     n_warmup=1000, seed=0, n_workers=None):
+    """
+    Draw from the posterior of (a, b, c).
+
+    Parameters:
+    salaries: compensation in thousands
+    acceptances: 0/1 outcomes, or accepted counts per salary bin
+    n_offers: offers per salary bin (None for individual offers)
+    priors: prior hyperparameters (default: default_priors)
+    n_chains: number of chains (rounded up to whole blocks of CHAINS_PER_BLOCK)
+    n_draws: kept draws per chain
+    n_warmup: adaptive warm-up steps per chain, discarded
+    seed: seed for the SeedSequence the block seeds are spawned from
+    n_workers: worker processes (default: all cores)
+
+    Returns:
+    Dictionary with 'draws' (chains, draws, 3), 'priors', 'acceptance_rate',
+    'rhat', 'ess' and 'maximum_likelihood' (the (a, b, c) the chains start from)
+    """
+    if n_offers is None:
+        salaries, n_offers, acceptances = aggregate_offers(salaries, acceptances)
+    salaries = np.asarray(salaries, dtype=float)
+    n_accepted = np.asarray(acceptances, dtype=float)
+    n_offers = np.asarray(n_offers, dtype=float)
+    priors = priors or default_priors(salaries, n_offers)
+
+    # Start at the maximum-likelihood estimate, pulled inside (0, 1) for logit a,
+    # with the Laplace covariance mapped to the unconstrained coordinates
+    fit = fit_maximum_likelihood(salaries, n_accepted, n_offers)
+    a, b, c = fit['params']
+    a = min(max(a, 0.01), 0.99)
+    jacobian = np.diag([1 / (a * (1 - a)), 1 / b, 1.0])
+    start_cov = jacobian @ fit['covariance'] @ jacobian + 1e-6 * np.eye(3)
+    start = to_unconstrained([a, b, c])[0]
+
+    n_blocks = max(-(-n_chains // CHAINS_PER_BLOCK), 1)
+    seeds = np.random.SeedSequence(seed).spawn(n_blocks)
+    tasks = [
+        (salaries, n_accepted, n_offers, priors, start, start_cov, CHAINS_PER_BLOCK, n_warmup, n_draws,
+         block_seed)
+        for block_seed in seeds
+    ]
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    if n_workers <= 1:
+        blocks = [_sample_block(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            blocks = list(pool.map(_sample_block, tasks))
+
+    draws = np.concatenate([block for block, _ in blocks])
+    n_moves = sum(moves for _, moves in blocks)
+    return {
+        'draws': draws,
+        'priors': priors,
+        'acceptance_rate': n_moves / (draws.shape[0] * n_draws),
+        'rhat': split_rhat(draws),
+        'ess': effective_sample_size(draws),
+        'maximum_likelihood': fit['params'],
+    }
+
+
+def save_posterior(path, posterior, metadata=None):
+    """Write the draws as float32 with their priors, diagnostics and metadata."""
+    info = {
+        'parameter_names': PARAMETER_NAMES,
+        'priors': posterior['priors'],
+        'acceptance_rate': float(posterior['acceptance_rate']),
+        'rhat': dict(zip(PARAMETER_NAMES, posterior['rhat'].tolist())),
+        'ess': dict(zip(PARAMETER_NAMES, posterior['ess'].tolist())),
+        'maximum_likelihood': dict(zip(PARAMETER_NAMES, np.asarray(posterior['maximum_likelihood']).tolist())),
+        **(metadata or {}),
+    }
+    np.savez(path, draws=posterior['draws'].astype(np.float32), metadata=json.dumps(info))
+
+
+def load_posterior(path):
+    """
+    Read a posterior file written by save_posterior.
+
+    Returns:
+    Tuple of (draws of shape (n, 3) pooled over chains, metadata dict)
+    """
+    with np.load(path) as saved:
+        draws = saved['draws'].astype(float).reshape(-1, 3)
+        metadata = json.loads(str(saved['metadata']))
+    return draws, metadata
+
+
+def sampled_curve_matches(metadata, curve, tolerance=CURVE_MATCH_TOLERANCE):
+    """
+    Whether a curve is the one a posterior file was sampled around.
+
+    Parameters:
+    metadata: metadata from load_posterior
+    curve: dictionary with 'a', 'b' and 'c'
+    tolerance: largest allowed difference per parameter (default: half a slider step)
+
+    Returns:
+    True when every parameter is within tolerance of the sampled data's maximum
+    likelihood curve; False otherwise or when the file does not record it
+    """
+    sampled = metadata.get('maximum_likelihood')
+    if not sampled:
+        return False
+    return all(abs(curve[name] - sampled[name]) <= tolerance[name] for name in PARAMETER_NAMES)
+
+
+def format_salary_limit(limit, unbounded='no upper limit'):
+    """A credible limit in $1000s for printing, e.g. '$412K'; inf prints as unbounded."""
+    return f"${limit:.0f}K" if np.isfinite(limit) else unbounded
+
+
+def salary_credible_interval(draws, target_probability=0.8, level=0.95):
+    """
+    Credible interval of the national salary ($1000s) reaching a target probability.
+
+    The salary is c + logit(target / a) / b at culture 0. A culture factor k
+    subtracts k and a cost of living index multiplies by index / 100, both
+    monotone, so offer-specific intervals follow from this one without
+    re-evaluating the draws.
+
+    Parameters:
+    draws: posterior draws, shape (n, 3)
+    target_probability: probability the salary should achieve
+    level: credible level of the central interval
+
+    Returns:
+    Tuple of (lower, median, upper); draws whose asymptote is below the target
+    count as an infinite salary, so the upper limit is inf when they exceed
+    (1 - level) / 2 of the posterior
+    """
+    salary = find_salary_for_probability(target_probability, draws[:, 0], draws[:, 1], draws[:, 2])
+    salary = np.where(np.isnan(salary), np.inf, salary)
+    tail = (1 - level) / 2
+    lower, median, upper = np.quantile(salary, [tail, 0.5, 1 - tail], method='inverted_cdf')
+    return float(lower), float(median), float(upper)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sample the posterior of the recruitment curve parameters')
+    parser.add_argument('data_file', help='Path to CSV file or .offers directory with offer data')
+    parser.add_argument('--parameter-set', default=DEFAULT_SET_NAME,
+                        help='Parameter set the data belongs to; picks the default --output '
+                             f'(default: {DEFAULT_SET_NAME})')
+    parser.add_argument('--output', default=None,
+                        help=f'Posterior draws file (default: {DEFAULT_POSTERIOR_FILE} for the default set, '
+                             f'{PARAMETER_SETS_DIR}/<name>{POSTERIOR_SUFFIX} for others)')
+    parser.add_argument('--chains', type=int, default=32, help='Number of chains (default: 32)')
+    parser.add_argument('--draws', type=int, default=1000, help='Kept draws per chain (default: 1000)')
+    parser.add_argument('--warmup', type=int, default=1000,
+                        help='Adaptive warm-up steps per chain (default: 1000)')
+    parser.add_argument('--bin-width', type=float, default=0,
+                        help='Salary bin width in $USD (default: 0, exact salaries)')
+    parser.add_argument('--prior-a', type=float, nargs=2, metavar=('ALPHA', 'BETA'), default=None,
+                        help='Beta prior on the asymptote a (default: 1 1, uniform)')
+    parser.add_argument('--prior-b', type=float, nargs=2, metavar=('MEDIAN', 'LOG_SD'), default=None,
+                        help='Log-normal prior on the slope b (default: 0.02 1.0)')
+    parser.add_argument('--prior-c', type=float, nargs=2, metavar=('MEAN', 'SD'), default=None,
+                        help='Normal prior on the inflection point c in $1000s (default: median salary, 100)')
+    parser.add_argument('--target-probability', type=float, default=0.8,
+                        help='Target probability for the recommended-salary interval (default: 0.8)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+
+    args = parser.parse_args()
+
+    if args.chains < 1 or args.draws < 4:
+        parser.error("--chains must be at least 1 and --draws at least 4")
+    if args.warmup < ADAPT_INTERVAL:
+        parser.error(f"--warmup must be at least {ADAPT_INTERVAL}")
+    output = args.output or posterior_path(args.parameter_set)
+
+    df = read_offers(args.data_file)
+    salaries, n_offers, n_accepted = aggregate_offers(
+        df[SALARY_COLUMN].to_numpy() / 1000, df[ACCEPTANCE_COLUMN].to_numpy(dtype=float),
+        args.bin_width / 1000)
+    del df
+
+    priors = default_priors(salaries, n_offers)
+    if args.prior_a:
+        priors['a'] = {'alpha': args.prior_a[0], 'beta': args.prior_a[1]}
+    if args.prior_b:
+        priors['b'] = {'median': args.prior_b[0], 'log_sd': args.prior_b[1]}
+    if args.prior_c:
+        priors['c'] = {'mean': args.prior_c[0], 'sd': args.prior_c[1]}
+
+    posterior = sample_posterior(salaries, n_accepted, n_offers, priors, args.chains, args.draws,
+                                 args.warmup, args.seed, args.workers)
+    draws = posterior['draws'].reshape(-1, 3)
+
+    print(f"{posterior['draws'].shape[0]} chains x {args.draws} draws "
+          f"(acceptance rate {posterior['acceptance_rate']:.2f}) from {int(n_offers.sum())} offers:")
+    print(f"  {'':<4}{'median':>10}{'2.5%':>10}{'97.5%':>10}{'R-hat':>8}{'ESS':>8}")
+    for j, name in enumerate(PARAMETER_NAMES):
+        low, median, high = np.quantile(draws[:, j], [0.025, 0.5, 0.975])
+        print(f"  {name:<4}{median:>10.4g}{low:>10.4g}{high:>10.4g}"
+              f"{posterior['rhat'][j]:>8.3f}{posterior['ess'][j]:>8.0f}")
+    if (posterior['rhat'] > 1.05).any():
+        print("Warning: R-hat above 1.05; run more warm-up steps or draws")
+
+    low, median, high = salary_credible_interval(draws, args.target_probability)
+    print(f"Salary for {args.target_probability:.0%} probability: {format_salary_limit(median, 'unattainable')} "
+          f"(95% credible interval {format_salary_limit(low, 'unattainable')} - {format_salary_limit(high)})")
+
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    save_posterior(output, posterior, {
+        'date': datetime.now().isoformat(),
+        'data_file': args.data_file,
+        'parameter_set': args.parameter_set,
+        'n_samples': int(n_offers.sum()),
+        'seed': args.seed,
+    })
+    print(f"\nPosterior draws saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
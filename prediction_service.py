@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP service for batch scoring of salary offers.
+
+Exposes the recruitment model to other systems without the Streamlit UI.
+Parameter sets come from the same registry as the app (parameters.json and
+parameter_sets/) and stay in memory, reloading only when a file changes.
+Each request is scored with one vectorized call, so a request carrying
+thousands of offers costs about the same as one carrying a single offer.
+
+Endpoints:
+    POST /score              score a batch of offers (JSON or Arrow IPC stream)
+    GET  /parameter-sets     available parameter sets and their versions
+    GET  /health             liveness check
+
+JSON request body:
+    {
+      "parameter_set": "default",                # optional
+      "target_probability": 0.8,                 # optional
+      "offers": {                                # columns, or a list of records
+        "salary": [385000, 420000],              # regional offer in $USD
+        "culture": [0, 10],                      # optional, default 0
+        "cost_of_living": [100, 91]              # optional, default 100
+      }
+    }
+
+Offers may carry further columns. When the parameter set was fitted with
+covariates (fit_parameters.py --culture-column etc.), each offer is shifted
+by the fitted coefficients applied to the same columns, as in batch_score.py,
+and those columns are required.
+
+Arrow requests (Content-Type: application/vnd.apache.arrow.stream) carry the
+same columns as a record batch stream, take parameter_set and
+target_probability as query parameters, and get an Arrow stream back.
+Arrow support requires the optional pyarrow package.
+
+Usage:
+    python prediction_service.py --port 8080
+"""
+
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from parameter_store import ParameterRegistry, DEFAULT_PARAMETER_FILE, PARAMETER_SETS_DIR, DEFAULT_SET_NAME
+from recruitment_core import score_offers
+from covariate_model import covariate_columns, covariate_shift, score_covariate_offers
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+OFFER_COLUMNS = ('salary', 'culture', 'cost_of_living')
+OFFER_DEFAULTS = {'culture': 0, 'cost_of_living': 100}
+OUTPUT_COLUMNS = ('probability', 'culture_adjusted_probability', 'recommended_salary')
+
+# Largest accepted request body (bytes)
+MAX_REQUEST_SIZE = 64 * 1024 * 1024
+
+# Application key of the ParameterRegistry being served
+REGISTRY = web.AppKey('registry', ParameterRegistry)
+
+
+class BadRequest(ValueError):
+    """Malformed scoring request."""
+
+
+def _offer_columns(offers):
+    """
+    Normalize JSON offers (columns or list of records) to arrays.
+
+    OFFER_COLUMNS become float arrays; any other column is kept as given,
+    since parameter sets with fitted covariates may read it (e.g. a rank).
+    """
+    if isinstance(offers, list):
+        if not all(isinstance(record, dict) for record in offers):
+            raise BadRequest("'offers' records must be JSON objects")
+        names = dict.fromkeys(name for record in offers for name in record)
+        offers = {
+            name: [record.get(name, OFFER_DEFAULTS.get(name)) for record in offers]
+            for name in names
+        }
+    if not isinstance(offers, dict) or 'salary' not in offers:
+        raise BadRequest("'offers' must contain a 'salary' column")
+
+    columns = {}
+    for name, values in offers.items():
+        if name in OFFER_COLUMNS:
+            try:
+                columns[name] = np.asarray(values, dtype=float)
+            except (TypeError, ValueError):
+                raise BadRequest(f"'{name}' must be numeric")
+        else:
+            columns[name] = np.asarray(values)
+    return columns
+
+
+def _covariate_shift(columns, covariates):
+    """Per-offer shift ($1000s) from the request columns a covariate fit uses."""
+    required = covariate_columns(covariates['features'])
+    missing = [column for column in required if column not in columns]
+    if missing:
+        raise BadRequest(f"This parameter set was fitted with covariates; offers need the "
+                         f"column(s) {', '.join(repr(column) for column in missing)}")
+    try:
+        shape = np.broadcast_shapes(*(np.shape(columns[name]) for name in ['salary'] + required))
+        frame = pd.DataFrame({column: np.broadcast_to(columns[column], shape).ravel() for column in required})
+        return covariate_shift(frame, covariates).reshape(shape)
+    except ValueError as e:
+        raise BadRequest(f"Covariate columns could not be used: {e}")
+
+
+def _score(registry, columns, parameter_set, target_probability):
+    """Score offer columns against a named parameter set."""
+    if not isinstance(parameter_set, str):
+        raise BadRequest("'parameter_set' must be a string")
+    try:
+        params = registry.get(parameter_set)
+    except KeyError:
+        raise web.HTTPNotFound(text=f"Unknown parameter set: {parameter_set}")
+    if not 0 < target_probability < 1:
+        raise BadRequest("'target_probability' must be between 0 and 1")
+    if np.isnan(columns['salary']).any():
+        raise BadRequest("Every offer needs a 'salary'; missing or null salaries cannot be scored")
+    if 'cost_of_living' in columns and not np.all(columns['cost_of_living'] > 0):
+        raise BadRequest("'cost_of_living' must be positive")
+
+    curve = params['curve_parameters']
+    covariates = params.get('covariates')
+    if covariates:
+        # Fitted coefficients replace the culture and cost of living settings
+        shift = _covariate_shift(columns, covariates)
+        return (score_covariate_offers(columns['salary'], curve['a'], curve['b'], curve['c'], shift,
+                                       target_probability),
+                registry.version(parameter_set))
+
+    try:
+        scores = score_offers(
+            columns['salary'], curve['a'], curve['b'], curve['c'],
+            culture=columns.get('culture', OFFER_DEFAULTS['culture']),
+            cost_of_living=columns.get('cost_of_living', OFFER_DEFAULTS['cost_of_living']),
+            target_probability=target_probability
+        )
+    except ValueError as e:
+        raise BadRequest(f"Offer columns could not be broadcast together: {e}")
+    return scores, registry.version(parameter_set)
+
+
+def _json_list(values):
+    """Array to a JSON-safe list (NaN becomes null)."""
+    return [None if math.isnan(v) else v for v in np.atleast_1d(values).tolist()]
+
+
+async def handle_score(request):
+    registry = request.app[REGISTRY]
+    try:
+        if request.content_type == ARROW_MEDIA_TYPE:
+            return await _score_arrow(request, registry)
+
+        try:
+            body = await request.json()
+        except ValueError:
+            raise BadRequest("Request body must be JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("Request body must be a JSON object")
+
+        parameter_set = body.get('parameter_set', DEFAULT_SET_NAME)
+        try:
+            target_probability = float(body.get('target_probability', 0.8))
+        except (TypeError, ValueError):
+            raise BadRequest("'target_probability' must be numeric")
+        columns = _offer_columns(body.get('offers'))
+        scores, version = _score(registry, columns, parameter_set, target_probability)
+    except BadRequest as e:
+        raise web.HTTPBadRequest(text=str(e))
+
+    response = {
+        'parameter_set': parameter_set,
+        'version': version,
+        'target_probability': target_probability,
+        'n_offers': int(scores['probability'].size),
+    }
+    response.update({name: _json_list(scores[name]) for name in OUTPUT_COLUMNS})
+    return web.json_response(response)
+
+
+async def _score_arrow(request, registry):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise web.HTTPUnsupportedMediaType(text="Arrow payloads require the pyarrow package")
+
+    try:
+        table = pa.ipc.open_stream(await request.read()).read_all()
+    except pa.ArrowInvalid as e:
+        raise BadRequest(f"Invalid Arrow stream: {e}")
+    columns = {
+        name: table.column(name).to_numpy().astype(float) if name in OFFER_COLUMNS
+        else table.column(name).to_numpy()
+        for name in table.column_names
+    }
+    if 'salary' not in columns:
+        raise BadRequest("Arrow payload must contain a 'salary' column")
+
+    parameter_set = request.query.get('parameter_set', DEFAULT_SET_NAME)
+    try:
+        target_probability = float(request.query.get('target_probability', 0.8))
+    except ValueError:
+        raise BadRequest("'target_probability' must be numeric")
+    scores, version = _score(registry, columns, parameter_set, target_probability)
+
+    result = pa.table({name: np.atleast_1d(scores[name]) for name in OUTPUT_COLUMNS})
+    result = result.replace_schema_metadata({'parameter_set': parameter_set, 'version': version})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, result.schema) as writer:
+        writer.write_table(result)
+    return web.Response(body=sink.getvalue().to_pybytes(), content_type=ARROW_MEDIA_TYPE)
+
+
+async def handle_parameter_sets(request):
+    registry = request.app[REGISTRY]
+    return web.json_response({
+        name: {'version': registry.version(name), 'curve_parameters': {
+            key: registry.get(name)['curve_parameters'][key] for key in ('a', 'b', 'c')
+        }}
+        for name in registry.names()
+    })
+
+
+async def handle_health(request):
+    return web.json_response({'status': 'ok'})
+
+
+def create_app(registry=None):
+    """
+    Build the aiohttp application.
+
+    Parameters:
+    registry: ParameterRegistry to serve (default: parameters.json and parameter_sets/)
+
+    Returns:
+    aiohttp web.Application
+    """
+    app = web.Application(client_max_size=MAX_REQUEST_SIZE)
+    app[REGISTRY] = registry or ParameterRegistry()
+    app.router.add_post('/score', handle_score)
+    app.router.add_get('/parameter-sets', handle_parameter_sets)
+    app.router.add_get('/health', handle_health)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recruitment model predictions over HTTP')
+    parser.add_argument('--host', default='0.0.0.0', help='Interface to bind (default: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--params', default=DEFAULT_PARAMETER_FILE,
+                        help='Default parameters file (default: parameters.json)')
+    parser.add_argument('--sets-dir', default=PARAMETER_SETS_DIR,
+                        help='Directory of named parameter sets (default: parameter_sets)')
+
+    args = parser.parse_args()
+
+    registry = ParameterRegistry(args.params, args.sets_dir)
+    web.run_app(create_app(registry), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Recruitment curve chart for the Streamlit app.
+
+Figures are built with matplotlib's object-oriented Figure API rather than
+pyplot, so they are never registered with pyplot's global figure manager
+and are freed as soon as they are rendered. Rendered PNGs are memoized by
+their input tuple in a bounded LRU cache: slider positions are discrete, so
+revisiting a combination is a cache hit and server memory stays bounded.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from recruitment_core import sigmoid_recruitment, find_salary_for_probability
+
+# National salary range shown on the chart ($1000s)
+X_MIN, X_MAX = 250, 700
+
+# Rendered charts kept in memory (each PNG is roughly 100-200 KB)
+CHART_CACHE_SIZE = 128
+
+
+def build_recruitment_figure(a, b, c, culture_score, cost_of_living, target_probability):
+    """
+    Build the recruitment curve figure for one set of app inputs.
+
+    Parameters:
+    a, b, c: curve parameters
+    culture_score: culture factor for the current curve
+    cost_of_living: regional cost of living index (100 = national average)
+    target_probability: target recruitment probability to mark on the curve
+
+    Returns:
+    matplotlib Figure
+    """
+    # Apply cost of living adjustment to the x-axis range
+    col_adjustment = cost_of_living / 100.0
+
+    # Create national-scale salaries for the model and regional-scale for the plot
+    x_national = np.linspace(X_MIN, X_MAX, 500)
+    x_regional = x_national * col_adjustment
+
+    y_baseline = sigmoid_recruitment(x_national, a, b, c, k=0)
+    y_current = sigmoid_recruitment(x_national, a, b, c, k=culture_score)
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+
+    # Plot against the regional x-axis
+    ax.plot(x_regional, y_baseline, 'r--', label='Baseline (Culture = 0)', linewidth=2, alpha=0.7)
+    ax.plot(x_regional, y_current, 'b-', label=f'Current (Culture = {culture_score})', linewidth=3)
+
+    if culture_score > 0:
+        y_negative = sigmoid_recruitment(x_national, a, b, c, k=-20)
+        ax.plot(x_regional, y_negative, 'g:', label='Poor Culture (-20)', linewidth=2, alpha=0.5)
+    elif culture_score < 0:
+        y_positive = sigmoid_recruitment(x_national, a, b, c, k=30)
+        ax.plot(x_regional, y_positive, 'g:', label='Strong Culture (+30)', linewidth=2, alpha=0.5)
+
+    # Plot target lines using regionally adjusted salaries
+    salary_current = find_salary_for_probability(target_probability, a, b, c, k=culture_score)
+    if salary_current:
+        salary_current_adjusted = salary_current * col_adjustment
+        ax.plot([salary_current_adjusted, salary_current_adjusted], [0, target_probability], 'b--', alpha=0.5)
+        ax.plot([X_MIN * col_adjustment, salary_current_adjusted], [target_probability, target_probability], 'b--', alpha=0.5)
+        ax.scatter([salary_current_adjusted], [target_probability], color='blue', s=100, zorder=5)
+
+    ax.set_xlabel('Regional Compensation ($1000s)', fontsize=12)
+    ax.set_ylabel('Probability of Recruitment', fontsize=12)
+    title = 'Anesthesiology Faculty Recruitment Model'
+    if cost_of_living != 100:
+        title += f' (Regional View @ {cost_of_living}%)'
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='lower right')
+    ax.set_xlim(X_MIN * col_adjustment, X_MAX * col_adjustment)
+    ax.set_ylim(0, 1)
+
+    # Adjust secondary axis to match regional scale
+    ax2 = ax.twiny()
+    ax2.set_xlim(ax.get_xlim())
+    base_ticks = np.array([300, 400, 500, 600])
+    regional_ticks = base_ticks * col_adjustment
+    ax2.set_xticks(regional_ticks)
+    ax2.set_xticklabels([f'${int(tick)}K' for tick in regional_ticks])
+    ax2.set_xlabel('Annual Compensation (Regional)', fontsize=12)
+
+    fig.tight_layout()
+    return fig
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def render_recruitment_chart(a, b, c, culture_score, cost_of_living, target_probability, dpi=150):
+    """
+    Render the recruitment curve chart to PNG bytes, memoized by input tuple.
+
+    Parameters:
+    a, b, c, culture_score, cost_of_living, target_probability: see build_recruitment_figure
+    dpi: output resolution
+
+    Returns:
+    PNG image as bytes
+    """
+    fig = build_recruitment_figure(a, b, c, culture_score, cost_of_living, target_probability)
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    return buffer.getvalue()
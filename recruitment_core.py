@@ -0,0 +1,161 @@
+"""
+Shared recruitment-curve model used by the app and all command-line tools.
+
+The sigmoid and its inverse broadcast over any combination of salaries,
+culture values and parameter sets, so scoring many offers against many
+parameter draws is a single NumPy call rather than a Python loop.
+"""
+
+import numpy as np
+from scipy.special import expit, logit
+
+
+def sigmoid_recruitment(x, a, b, c, k=0, out=None):
+    """
+    Calculate recruitment probability using sigmoidal dose-response curve
+
+    P = a / (1 + exp(-b * (x - (c - k))))
+
+    All arguments broadcast against each other, e.g. salaries of shape (n,),
+    culture values of shape (m, 1) and parameters of shape (p, 1, 1) give a
+    (p, m, n) result. The logistic term is evaluated with scipy's expit, so
+    extreme arguments saturate to 0 or a instead of overflowing np.exp.
+
+    Parameters:
+    x: compensation in thousands
+    a: maximum probability (asymptote)
+    b: slope (steepness)
+    c: inflection point
+    k: culture factor (shifts curve left/right)
+    out: optional preallocated float array of the broadcast shape to write into
+
+    Returns:
+    Probabilities (a float for scalar inputs, otherwise an array)
+    """
+    x, a, b, c, k = (np.asarray(v) for v in (x, a, b, c, k))
+    if out is None:
+        shape = np.broadcast_shapes(x.shape, a.shape, b.shape, c.shape, k.shape)
+        if shape == ():
+            return float(a * expit(b * (x - (c - k))))
+        out = np.empty(shape, dtype=np.result_type(x, a, b, c, k, np.float64))
+
+    np.subtract(x, c, out=out)
+    np.add(out, k, out=out)
+    np.multiply(out, b, out=out)
+    expit(out, out=out)
+    np.multiply(out, a, out=out)
+    return out
+
+
+def find_salary_for_probability(target_prob, a, b, c, k=0, out=None):
+    """
+    Find the salary needed to achieve a target recruitment probability
+
+    x = c - k + logit(target_prob / a) / b
+
+    Broadcasts like sigmoid_recruitment. Targets at or above the asymptote
+    (or at or below zero) are unattainable: scalar calls return None for
+    these, array calls fill them with NaN.
+
+    Parameters:
+    target_prob: desired recruitment probability
+    a, b, c: curve parameters
+    k: culture factor
+    out: optional preallocated float array of the broadcast shape to write into
+
+    Returns:
+    Salary in thousands (a float or None for scalar inputs, otherwise an array)
+    """
+    target_prob, a, b, c, k = (np.asarray(v) for v in (target_prob, a, b, c, k))
+    scalar = out is None and np.broadcast_shapes(
+        target_prob.shape, a.shape, b.shape, c.shape, k.shape) == ()
+    if out is None:
+        shape = np.broadcast_shapes(target_prob.shape, a.shape, b.shape, c.shape, k.shape)
+        out = np.empty(shape, dtype=np.result_type(target_prob, a, b, c, k, np.float64))
+
+    attainable = (target_prob > 0) & (target_prob < a)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(target_prob, a, out=out)
+        logit(out, out=out)
+        np.divide(out, b, out=out)
+    np.add(out, c, out=out)
+    np.subtract(out, k, out=out)
+    np.copyto(out, np.nan, where=~attainable)
+
+    if scalar:
+        value = float(out)
+        return None if np.isnan(value) else value
+    return out
+
+
+def outer_axes(*arrays):
+    """
+    Reshape 1-D inputs so they broadcast against each other on separate axes.
+
+    outer_axes(params_a, culture, salaries) returns arrays of shapes
+    (p, 1, 1), (1, m, 1) and (1, 1, n), i.e. a float-friendly np.ix_.
+    """
+    arrays = [np.asarray(arr, dtype=float).ravel() for arr in arrays]
+    ndim = len(arrays)
+    return tuple(
+        arr.reshape((1,) * i + (-1,) + (1,) * (ndim - i - 1))
+        for i, arr in enumerate(arrays)
+    )
+
+
+def score_grid(salaries, culture, parameter_sets, out=None):
+    """
+    Score every salary against every culture value and parameter set.
+
+    Parameters:
+    salaries: 1-D array of compensation in thousands (length n)
+    culture: 1-D array of culture factors (length m)
+    parameter_sets: array of shape (p, 3) holding (a, b, c) rows
+    out: optional preallocated array of shape (p, m, n); a float32 buffer or
+         np.memmap halves memory for very large grids
+
+    Returns:
+    Array of probabilities with shape (p, m, n)
+    """
+    parameter_sets = np.atleast_2d(np.asarray(parameter_sets, dtype=float))
+    a, b, c = (col.reshape(-1, 1, 1) for col in parameter_sets.T)
+    _, k, x = outer_axes(parameter_sets[:, 0], culture, salaries)
+    return sigmoid_recruitment(x, a, b, c, k, out=out)
+
+
+def score_offers(salary, a, b, c, culture=0, cost_of_living=100, target_probability=0.8):
+    """
+    Score regional salary offers with the recruitment model.
+
+    Offers are in regional dollars; the model works on the national scale,
+    so each salary is divided by its cost-of-living index / 100 before
+    scoring, and recommended salaries are scaled back to the region.
+
+    Parameters:
+    salary: regional salary offers in $USD
+    a, b, c: curve parameters
+    culture: culture factor of each offer (scalar or array)
+    cost_of_living: regional cost of living index of each offer (100 = national)
+    target_probability: probability the recommended salary should achieve
+
+    Returns:
+    Dictionary of arrays: 'probability' (culture 0), 'culture_adjusted_probability'
+    and 'recommended_salary' (regional $USD reaching the target at the offer's
+    culture and region; NaN if unattainable)
+    """
+    salary, culture, cost_of_living = np.broadcast_arrays(
+        np.asarray(salary, dtype=float), np.asarray(culture, dtype=float),
+        np.asarray(cost_of_living, dtype=float))
+    col_adjustment = cost_of_living / 100.0
+    national = salary / 1000.0 / col_adjustment
+
+    recommended = np.empty(salary.shape)
+    find_salary_for_probability(target_probability, a, b, c, culture, out=recommended)
+    recommended *= col_adjustment * 1000.0
+
+    return {
+        'probability': sigmoid_recruitment(national, a, b, c, out=np.empty(salary.shape)),
+        'culture_adjusted_probability': sigmoid_recruitment(
+            national, a, b, c, culture, out=np.empty(salary.shape)),
+        'recommended_salary': recommended,
+    }
@@ -1,9 +1,15 @@
+import os
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
-import json
-import os
+
+from parameter_sweep import DEFAULT_SWEEP_FILE, SalaryLookup, load_sweep
+from parameter_store import ParameterRegistry
+from recruitment_chart import render_recruitment_chart
+from posterior_sampler import (format_salary_limit, load_posterior, posterior_path, salary_credible_interval,
+                               sampled_curve_matches)
+from portfolio_optimizer import optimize_offers
 
 st.set_page_config(
     page_title="Anesthesiology Faculty Recruitment Model",
@@ -20,31 +26,52 @@ using a pharmacological dose-response curve approach. The model incorporates dep
 culture as a key factor that can shift the recruitment curve.
 """)
 
-# Load parameters from JSON file
-@st.cache_data
-def load_parameters():
-    param_file = "parameters.json"
-    if os.path.exists(param_file):
-        with open(param_file, 'r') as f:
-            params = json.load(f)
-        return params
-    else:
-        # Default parameters if file doesn't exist
-        return {
-            "curve_parameters": {
-                "a": 0.92,
-                "b": 0.023,
-                "c": 383
-            },
-            "culture_bounds": {
-                "min": -50,
-                "max": 50,
-                "default": 0
-            },
-            "fitted": False
-        }
-
-params = load_parameters()
+# One parameter registry per process; it reloads a set only when its file changes
+@st.cache_resource
+def get_parameter_registry():
+    return ParameterRegistry()
+
+parameter_registry = get_parameter_registry()
+parameter_set_names = parameter_registry.names()
+if len(parameter_set_names) > 1:
+    parameter_set = st.sidebar.selectbox(
+        "Parameter Set",
+        parameter_set_names,
+        help="Fitted parameter sets from parameters.json (default) and the parameter_sets/ directory"
+    )
+else:
+    parameter_set = parameter_set_names[0]
+
+params = parameter_registry.get(parameter_set)
+
+# Saved sweep from parameter_sweep.py, reloaded only when the file changes
+@st.cache_resource(max_entries=1)
+def get_sweep_table(path, modified):
+    return load_sweep(path)
+
+# Recommended-salary table for every culture / region / target slider position,
+# shared across sessions and rebuilt only when the curve parameters (or sweep file) change.
+# Curve slider positions on the saved sweep's grid are read from it; others are computed.
+@st.cache_resource(max_entries=32)
+def get_salary_lookup(a, b, c, culture_min, culture_max, sweep_modified):
+    if sweep_modified is not None:
+        lookup = get_sweep_table(DEFAULT_SWEEP_FILE, sweep_modified).salary_lookup(a, b, c)
+        if lookup is not None:
+            return lookup
+    return SalaryLookup(a, b, c, culture_scores=np.arange(culture_min, culture_max + 1, 5))
+
+sweep_modified = os.path.getmtime(DEFAULT_SWEEP_FILE) if os.path.exists(DEFAULT_SWEEP_FILE) else None
+
+# Posterior draws of the selected parameter set from posterior_sampler.py,
+# reloaded only when the file changes
+@st.cache_resource(max_entries=8)
+def get_posterior(path, modified):
+    return load_posterior(path)
+
+posterior = None
+posterior_file = posterior_path(parameter_set)
+if os.path.exists(posterior_file):
+    posterior = get_posterior(posterior_file, os.path.getmtime(posterior_file))
 
 # Initialize session state for cost of living
 if 'cost_of_living' not in st.session_state:
@@ -58,28 +85,6 @@ if 'cost_of_living' not in st.session_state:
 # else:
 #     st.info("📊 Using default model parameters")
 
-def sigmoid_recruitment(x, a, b, c, k=0):
-    """
-    Calculate recruitment probability using sigmoidal dose-response curve
-    
-    Parameters:
-    x: compensation in thousands
-    a: maximum probability (asymptote)
-    b: slope (steepness)
-    c: inflection point
-    k: culture factor (shifts curve left/right)
-    """
-    return a / (1 + np.exp(-b * (x - (c - k))))
-
-def find_salary_for_probability(target_prob, a, b, c, k=0):
-    """
-    Find the salary needed to achieve a target recruitment probability
-    """
-    if target_prob >= a:
-        return None
-    x = c - k - (1/b) * np.log(a/target_prob - 1)
-    return x
-
 st.sidebar.header("Model Parameters")
 
 # Get parameter values from loaded data
@@ -153,68 +158,32 @@ with st.sidebar.expander("🔧 Advanced Curve Parameters", expanded=False):
         help="Compensation (in $1000s) at which recruitment probability is 50% of maximum"
     )
 
+# Shifts fitted from offer covariates (fit_parameters.py --culture-column etc.)
+if params.get("covariates"):
+    with st.sidebar.expander("📐 Fitted Covariate Shifts", expanded=False):
+        st.markdown("*$1000s of compensation per unit; batch_score.py applies these per offer*")
+        for feature in params["covariates"]["features"]:
+            st.markdown(f"- **{feature['name']}**: {feature['coefficient']:+.2f} "
+                        f"(± {feature['std_error']:.2f})")
+
 col1, col2 = st.columns([2, 1])
 
 with col1:
-    # Apply cost of living adjustment to the x-axis range
-    col_adjustment = cost_of_living / 100.0
-    x_min, x_max = 250, 700
-    
-    # Create national-scale salaries for the model and regional-scale for the plot
-    x_national = np.linspace(x_min, x_max, 500)
-    x_regional = x_national * col_adjustment
-    
-    y_baseline = sigmoid_recruitment(x_national, a, b, c, k=0)
-    y_current = sigmoid_recruitment(x_national, a, b, c, k=culture_score)
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Plot against the regional x-axis
-    ax.plot(x_regional, y_baseline, 'r--', label='Baseline (Culture = 0)', linewidth=2, alpha=0.7)
-    ax.plot(x_regional, y_current, 'b-', label=f'Current (Culture = {culture_score})', linewidth=3)
-    
-    if culture_score > 0:
-        y_negative = sigmoid_recruitment(x_national, a, b, c, k=-20)
-        ax.plot(x_regional, y_negative, 'g:', label='Poor Culture (-20)', linewidth=2, alpha=0.5)
-    elif culture_score < 0:
-        y_positive = sigmoid_recruitment(x_national, a, b, c, k=30)
-        ax.plot(x_regional, y_positive, 'g:', label='Strong Culture (+30)', linewidth=2, alpha=0.5)
-    
-    salary_baseline = find_salary_for_probability(target_probability, a, b, c, k=0)
-    salary_current = find_salary_for_probability(target_probability, a, b, c, k=culture_score)
-    
     # Apply cost of living adjustment to salaries
-    salary_baseline_adjusted = salary_baseline * col_adjustment if salary_baseline else None
-    salary_current_adjusted = salary_current * col_adjustment if salary_current else None
-    
-    # Plot target lines using regionally adjusted salaries
-    if salary_current_adjusted:
-        ax.plot([salary_current_adjusted, salary_current_adjusted], [0, target_probability], 'b--', alpha=0.5)
-        ax.plot([x_min * col_adjustment, salary_current_adjusted], [target_probability, target_probability], 'b--', alpha=0.5)
-        ax.scatter([salary_current_adjusted], [target_probability], color='blue', s=100, zorder=5)
+    col_adjustment = cost_of_living / 100.0
     
-    ax.set_xlabel('Regional Compensation ($1000s)', fontsize=12)
-    ax.set_ylabel('Probability of Recruitment', fontsize=12)
-    title = 'Anesthesiology Faculty Recruitment Model'
-    if cost_of_living != 100:
-        title += f' (Regional View @ {cost_of_living}%)'
-    ax.set_title(title, fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='lower right')
-    ax.set_xlim(x_min * col_adjustment, x_max * col_adjustment)
-    ax.set_ylim(0, 1)
+    salary_lookup = get_salary_lookup(a, b, c, int(culture_bounds["min"]), int(culture_bounds["max"]),
+                                      sweep_modified)
+    salary_baseline = salary_lookup.national_salary(0, target_probability)
+    salary_current = salary_lookup.national_salary(culture_score, target_probability)
     
-    # Adjust secondary axis to match regional scale
-    ax2 = ax.twiny()
-    ax2.set_xlim(ax.get_xlim())
-    base_ticks = np.array([300, 400, 500, 600])
-    regional_ticks = base_ticks * col_adjustment
-    ax2.set_xticks(regional_ticks)
-    ax2.set_xticklabels([f'${int(tick)}K' for tick in regional_ticks])
-    ax2.set_xlabel('Annual Compensation (Regional)', fontsize=12)
+    # Cost of living adjusted salaries
+    salary_baseline_adjusted = salary_lookup.regional_salary(0, target_probability, cost_of_living)
+    salary_current_adjusted = salary_lookup.regional_salary(culture_score, target_probability, cost_of_living)
     
-    plt.tight_layout()
-    st.pyplot(fig)
+    # Rendered charts are memoized per input tuple, so revisited slider positions skip matplotlib
+    chart = render_recruitment_chart(a, b, c, culture_score, cost_of_living, target_probability)
+    st.image(chart, width="stretch")
 
 with col2:
     st.markdown("### Recruitment Analysis")
@@ -226,6 +195,17 @@ with col2:
             f"${(salary_current_adjusted - salary_baseline_adjusted):.0f}K vs baseline" if culture_score != 0 else None
         )
         
+        # The draws describe the sampled curve only, so the band is hidden once the
+        # curve sliders move more than half a step away from it
+        if posterior is not None and sampled_curve_matches(posterior[1], {'a': a, 'b': b, 'c': c}):
+            # Culture and regional adjustments are monotone, so they carry over to the interval limits
+            lower, _, upper = salary_credible_interval(posterior[0], target_probability)
+            lower_adjusted = (lower - culture_score) * col_adjustment
+            upper_adjusted = (upper - culture_score) * col_adjustment
+            st.markdown(f"**95% Credible Range:** {format_salary_limit(lower_adjusted, 'unattainable')} - "
+                        f"{format_salary_limit(upper_adjusted)}")
+            st.caption("From posterior draws of the fitted curve (posterior_sampler.py)")
+        
         if cost_of_living != 100:
             st.markdown(f"**National Equivalent:** ${salary_current:.0f}K")
             st.markdown(f"**Regional Adjustment:** {cost_of_living}% of national")
@@ -244,18 +224,70 @@ with col2:
     inflection_salary_adjusted = inflection_salary * col_adjustment
     st.markdown(f"• **50% probability at:** ${inflection_salary_adjusted:.0f}K")
     
-    eighty_percent_salary = find_salary_for_probability(0.8, a, b, c, k=culture_score)
-    if eighty_percent_salary:
-        eighty_adjusted = eighty_percent_salary * col_adjustment
+    eighty_adjusted = salary_lookup.regional_salary(culture_score, 0.8, cost_of_living)
+    if eighty_adjusted:
         st.markdown(f"• **80% probability at:** ${eighty_adjusted:.0f}K")
     
-    ninety_percent_salary = find_salary_for_probability(0.9, a, b, c, k=culture_score)
-    if ninety_percent_salary:
-        ninety_adjusted = ninety_percent_salary * col_adjustment
+    ninety_adjusted = salary_lookup.regional_salary(culture_score, 0.9, cost_of_living)
+    if ninety_adjusted:
         st.markdown(f"• **90% probability at:** ${ninety_adjusted:.0f}K")
 
 st.markdown("---")
 
+st.markdown("### Budget Allocation")
+st.markdown("Split a total compensation budget across open positions to maximize expected hires, "
+            "using the curve parameters above.")
+
+budget_col, groups_col = st.columns([1, 2])
+
+with budget_col:
+    budget = st.number_input(
+        "Total Budget ($1000s)",
+        min_value=0,
+        value=5000,
+        step=100,
+        help="Total regional compensation available for all open positions"
+    )
+
+with groups_col:
+    position_groups = st.data_editor(
+        pd.DataFrame({
+            "Positions": [4, 4, 4],
+            "Culture Score": [culture_score, 0, -10],
+            "Cost of Living": [cost_of_living, 100, 150],
+        }),
+        num_rows="dynamic",
+        hide_index=True,
+        key="position_groups"
+    ).dropna()
+
+position_groups = position_groups[position_groups["Positions"] > 0]
+if len(position_groups):
+    counts = position_groups["Positions"].to_numpy(dtype=int)
+    allocation = optimize_offers(
+        budget * 1000, a, b, c,
+        culture=np.repeat(position_groups["Culture Score"].to_numpy(dtype=float), counts),
+        cost_of_living=np.repeat(position_groups["Cost of Living"].to_numpy(dtype=float), counts)
+    )
+
+    metric_cols = st.columns(3)
+    metric_cols[0].metric("Expected Hires", f"{allocation['expected_hires']:.2f}")
+    metric_cols[1].metric("Funded Positions", f"{allocation['n_funded']} of {counts.sum()}")
+    metric_cols[2].metric("Expected Hires per Extra $100K", f"{allocation['marginal_hires'] * 100:.3f}")
+
+    # Positions in a group are identical; report the funded ones per group
+    group_index = np.repeat(np.arange(len(counts)), counts)
+    funded = allocation['salary'] > 0
+    summary = position_groups.reset_index(drop=True).copy()
+    summary["Funded"] = np.bincount(group_index, weights=funded, minlength=len(counts)).astype(int)
+    offers = np.bincount(group_index, weights=allocation['salary'], minlength=len(counts))
+    summary["Offer ($1000s)"] = np.round(offers / np.maximum(summary["Funded"], 1) / 1000)
+    summary["Expected Hires"] = np.bincount(group_index, weights=allocation['probability'],
+                                            minlength=len(counts)).round(2)
+    st.dataframe(summary, hide_index=True)
+
+st.markdown("---")
+
 st.markdown("### Understanding the Model")
 
 col3, col4 = st.columns(2)
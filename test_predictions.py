@@ -8,61 +8,40 @@ This script loads fitted parameters and evaluates model performance on test data
 import numpy as np
 import pandas as pd
 import json
+import os
 import argparse
 from sklearn.metrics import accuracy_score, roc_auc_score, confusion_matrix, classification_report
 import matplotlib.pyplot as plt
 
+from recruitment_core import sigmoid_recruitment
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, read_columns
+from covariate_model import covariate_columns, covariate_shift
+from calibration import CalibrationAccumulator, print_calibration
+from classification_metrics import error_breakdown, threshold_error_counts, threshold_sweep
 
-def sigmoid_recruitment(x, a, b, c, k=0):
-    """
-    Calculate recruitment probability using sigmoidal dose-response curve
-    
-    Parameters:
-    x: compensation in thousands
-    a: maximum probability (asymptote)
-    b: slope (steepness)
-    c: inflection point
-    k: culture factor (shifts curve left/right)
-    """
-    return a / (1 + np.exp(-b * (x - (c - k))))
+SWEEP_COLUMNS = ('threshold', 'true_positives', 'false_positives', 'false_negatives', 'true_negatives',
+                 'precision', 'recall', 'false_positive_rate', 'f1_score', 'accuracy')
 
 
-def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5, plot=False):
+def prediction_metrics(actual, probabilities, threshold=0.5):
     """
-    Test recruitment predictions on unseen data.
+    Classification metrics for predicted acceptance probabilities.
     
     Parameters:
-    test_data_path: Path to CSV file with test data
-    param_file: Path to parameters JSON file
+    actual: array of 0/1 outcomes
+    probabilities: predicted acceptance probabilities
     threshold: Probability threshold for binary classification
-    plot: Whether to show plots
     
     Returns:
-    Dictionary with test metrics
+    Dictionary with sample count, accuracy, AUC (NaN if only one outcome is
+    present), precision, recall, F1 score, confusion matrix and threshold
     """
-    # Load parameters
-    with open(param_file, 'r') as f:
-        params = json.load(f)
-    
-    if not params.get('fitted', False):
-        print("Warning: Using default parameters (not fitted from data)")
-    
-    curve_params = params['curve_parameters']
-    a, b, c = curve_params['a'], curve_params['b'], curve_params['c']
-    
-    # Load test data
-    df = pd.read_csv(test_data_path)
-    salaries = df['salary offer ($USD)'] / 1000
-    actual = df['acceptance']
-    
-    # Make predictions (assuming culture = 0 for now)
-    probabilities = sigmoid_recruitment(salaries, a, b, c, k=0)
     predictions = (probabilities >= threshold).astype(int)
     
     # Calculate metrics
     accuracy = accuracy_score(actual, predictions)
-    auc = roc_auc_score(actual, probabilities)
-    cm = confusion_matrix(actual, predictions)
+    auc = roc_auc_score(actual, probabilities) if len(np.unique(actual)) == 2 else np.nan
+    cm = confusion_matrix(actual, predictions, labels=[0, 1])
     
     # Calculate additional metrics
     tn, fp, fn, tp = cm.ravel()
@@ -70,8 +49,8 @@ def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5
     recall = tp / (tp + fn) if (tp + fn) > 0 else 0
     f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
     
-    results = {
-        'n_samples': len(df),
+    return {
+        'n_samples': len(actual),
         'accuracy': float(accuracy),
         'auc': float(auc),
         'precision': float(precision),
@@ -80,6 +59,51 @@ def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5
         'confusion_matrix': cm.tolist(),
         'threshold': threshold
     }
+
+
+def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5, plot=False, band_width=50,
+                     sweep=False, thresholds=None, criterion='f1', sweep_output=None, calibration_bins=10):
+    """
+    Test recruitment predictions on unseen data.
+    
+    Parameters:
+    test_data_path: Path to CSV file or columnar '.offers' directory with test data
+    param_file: Path to parameters JSON file
+    threshold: Probability threshold for binary classification
+    plot: Whether to show plots
+    band_width: Width of the salary bands ($1000s) in the misclassification breakdown
+    sweep: Also sweep thresholds and report the optimal one
+    thresholds: Thresholds for the sweep (default: every distinct predicted probability)
+    criterion: Metric the optimal threshold maximizes ('f1', 'accuracy' or 'youden')
+    sweep_output: Optional CSV path for the per-threshold sweep metrics
+    calibration_bins: Number of predicted-probability bins for the reliability curve
+    
+    Returns:
+    Dictionary with test metrics
+    """
+    # Load parameters
+    with open(param_file, 'r') as f:
+        params = json.load(f)
+    
+    if not params.get('fitted', False):
+        print("Warning: Using default parameters (not fitted from data)")
+    
+    curve_params = params['curve_parameters']
+    a, b, c = curve_params['a'], curve_params['b'], curve_params['c']
+    
+    # Load test data, with the covariate columns of a covariate fit
+    covariates = params.get('covariates')
+    extra_columns = covariate_columns(covariates['features']) if covariates else []
+    df = read_columns(test_data_path, [SALARY_COLUMN, ACCEPTANCE_COLUMN] + extra_columns)
+    salaries = df[SALARY_COLUMN].to_numpy() / 1000
+    actual = df[ACCEPTANCE_COLUMN].to_numpy()
+    
+    # Make predictions, shifting each offer by its fitted covariate effects (0 without covariates)
+    probabilities = sigmoid_recruitment(salaries, a, b, c, k=covariate_shift(df, covariates))
+    results = prediction_metrics(actual, probabilities, threshold)
+    accuracy, auc = results['accuracy'], results['auc']
+    precision, recall, f1 = results['precision'], results['recall'], results['f1_score']
+    (tn, fp), (fn, tp) = results['confusion_matrix']
     
     # Print results
     print(f"\nTest Results on {len(df)} samples:")
@@ -102,6 +126,11 @@ def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5
     print(f"Mean residual: {np.mean(residuals):.3f}")
     print(f"Std residual: {residual_std:.3f}")
     
+    # Does a predicted 80% mean 80% of such offers are accepted?
+    calibration = CalibrationAccumulator(calibration_bins).update(actual, probabilities)
+    print_calibration(calibration)
+    results['calibration'] = calibration.summary()
+    
     if plot:
         fig, axes = plt.subplots(2, 2, figsize=(12, 10))
         
@@ -150,7 +179,7 @@ def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5
         # 4. ROC curve
         from sklearn.metrics import roc_curve
         ax4 = axes[1, 1]
-        fpr, tpr, thresholds = roc_curve(actual, probabilities)
+        fpr, tpr, _ = roc_curve(actual, probabilities)
         ax4.plot(fpr, tpr, 'b-', linewidth=2, label=f'ROC (AUC={auc:.3f})')
         ax4.plot([0, 1], [0, 1], 'k--', alpha=0.5, label='Random')
         ax4.set_xlabel('False Positive Rate')
@@ -162,57 +191,165 @@ def test_predictions(test_data_path, param_file='parameters.json', threshold=0.5
         plt.tight_layout()
         plt.show()
     
-    # Analyze misclassifications
-    misclassified = df[predictions != actual].copy()
-    if len(misclassified) > 0:
-        misclassified['predicted_prob'] = probabilities[predictions != actual]
-        misclassified['error_type'] = misclassified.apply(
-            lambda row: 'False Positive' if row['acceptance'] == 0 else 'False Negative', 
-            axis=1
-        )
-        
+    # Analyze misclassifications: one vectorized pass over confusion cell codes
+    breakdown = error_breakdown(salaries, actual, probabilities, threshold, band_width)
+    threshold_counts = threshold_error_counts(actual, probabilities)
+    breakdown['thresholds'] = {key: values.tolist() for key, values in threshold_counts.items()}
+    results['misclassification'] = breakdown
+    
+    if breakdown['n_misclassified'] > 0:
         print(f"\nMisclassification Analysis:")
-        print(f"Total misclassified: {len(misclassified)}")
+        print(f"Total misclassified: {breakdown['n_misclassified']}")
         
-        fp_salaries = misclassified[misclassified['error_type'] == 'False Positive']['salary offer ($USD)'] / 1000
-        fn_salaries = misclassified[misclassified['error_type'] == 'False Negative']['salary offer ($USD)'] / 1000
+        avg_fp_salary = breakdown['false_positive_mean_salary']
+        avg_fn_salary = breakdown['false_negative_mean_salary']
         
-        if len(fp_salaries) > 0:
-            print(f"False Positives: {len(fp_salaries)} (mean salary: ${fp_salaries.mean():.0f}K)")
-        if len(fn_salaries) > 0:
-            print(f"False Negatives: {len(fn_salaries)} (mean salary: ${fn_salaries.mean():.0f}K)")
+        if avg_fp_salary is not None:
+            print(f"False Positives: {breakdown['false_positives']} (mean salary: ${avg_fp_salary:.0f}K)")
+        if avg_fn_salary is not None:
+            print(f"False Negatives: {breakdown['false_negatives']} (mean salary: ${avg_fn_salary:.0f}K)")
+        
+        print(f"\nErrors by Salary Band (${band_width:g}K bands):")
+        print(f"  Salary ($K)        N      FP      FN   Error")
+        for band in breakdown['salary_bands']:
+            print(f"  {band['salary_min']:>5.0f}-{band['salary_max']:<5.0f} {band['n']:>8} "
+                  f"{band['false_positives']:>7} {band['false_negatives']:>7} {band['error_rate']:>7.1%}")
+        
+        print(f"\nErrors by Threshold:")
+        print(f"  Threshold      FP      FN")
+        for t, n_fp, n_fn in zip(*threshold_counts.values()):
+            print(f"  {t:>9.2f} {n_fp:>7} {n_fn:>7}")
         
         # Suggest culture bounds based on misclassifications
-        if len(fn_salaries) > 0:
+        if avg_fn_salary is not None:
             # False negatives might indicate positive culture effects
-            avg_fn_salary = fn_salaries.mean()
             expected_prob = sigmoid_recruitment(avg_fn_salary, a, b, c)
             culture_shift_needed = (1/b) * np.log(a/0.8 - 1) - (1/b) * np.log(a/expected_prob - 1)
             print(f"\nEstimated positive culture effect for false negatives: +{culture_shift_needed:.0f} points")
         
-        if len(fp_salaries) > 0:
+        if avg_fp_salary is not None:
             # False positives might indicate negative culture effects
-            avg_fp_salary = fp_salaries.mean()
             expected_prob = sigmoid_recruitment(avg_fp_salary, a, b, c)
             culture_shift_needed = (1/b) * np.log(a/expected_prob - 1) - (1/b) * np.log(a/0.2 - 1)
             print(f"Estimated negative culture effect for false positives: -{culture_shift_needed:.0f} points")
     
+    if sweep:
+        results['threshold_sweep'] = report_threshold_sweep(
+            actual, probabilities, thresholds, criterion, sweep_output, plot)
+    
     return results
 
 
+def report_threshold_sweep(actual, probabilities, thresholds=None, criterion='f1',
+                           sweep_output=None, plot=False):
+    """
+    Print and summarize classification metrics across thresholds.
+    
+    Parameters:
+    actual: array of 0/1 outcomes
+    probabilities: predicted acceptance probabilities
+    thresholds: thresholds to evaluate (default: every distinct predicted probability)
+    criterion: metric the optimal threshold maximizes ('f1', 'accuracy' or 'youden')
+    sweep_output: optional CSV path for the per-threshold metrics
+    plot: Whether to show the precision/recall plots
+    
+    Returns:
+    Dictionary with ROC AUC, average precision, the optimal threshold and,
+    for an explicit threshold grid, the per-threshold metrics
+    """
+    sweep = threshold_sweep(actual, probabilities, thresholds, criterion)
+    curves = {key: sweep[key] for key in SWEEP_COLUMNS}
+    optimal = sweep['optimal']
+    
+    print(f"\nThreshold Sweep ({len(sweep['threshold'])} thresholds):")
+    print(f"ROC AUC: {sweep['roc_auc']:.3f}")
+    print(f"Average precision: {sweep['average_precision']:.3f}")
+    print(f"Optimal threshold ({criterion}): {optimal['threshold']:.3f}")
+    print(f"  Precision {optimal['precision']:.3f}, Recall {optimal['recall']:.3f}, "
+          f"F1 {optimal['f1_score']:.3f}, Accuracy {optimal['accuracy']:.3f}")
+    
+    summary = {
+        'criterion': criterion,
+        'n_thresholds': len(sweep['threshold']),
+        'roc_auc': sweep['roc_auc'],
+        'average_precision': sweep['average_precision'],
+        'optimal': optimal,
+    }
+    
+    if thresholds is not None:
+        print(f"\n  Threshold  Precision  Recall      F1  Accuracy")
+        for t, p, r, f, acc in zip(sweep['threshold'], sweep['precision'], sweep['recall'],
+                                    sweep['f1_score'], sweep['accuracy']):
+            print(f"  {t:>9.3f} {p:>10.3f} {r:>7.3f} {f:>7.3f} {acc:>9.3f}")
+        summary['thresholds'] = {key: values.tolist() for key, values in curves.items()}
+    
+    if sweep_output:
+        pd.DataFrame(curves).to_csv(sweep_output, index=False)
+        print(f"Per-threshold metrics saved to {sweep_output}")
+    
+    if plot:
+        finite = np.isfinite(sweep['threshold'])
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        
+        ax1.plot(sweep['threshold'][finite], sweep['precision'][finite], label='Precision')
+        ax1.plot(sweep['threshold'][finite], sweep['recall'][finite], label='Recall')
+        ax1.plot(sweep['threshold'][finite], sweep['f1_score'][finite], label='F1')
+        ax1.plot(sweep['threshold'][finite], sweep['accuracy'][finite], label='Accuracy')
+        ax1.axvline(x=optimal['threshold'], color='orange', linestyle='--',
+                    label=f"Optimal={optimal['threshold']:.2f}")
+        ax1.set_xlabel('Threshold')
+        ax1.set_ylabel('Metric')
+        ax1.set_title('Metrics by Threshold')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        
+        ax2.plot(sweep['recall'], sweep['precision'], 'b-', linewidth=2,
+                 label=f"PR (AP={sweep['average_precision']:.3f})")
+        ax2.scatter([optimal['recall']], [optimal['precision']], color='orange', s=80, zorder=5)
+        ax2.set_xlabel('Recall')
+        ax2.set_ylabel('Precision')
+        ax2.set_title('Precision-Recall Curve')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.show()
+    
+    return summary
+
+
 def main():
     parser = argparse.ArgumentParser(description='Test recruitment model predictions')
-    parser.add_argument('test_file', help='Path to CSV file with test data')
+    parser.add_argument('test_file', help='Path to CSV file or .offers directory with test data')
     parser.add_argument('--params', default='parameters.json', help='Path to parameters file')
     parser.add_argument('--threshold', type=float, default=0.5, help='Classification threshold')
     parser.add_argument('--plot', action='store_true', help='Show diagnostic plots')
+    parser.add_argument('--band-width', type=float, default=50,
+                        help='Salary band width in $1000s for the error breakdown (default: 50)')
+    parser.add_argument('--sweep', action='store_true',
+                        help='Evaluate every threshold in one sorted pass and report the optimal one')
+    parser.add_argument('--thresholds', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                        help='Threshold grid for the sweep (default: every distinct predicted probability)')
+    parser.add_argument('--criterion', choices=['f1', 'accuracy', 'youden'], default='f1',
+                        help='Metric the optimal threshold maximizes (default: f1)')
+    parser.add_argument('--sweep-output', help='Save per-threshold sweep metrics to this CSV file')
+    parser.add_argument('--calibration-bins', type=int, default=10,
+                        help='Number of reliability bins for calibration metrics (default: 10)')
     
     args = parser.parse_args()
     
-    results = test_predictions(args.test_file, args.params, args.threshold, args.plot)
+    thresholds = None
+    if args.thresholds:
+        # START to STOP inclusive, rounded so e.g. 0.3 is not 0.30000000000000004
+        start, stop, step = args.thresholds
+        thresholds = np.round(np.arange(start, stop + step / 2, step), 10)
+    sweep = args.sweep or thresholds is not None or args.sweep_output is not None
+    results = test_predictions(args.test_file, args.params, args.threshold, args.plot, args.band_width,
+                               sweep, thresholds, args.criterion, args.sweep_output,
+                               args.calibration_bins)
     
     # Save results
-    output_file = args.test_file.replace('.csv', '_test_results.json')
+    output_file = os.path.splitext(args.test_file.rstrip(os.sep))[0] + '_test_results.json'
     with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
     
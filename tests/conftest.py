@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from generate_sample_data import TRAINING_SALARY_BANDS, TRUE_PARAMETERS, generate_offers
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, read_offers
+
+
+@pytest.fixture
+def offer_arrays():
+    """Salaries ($1000s) and 0/1 acceptances drawn from the true curve."""
+    rng = np.random.default_rng(0)
+    a, b, c = TRUE_PARAMETERS
+    salaries = rng.uniform(280, 600, 4000).round()
+    acceptances = (rng.random(len(salaries)) < a / (1 + np.exp(-b * (salaries - c)))).astype(float)
+    return salaries, acceptances
+
+
+@pytest.fixture
+def offers_csv(tmp_path):
+    """Small synthetic offer history as a CSV file."""
+    path = str(tmp_path / 'offers.csv')
+    generate_offers(path, 3000, TRAINING_SALARY_BANDS, culture_std=20, noise_level=0.1, seed=1,
+                    chunk_rows=1000, n_workers=1)
+    return path
+
+
+@pytest.fixture
+def offers_frame(offers_csv):
+    df = read_offers(offers_csv)
+    return df[SALARY_COLUMN].to_numpy() / 1000, df[ACCEPTANCE_COLUMN].to_numpy(dtype=float)
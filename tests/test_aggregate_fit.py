@@ -0,0 +1,47 @@
+import numpy as np
+
+from fit_parameters import fit_curve_parameters
+from likelihood_fit import aggregate_offers, fit_maximum_likelihood, negative_log_likelihood
+
+
+def test_aggregate_offers_counts():
+    salaries = np.array([400.0, 350, 400, 500, 350, 400])
+    acceptances = np.array([1.0, 0, 0, 1, 1, 1])
+    bins, n_offers, n_accepted = aggregate_offers(salaries, acceptances)
+    np.testing.assert_array_equal(bins, [350, 400, 500])
+    np.testing.assert_array_equal(n_offers, [2, 3, 1])
+    np.testing.assert_array_equal(n_accepted, [1, 2, 1])
+
+
+def test_aggregate_offers_bin_width_uses_mean_salary():
+    bins, n_offers, n_accepted = aggregate_offers(np.array([401.0, 402, 409]), np.array([1.0, 0, 1]), 5)
+    np.testing.assert_allclose(bins, [401.5, 409])
+    np.testing.assert_array_equal(n_offers, [2, 1])
+
+
+def test_binned_likelihood_equals_row_likelihood(offer_arrays):
+    salaries, acceptances = offer_arrays
+    bins, n_offers, n_accepted = aggregate_offers(salaries, acceptances)
+    theta = np.array([0.9, 0.02, 380.0])
+    row = negative_log_likelihood(theta, salaries, acceptances, derivatives=2)
+    binned = negative_log_likelihood(theta, bins, n_accepted, n_offers, derivatives=2)
+    for row_part, binned_part in zip(row, binned):
+        np.testing.assert_allclose(row_part, binned_part, rtol=1e-10)
+
+
+def test_binned_fit_equals_row_fit(offer_arrays):
+    salaries, acceptances = offer_arrays
+    row = fit_maximum_likelihood(salaries, acceptances)
+    bins, n_offers, n_accepted = aggregate_offers(salaries, acceptances)
+    binned = fit_maximum_likelihood(bins, n_accepted, n_offers)
+    np.testing.assert_allclose(binned['params'], row['params'], rtol=1e-7)
+    np.testing.assert_allclose(binned['covariance'], row['covariance'], rtol=1e-5)
+
+
+def test_aggregate_flag_matches_row_level_fit(offers_csv):
+    row = fit_curve_parameters(offers_csv)
+    aggregated = fit_curve_parameters(offers_csv, aggregate=True)
+    for name in ('a', 'b', 'c'):
+        np.testing.assert_allclose(aggregated['curve_parameters'][name], row['curve_parameters'][name],
+                                   rtol=1e-7)
+    assert aggregated['fit_metadata']['n_samples'] == row['fit_metadata']['n_samples']
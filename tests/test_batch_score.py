@@ -0,0 +1,113 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_score import INTERVAL_COLUMNS, SCORE_COLUMNS, batch_score
+from offer_data import ACCEPTANCE_COLUMN, SALARY_COLUMN, convert_offers, load_columns
+from posterior_sampler import salary_credible_interval
+from recruitment_core import score_offers
+
+CURVE = {'a': 0.92, 'b': 0.023, 'c': 383}
+
+
+@pytest.fixture
+def params_file(tmp_path):
+    path = tmp_path / 'parameters.json'
+    path.write_text(json.dumps({'curve_parameters': CURVE}))
+    return str(path)
+
+
+@pytest.fixture
+def offers_with_columns(tmp_path):
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame({
+        SALARY_COLUMN: rng.integers(280_000, 600_000, 2500),
+        ACCEPTANCE_COLUMN: rng.integers(0, 2, 2500),
+        'culture': rng.normal(0, 20, 2500).round(1),
+        'cost_of_living': rng.integers(77, 232, 2500),
+    })
+    path = tmp_path / 'offers.csv'
+    frame.to_csv(path, index=False)
+    return str(path), frame
+
+
+def test_chunked_scores_match_one_vectorized_call(tmp_path, params_file, offers_with_columns):
+    path, frame = offers_with_columns
+    output = str(tmp_path / 'scores.csv')
+    n_rows = batch_score(path, output, params_file, culture_column='culture',
+                         cost_of_living_column='cost_of_living', chunksize=700)
+    scores = pd.read_csv(output)
+
+    expected = score_offers(frame[SALARY_COLUMN], CURVE['a'], CURVE['b'], CURVE['c'],
+                            frame['culture'], frame['cost_of_living'])
+    assert n_rows == len(frame)
+    assert list(scores.columns[:4]) == [SALARY_COLUMN, ACCEPTANCE_COLUMN, 'culture', 'cost_of_living']
+    for column in SCORE_COLUMNS:
+        np.testing.assert_allclose(scores[column], expected[column], rtol=1e-12)
+
+
+def test_columnar_input_and_output(tmp_path, params_file, offers_with_columns):
+    path, frame = offers_with_columns
+    csv_scores = str(tmp_path / 'scores.csv')
+    batch_score(path, csv_scores, params_file, culture=5, cost_of_living=91, chunksize=1000)
+
+    columnar = convert_offers(path, str(tmp_path / 'offers.offers'))
+    columnar_scores = str(tmp_path / 'scores.offers')
+    batch_score(columnar, columnar_scores, params_file, culture=5, cost_of_living=91, chunksize=1000)
+
+    from_csv = pd.read_csv(csv_scores)
+    from_columnar = load_columns(columnar_scores)
+    for column in SCORE_COLUMNS:
+        np.testing.assert_allclose(from_columnar[column], from_csv[column], rtol=1e-12)
+
+
+def test_missing_column_is_reported(tmp_path, params_file, offers_with_columns):
+    path, _ = offers_with_columns
+    with pytest.raises(ValueError, match='rank'):
+        batch_score(path, str(tmp_path / 'scores.csv'), params_file, culture_column='rank')
+
+
+def test_credible_limits_shift_with_culture_and_region(tmp_path, params_file, offers_with_columns):
+    path, frame = offers_with_columns
+    rng = np.random.default_rng(4)
+    draws = np.column_stack([rng.uniform(0.9, 0.95, 400), rng.uniform(0.02, 0.025, 400),
+                             rng.uniform(375, 390, 400)])
+    posterior = str(tmp_path / 'posterior.npz')
+    np.savez(posterior, draws=draws.astype(np.float32), metadata=json.dumps({'maximum_likelihood': CURVE}))
+
+    output = str(tmp_path / 'scores.csv')
+    batch_score(path, output, params_file, culture_column='culture',
+                cost_of_living_column='cost_of_living', posterior_path=posterior)
+    scores = pd.read_csv(output)
+
+    lower, _, upper = salary_credible_interval(draws.astype(np.float32).astype(float))
+    scale = frame['cost_of_living'] / 100 * 1000
+    np.testing.assert_allclose(scores[INTERVAL_COLUMNS[0]], (lower - frame['culture']) * scale)
+    np.testing.assert_allclose(scores[INTERVAL_COLUMNS[1]], (upper - frame['culture']) * scale)
+
+
+def test_unbounded_credible_limit_is_left_empty(tmp_path, params_file, offers_with_columns):
+    path, _ = offers_with_columns
+    draws = np.array([[0.95, 0.02, 380]] * 90 + [[0.7, 0.02, 380]] * 10, dtype=np.float32)
+    posterior = str(tmp_path / 'posterior.npz')
+    np.savez(posterior, draws=draws, metadata=json.dumps({'maximum_likelihood': CURVE}))
+
+    output = str(tmp_path / 'scores.csv')
+    batch_score(path, output, params_file, posterior_path=posterior)
+    scores = pd.read_csv(output)
+    assert np.isfinite(scores[INTERVAL_COLUMNS[0]]).all()
+    assert scores[INTERVAL_COLUMNS[1]].isna().all()
+    with open(output) as f:
+        assert 'inf' not in f.read()
+
+
+def test_posterior_from_another_curve_is_rejected(tmp_path, params_file, offers_with_columns):
+    path, _ = offers_with_columns
+    draws = np.array([[0.9, 0.03, 420]] * 100, dtype=np.float32)
+    for metadata in ({'maximum_likelihood': {'a': 0.9, 'b': 0.03, 'c': 420}}, {}):
+        posterior = str(tmp_path / 'posterior.npz')
+        np.savez(posterior, draws=draws, metadata=json.dumps(metadata))
+        with pytest.raises(ValueError, match='not sampled around the curve'):
+            batch_score(path, str(tmp_path / 'scores.csv'), params_file, posterior_path=posterior)
@@ -0,0 +1,13 @@
+from benchmarks import compare_runs
+
+
+def _run(times):
+    return {'results': [{'benchmark': name, 'n_rows': n_rows, 'wall_time': time}
+                        for (name, n_rows), time in times.items()]}
+
+
+def test_compare_runs_flags_only_slower_cases():
+    previous = _run({('fit', 100): 1.0, ('fit', 1000): 2.0, ('sweep', None): 0.5})
+    current = _run({('fit', 100): 1.1, ('fit', 1000): 2.5, ('sweep', None): 0.4, ('sigmoid', 100): 9.0})
+    assert compare_runs(current, previous) == [('fit', 1000, 2.0, 2.5)]
+    assert compare_runs(current, previous, ratio=1.05) == [('fit', 100, 1.0, 1.1), ('fit', 1000, 2.0, 2.5)]
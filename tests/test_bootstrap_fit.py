@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from bootstrap_fit import bootstrap_parameters, summarize_bootstrap
+from likelihood_fit import aggregate_offers, default_start, fit_maximum_likelihood
+
+
+@pytest.fixture
+def fitted_bins(offer_arrays):
+    bins, n_offers, n_accepted = aggregate_offers(*offer_arrays)
+    fit = fit_maximum_likelihood(bins, n_accepted, n_offers)
+    _, bounds = default_start(bins, n_offers)
+    return bins, n_accepted, n_offers, fit['params'], bounds
+
+
+def test_draws_do_not_depend_on_worker_count(fitted_bins):
+    bins, n_accepted, n_offers, p0, bounds = fitted_bins
+    serial = bootstrap_parameters(bins, n_accepted, n_offers, 300, p0, bounds, seed=3, n_workers=1)
+    parallel = bootstrap_parameters(bins, n_accepted, n_offers, 300, p0, bounds, seed=3, n_workers=2)
+    assert serial.shape == (300, 3)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_intervals_cover_the_estimate(fitted_bins):
+    bins, n_accepted, n_offers, p0, bounds = fitted_bins
+    draws = bootstrap_parameters(bins, n_accepted, n_offers, 300, p0, bounds, seed=0, n_workers=1)
+    summary = summarize_bootstrap(draws, 0.8, seed=0)
+
+    assert summary['n_replicates'] == 300
+    assert summary['n_converged'] > 290
+    for i, name in enumerate(['a', 'b', 'c']):
+        low, high = summary['intervals'][name]
+        assert low < p0[i] < high
+    low, high = summary['recommended_salary']['interval']
+    assert low < summary['recommended_salary']['median'] < high
+
+
+def test_summary_skips_failed_replicates():
+    draws = np.array([[0.9, 0.02, 380], [np.nan, np.nan, np.nan], [0.92, 0.021, 385]])
+    summary = summarize_bootstrap(draws)
+    assert summary['n_converged'] == 2
+
+
+def test_summary_without_converged_replicates_raises():
+    with pytest.raises(ValueError, match='converged'):
+        summarize_bootstrap(np.full((5, 3), np.nan))
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from calibration import CalibrationAccumulator, stream_calibration
+from offer_data import ACCEPTANCE_COLUMN, SALARY_COLUMN, read_offers
+from recruitment_core import sigmoid_recruitment
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(6)
+    probabilities = rng.random(5000)
+    actual = (rng.random(5000) < probabilities ** 1.3).astype(float)
+    return actual, probabilities
+
+
+def test_metrics_match_direct_computation(predictions):
+    actual, probabilities = predictions
+    accumulator = CalibrationAccumulator(10).update(actual, probabilities)
+    assert accumulator.brier_score() == pytest.approx(np.mean((actual - probabilities) ** 2))
+
+    bins = np.minimum((probabilities * 10).astype(int), 9)
+    gaps = np.array([abs(probabilities[bins == i].mean() - actual[bins == i].mean()) for i in range(10)])
+    counts = np.bincount(bins, minlength=10)
+    assert accumulator.expected_calibration_error() == pytest.approx(np.sum(gaps * counts) / len(actual))
+    assert accumulator.max_calibration_error() == pytest.approx(gaps.max())
+
+
+def test_chunked_and_merged_updates_match_one_update(predictions):
+    actual, probabilities = predictions
+    whole = CalibrationAccumulator().update(actual, probabilities)
+    chunked = CalibrationAccumulator()
+    for part in np.array_split(np.arange(len(actual)), 7):
+        chunked.update(actual[part], probabilities[part])
+    merged = CalibrationAccumulator().update(actual[:1000], probabilities[:1000]).merge(
+        CalibrationAccumulator().update(actual[1000:], probabilities[1000:]))
+    for other in (chunked, merged):
+        assert other.brier_score() == pytest.approx(whole.brier_score())
+        assert other.expected_calibration_error() == pytest.approx(whole.expected_calibration_error())
+        np.testing.assert_array_equal(other.n_offers, whole.n_offers)
+        np.testing.assert_allclose(other.n_accepted, whole.n_accepted)
+        np.testing.assert_allclose(other.sum_predicted, whole.sum_predicted)
+
+
+def test_counts_match_individual_offers(predictions):
+    actual, probabilities = predictions
+    probabilities = probabilities.round(2)
+    values, index = np.unique(probabilities, return_inverse=True)
+    n_offers = np.bincount(index)
+    n_accepted = np.bincount(index, weights=actual)
+
+    rows = CalibrationAccumulator().update(actual, probabilities)
+    counts = CalibrationAccumulator().update(n_accepted, values, n_offers)
+    assert counts.brier_score() == pytest.approx(rows.brier_score())
+    assert counts.expected_calibration_error() == pytest.approx(rows.expected_calibration_error())
+
+
+def test_merge_rejects_different_bins():
+    with pytest.raises(ValueError):
+        CalibrationAccumulator(10).merge(CalibrationAccumulator(5))
+
+
+def test_empty_accumulator_reports_nan():
+    accumulator = CalibrationAccumulator()
+    assert np.isnan(accumulator.brier_score())
+    assert np.isnan(accumulator.expected_calibration_error())
+
+
+def test_stream_calibration_matches_in_memory(offers_csv):
+    offers = read_offers(offers_csv)
+    probabilities = sigmoid_recruitment(offers[SALARY_COLUMN].to_numpy() / 1000, 0.92, 0.023, 383)
+    expected = CalibrationAccumulator().update(offers[ACCEPTANCE_COLUMN].to_numpy(), probabilities)
+    streamed = stream_calibration(offers_csv, 0.92, 0.023, 383, chunksize=700)
+    assert streamed.total == len(offers)
+    assert streamed.brier_score() == pytest.approx(expected.brier_score())
+    np.testing.assert_allclose(streamed.n_accepted, expected.n_accepted)
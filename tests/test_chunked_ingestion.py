@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from fit_parameters import fit_curve_parameters
+from likelihood_fit import aggregate_offers
+from offer_data import SALARY_COLUMN, ACCEPTANCE_COLUMN, read_offer_bins, read_offers
+
+
+def test_chunk_count_does_not_change_the_bins(offers_csv):
+    whole = read_offer_bins(offers_csv, chunksize=10 ** 6)
+    chunked = read_offer_bins(offers_csv, chunksize=7)
+    for whole_part, chunked_part in zip(whole, chunked):
+        np.testing.assert_allclose(chunked_part, whole_part)
+
+
+@pytest.mark.parametrize('bin_width', [0, 5000])
+def test_streamed_bins_match_in_memory_aggregation(offers_csv, bin_width):
+    df = read_offers(offers_csv)
+    expected = aggregate_offers(df[SALARY_COLUMN].to_numpy() / 1000,
+                                df[ACCEPTANCE_COLUMN].to_numpy(dtype=float), bin_width / 1000)
+    streamed = read_offer_bins(offers_csv, bin_width, chunksize=500)
+    for expected_part, streamed_part in zip(expected, streamed):
+        np.testing.assert_allclose(streamed_part, expected_part)
+
+
+def test_chunked_fit_matches_row_level_fit(offers_csv):
+    row = fit_curve_parameters(offers_csv)
+    chunked = fit_curve_parameters(offers_csv, chunksize=250)
+    for name in ('a', 'b', 'c'):
+        np.testing.assert_allclose(chunked['curve_parameters'][name], row['curve_parameters'][name],
+                                   rtol=1e-7)
+    assert chunked['fit_metadata']['n_samples'] == row['fit_metadata']['n_samples']
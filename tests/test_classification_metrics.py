@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+import pytest
+
+from classification_metrics import (confusion_codes, error_breakdown, threshold_error_counts, threshold_sweep,
+                                    FALSE_NEGATIVE, FALSE_POSITIVE, TRUE_NEGATIVE, TRUE_POSITIVE)
+from test_predictions import report_threshold_sweep
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(5)
+    salaries = rng.uniform(280, 600, 3000).round()
+    probabilities = 0.92 / (1 + np.exp(-0.023 * (salaries - 383)))
+    actual = (rng.random(len(salaries)) < probabilities).astype(int)
+    return salaries, actual, probabilities
+
+
+def test_confusion_codes():
+    codes = confusion_codes([0, 0, 1, 1], [0.2, 0.5, 0.49, 0.9])
+    np.testing.assert_array_equal(codes, [TRUE_NEGATIVE, FALSE_POSITIVE, FALSE_NEGATIVE, TRUE_POSITIVE])
+
+
+def test_error_breakdown_matches_row_loop(predictions):
+    salaries, actual, probabilities = predictions
+    summary = error_breakdown(salaries, actual, probabilities, threshold=0.6, band_width=50)
+
+    predicted = probabilities >= 0.6
+    false_positive = predicted & (actual == 0)
+    false_negative = ~predicted & (actual == 1)
+    assert summary['false_positives'] == false_positive.sum()
+    assert summary['false_negatives'] == false_negative.sum()
+    assert summary['n_misclassified'] == false_positive.sum() + false_negative.sum()
+    assert summary['false_positive_mean_salary'] == pytest.approx(salaries[false_positive].mean())
+    assert summary['false_negative_mean_salary'] == pytest.approx(salaries[false_negative].mean())
+
+    for band in summary['salary_bands']:
+        inside = (salaries >= band['salary_min']) & (salaries < band['salary_max'])
+        errors = (false_positive | false_negative)[inside]
+        assert band['n'] == inside.sum()
+        assert band['false_positives'] == false_positive[inside].sum()
+        assert band['true_positives'] == (predicted & (actual == 1))[inside].sum()
+        assert band['error_rate'] == pytest.approx(errors.mean())
+    assert sum(band['n'] for band in summary['salary_bands']) == len(salaries)
+
+
+def test_error_breakdown_without_errors_has_no_mean_salary():
+    summary = error_breakdown([300, 500], [0, 1], [0.1, 0.9])
+    assert summary['n_misclassified'] == 0
+    assert summary['false_positive_mean_salary'] is None
+    assert summary['false_negative_mean_salary'] is None
+
+
+def test_threshold_error_counts_match_direct_counts(predictions):
+    _, actual, probabilities = predictions
+    thresholds = np.concatenate([[0.0, 1.0], np.unique(probabilities)[::150]])
+    counts = threshold_error_counts(actual, probabilities, thresholds)
+    for threshold, fp, fn in zip(thresholds, counts['false_positives'], counts['false_negatives']):
+        predicted = probabilities >= threshold
+        assert fp == (predicted & (actual == 0)).sum()
+        assert fn == (~predicted & (actual == 1)).sum()
+
+
+@pytest.mark.parametrize('round_to', [None, 2])
+def test_threshold_sweep_auc_and_average_precision_match_sklearn(predictions, round_to):
+    metrics = pytest.importorskip('sklearn.metrics')
+    _, actual, probabilities = predictions
+    if round_to is not None:
+        probabilities = probabilities.round(round_to)  # many ties
+    sweep = threshold_sweep(actual, probabilities)
+    assert sweep['roc_auc'] == pytest.approx(metrics.roc_auc_score(actual, probabilities))
+    assert sweep['average_precision'] == pytest.approx(
+        metrics.average_precision_score(actual, probabilities))
+
+
+def test_threshold_sweep_matches_direct_confusion_matrix(predictions):
+    _, actual, probabilities = predictions
+    thresholds = [0.2, 0.5, 0.75]
+    sweep = threshold_sweep(actual, probabilities, thresholds)
+    for i, threshold in enumerate(thresholds):
+        predicted = probabilities >= threshold
+        assert sweep['true_positives'][i] == (predicted & (actual == 1)).sum()
+        assert sweep['false_positives'][i] == (predicted & (actual == 0)).sum()
+        assert sweep['true_negatives'][i] == (~predicted & (actual == 0)).sum()
+        assert sweep['accuracy'][i] == pytest.approx((predicted == actual).mean())
+
+
+def test_threshold_sweep_default_thresholds_and_optimum(predictions):
+    _, actual, probabilities = predictions
+    sweep = threshold_sweep(actual, probabilities, criterion='accuracy')
+    assert sweep['threshold'][-1] == np.inf and sweep['true_positives'][-1] == 0
+    assert sweep['true_positives'][0] == actual.sum()
+    assert sweep['optimal']['accuracy'] == sweep['accuracy'].max()
+    with pytest.raises(ValueError):
+        threshold_sweep(actual, probabilities, criterion='precision')
+
+
+def test_optimum_is_never_the_predict_nothing_threshold():
+    # Few acceptances and uninformative probabilities: predicting nothing has
+    # the best accuracy, but it is not a usable threshold
+    rng = np.random.default_rng(7)
+    actual = (rng.random(500) < 0.05).astype(int)
+    probabilities = rng.uniform(0.3, 0.7, 500)
+    sweep = threshold_sweep(actual, probabilities, criterion='accuracy')
+    assert sweep['accuracy'][-1] == sweep['accuracy'].max()
+    assert np.isfinite(sweep['optimal']['threshold'])
+    assert sweep['optimal']['accuracy'] == sweep['accuracy'][:-1].max()
+
+    summary = report_threshold_sweep(actual, probabilities, criterion='accuracy')
+    json.dumps(summary, allow_nan=False)
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fit_parameters import fit_curve_parameters
+from offer_data import (SALARY_COLUMN, ACCEPTANCE_COLUMN, available_columns, convert_offers, load_columns,
+                        read_columns, read_offers, write_columns, write_part)
+
+
+def test_convert_round_trips_offers(offers_csv, tmp_path):
+    path = convert_offers(offers_csv, str(tmp_path / 'converted.offers'), chunksize=700)
+    expected = read_offers(offers_csv)
+    loaded = read_offers(path)
+    for column in (SALARY_COLUMN, ACCEPTANCE_COLUMN):
+        np.testing.assert_array_equal(loaded[column], expected[column])
+    assert isinstance(load_columns(path)[SALARY_COLUMN], np.memmap)
+
+
+def test_columnar_fit_matches_csv_fit(offers_csv, tmp_path):
+    path = convert_offers(offers_csv, str(tmp_path / 'converted.offers'))
+    csv_fit = fit_curve_parameters(offers_csv)
+    columnar_fit = fit_curve_parameters(path)
+    for name in ('a', 'b', 'c'):
+        assert columnar_fit['curve_parameters'][name] == pytest.approx(csv_fit['curve_parameters'][name])
+
+
+def test_extra_columns_and_chunked_reads(tmp_path):
+    frame = pd.DataFrame({SALARY_COLUMN: np.arange(10, dtype=np.int32) * 1000,
+                          ACCEPTANCE_COLUMN: np.arange(10) % 2, 'culture': np.linspace(-5, 5, 10)})
+    path = str(tmp_path / 'extra.offers')
+    assert write_columns(frame, path) == 10
+    assert set(available_columns(path)) == set(frame.columns)
+
+    chunks = list(read_columns(path, ['culture'], chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_allclose(pd.concat(chunks)['culture'], frame['culture'])
+
+
+def test_compressed_parts_read_back_in_order(tmp_path):
+    path = str(tmp_path / 'parts.offers')
+    os.makedirs(path)
+    for index in range(3):
+        write_part(path, index, {SALARY_COLUMN: np.full(5, index, dtype=np.int32),
+                                 ACCEPTANCE_COLUMN: np.ones(5, dtype=np.uint8)})
+    offers = read_offers(path)
+    np.testing.assert_array_equal(offers[SALARY_COLUMN], np.repeat([0, 1, 2], 5))
+    assert sum(len(chunk) for chunk in read_offers(path, chunksize=2)) == 15
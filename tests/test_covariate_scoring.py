@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from calibration import CalibrationAccumulator, stream_calibration
+from covariate_model import covariate_shift, score_covariate_offers
+from offer_data import ACCEPTANCE_COLUMN, SALARY_COLUMN
+from parameter_store import ParameterRegistry
+from prediction_service import create_app
+from recruitment_core import sigmoid_recruitment
+
+CURVE = {'a': 0.92, 'b': 0.023, 'c': 383}
+COVARIATES = {'features': [
+    {'name': 'culture', 'column': 'culture', 'center': 0.0, 'coefficient': 0.8, 'std_error': 0.1},
+    {'name': 'rank=Full', 'column': 'rank', 'level': 'Full', 'coefficient': -25.0, 'std_error': 2.0},
+]}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = tmp_path / 'parameters.json'
+    path.write_text(json.dumps({'curve_parameters': CURVE, 'covariates': COVARIATES}))
+    return ParameterRegistry(str(path), str(tmp_path / 'parameter_sets'))
+
+
+def _post(registry, body):
+    async def run():
+        async with TestClient(TestServer(create_app(registry))) as client:
+            response = await client.post('/score', json=body)
+            return response.status, await response.json() if response.status == 200 else None
+    return asyncio.run(run())
+
+
+def test_service_applies_fitted_covariates(registry):
+    offers = {'salary': [385000, 420000, 450000], 'culture': [0, 10, -5], 'rank': ['Full', 'Assistant', 'Full']}
+    status, body = _post(registry, {'offers': offers})
+    assert status == 200
+
+    shift = covariate_shift(pd.DataFrame(offers), COVARIATES)
+    np.testing.assert_allclose(shift, [-25, 8, -29])
+    expected = score_covariate_offers(offers['salary'], CURVE['a'], CURVE['b'], CURVE['c'], shift)
+    for name in ('probability', 'culture_adjusted_probability', 'recommended_salary'):
+        np.testing.assert_allclose(body[name], expected[name])
+
+
+def test_service_accepts_covariate_records(registry):
+    records = [{'salary': 385000, 'culture': 0, 'rank': 'Full'}, {'salary': 420000, 'culture': 10, 'rank': 'Assistant'}]
+    columns = {'salary': [385000, 420000], 'culture': [0, 10], 'rank': ['Full', 'Assistant']}
+    assert _post(registry, {'offers': records}) == _post(registry, {'offers': columns})
+
+
+def test_service_requires_covariate_columns(registry):
+    status, _ = _post(registry, {'offers': {'salary': [385000], 'culture': [0]}})
+    assert status == 400
+
+
+def test_calibration_applies_fitted_covariates(tmp_path):
+    rng = np.random.default_rng(9)
+    frame = pd.DataFrame({
+        SALARY_COLUMN: rng.integers(280_000, 600_000, 3000),
+        ACCEPTANCE_COLUMN: rng.integers(0, 2, 3000),
+        'culture': rng.normal(0, 20, 3000).round(1),
+        'rank': rng.choice(['Full', 'Assistant'], 3000),
+    })
+    path = str(tmp_path / 'offers.csv')
+    frame.to_csv(path, index=False)
+
+    probabilities = sigmoid_recruitment(frame[SALARY_COLUMN].to_numpy() / 1000, CURVE['a'], CURVE['b'],
+                                        CURVE['c'], covariate_shift(frame, COVARIATES))
+    expected = CalibrationAccumulator().update(frame[ACCEPTANCE_COLUMN], probabilities)
+    streamed = stream_calibration(path, CURVE['a'], CURVE['b'], CURVE['c'], chunksize=700,
+                                  covariates=COVARIATES)
+    assert streamed.brier_score() == pytest.approx(expected.brier_score())
+    np.testing.assert_allclose(streamed.sum_predicted, expected.sum_predicted)
+
+    baseline = stream_calibration(path, CURVE['a'], CURVE['b'], CURVE['c'])
+    assert baseline.brier_score() != pytest.approx(streamed.brier_score())
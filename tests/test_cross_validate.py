@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cross_validate import cross_validate, fold_indices
+
+
+def test_kfold_holds_out_every_offer_once():
+    held_out = np.concatenate([fold_indices(103, 5, fold, 'kfold', seed=2)[1] for fold in range(5)])
+    np.testing.assert_array_equal(np.sort(held_out), np.arange(103))
+    train, test = fold_indices(103, 5, 3, 'kfold', seed=2)
+    assert not np.intersect1d(train, test).size
+    assert len(train) + len(test) == 103
+
+
+def test_rolling_folds_train_on_earlier_offers():
+    order = np.random.default_rng(0).permutation(50)
+    for fold in range(4):
+        train, test = fold_indices(50, 4, fold, 'rolling', order=order)
+        position = np.argsort(order)  # time rank of each row
+        assert position[train].max() < position[test].min()
+        assert len(train) == sum(len(block) for block in np.array_split(order, 5)[:fold + 1])
+
+
+def test_unknown_scheme_raises():
+    with pytest.raises(ValueError):
+        fold_indices(10, 2, 0, 'bootstrap')
+
+
+@pytest.mark.parametrize('scheme', ['kfold', 'rolling'])
+def test_results_do_not_depend_on_worker_count(offers_csv, scheme):
+    serial = cross_validate(offers_csv, n_folds=3, scheme=scheme, n_workers=1)
+    parallel = cross_validate(offers_csv, n_folds=3, scheme=scheme, n_workers=2)
+    assert serial['folds'] == parallel['folds']
+    assert serial['pooled_calibration'] == parallel['pooled_calibration']
+
+
+def test_pooled_calibration_covers_held_out_offers(offers_csv):
+    results = cross_validate(offers_csv, n_folds=4, n_workers=1)
+    n_test = sum(fold['n_test'] for fold in results['folds'])
+    assert n_test == 3000
+    assert results['pooled_calibration']['n_offers'] == n_test
+    auc = [fold['auc'] for fold in results['folds']]
+    assert results['summary']['auc']['mean'] == pytest.approx(np.mean(auc))
+
+
+def test_rewritten_file_is_loaded_again(offers_csv):
+    first = cross_validate(offers_csv, n_folds=3, n_workers=1)
+    df = pd.read_csv(offers_csv)
+    df.iloc[:2000].to_csv(offers_csv, index=False)
+    second = cross_validate(offers_csv, n_folds=3, n_workers=1)
+    assert sum(fold['n_test'] for fold in first['folds']) == 3000
+    assert sum(fold['n_test'] for fold in second['folds']) == 2000
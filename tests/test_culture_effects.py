@@ -0,0 +1,42 @@
+import numpy as np
+
+from fit_parameters import estimate_culture_effects
+from likelihood_fit import aggregate_offers
+from recruitment_core import find_salary_for_probability, sigmoid_recruitment
+
+A, B, C = 0.92, 0.023, 383
+
+
+def _loop_effects(salaries, acceptances, a, b, c):
+    """Per-offer reference implementation."""
+    effects = []
+    for salary, accepted in zip(salaries, acceptances):
+        probability = sigmoid_recruitment(salary, a, b, c)
+        if accepted and probability < 0.5:
+            effects.append(find_salary_for_probability(0.8, a, b, c) - salary)
+        elif not accepted and probability > 0.5:
+            effects.append(find_salary_for_probability(0.2, a, b, c) - salary)
+    return np.sort(effects)
+
+
+def test_matches_per_offer_loop(offer_arrays):
+    salaries, acceptances = offer_arrays
+    effects, weights = estimate_culture_effects(salaries, acceptances, A, B, C)
+    np.testing.assert_array_equal(weights, 1)
+    np.testing.assert_allclose(np.sort(effects), _loop_effects(salaries, acceptances, A, B, C))
+
+
+def test_binned_offers_give_the_same_weighted_effects(offer_arrays):
+    salaries, acceptances = offer_arrays
+    row_effects, _ = estimate_culture_effects(salaries, acceptances, A, B, C)
+    bins, n_offers, n_accepted = aggregate_offers(salaries, acceptances)
+    effects, weights = estimate_culture_effects(bins, n_accepted, A, B, C, n_offers=n_offers)
+    np.testing.assert_allclose(np.sort(np.repeat(effects, weights.astype(int))), np.sort(row_effects))
+
+
+def test_unreachable_target_is_skipped():
+    salaries = np.array([300.0, 500])
+    effects, weights = estimate_culture_effects(salaries, np.array([1.0, 0]), 0.7, B, C)
+    # a = 0.7 cannot reach 80%, so only the rejected high-probability offer counts
+    np.testing.assert_allclose(effects, [find_salary_for_probability(0.2, 0.7, B, C) - 500])
+    assert len(weights) == 1
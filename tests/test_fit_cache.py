@@ -0,0 +1,75 @@
+import json
+import os
+
+import fit_parameters
+from fit_cache import FitCache, data_fingerprint
+from fit_parameters import fit_curve_parameters
+from offer_data import read_offers
+
+
+def _no_fit(*args, **kwargs):
+    raise AssertionError("the cached fit should have been used")
+
+
+def test_cache_hit_returns_the_stored_fit(tmp_path, offers_csv, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    first = fit_curve_parameters(offers_csv, aggregate=True, cache_dir=cache_dir)
+    assert first['fit_metadata']['warm_start'] is None
+
+    monkeypatch.setattr(fit_parameters, 'fit_offer_arrays', _no_fit)
+    second = fit_curve_parameters(offers_csv, aggregate=True, cache_dir=cache_dir)
+    assert second == json.loads(json.dumps(first))
+
+
+def test_changed_options_or_data_miss_and_warm_start(tmp_path, offers_csv):
+    cache_dir = str(tmp_path / 'cache')
+    first = fit_curve_parameters(offers_csv, cache_dir=cache_dir)
+    binned = fit_curve_parameters(offers_csv, bin_width=5000, cache_dir=cache_dir)
+    assert binned['fit_metadata']['warm_start'] is not None
+
+    changed = str(tmp_path / 'changed.csv')
+    read_offers(offers_csv).iloc[:2500].to_csv(changed, index=False)
+    refit = fit_curve_parameters(changed, cache_dir=cache_dir)
+    curve = first['curve_parameters']
+    assert refit['fit_metadata']['warm_start'] is not None
+    assert refit['curve_parameters']['c'] != curve['c']
+
+
+def test_key_follows_file_content(tmp_path, offers_csv):
+    cache = FitCache(str(tmp_path / 'cache'))
+    copy = str(tmp_path / 'copy.csv')
+    with open(offers_csv, 'rb') as src, open(copy, 'wb') as dst:
+        dst.write(src.read())
+    columns = ['salary offer ($USD)', 'acceptance']
+    key = cache.key(offers_csv, columns, {})
+    assert cache.key(copy, columns, {}) == key
+    assert cache.key(offers_csv, columns, {'bin_width': 5}) != key
+
+    with open(copy, 'a') as f:
+        f.write('400000,1\n')
+    assert cache.key(copy, columns, {}) != key
+
+
+def test_nearest_fit_uses_the_closest_fingerprint(tmp_path):
+    cache = FitCache(str(tmp_path / 'cache'))
+    assert cache.nearest([4.0, 0.5, 0.5]) is None
+    for key, c, fingerprint in (('low', 350, [3.5, 0.5, 0.4]), ('high', 450, [4.5, 0.5, 0.6])):
+        cache.put(key, fingerprint, {'curve_parameters': {'a': 0.9, 'b': 0.02, 'c': c}})
+    assert cache.nearest(data_fingerprint([430, 450, 470], [1, 0, 1])) == [0.9, 0.02, 450]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cache = FitCache(cache_dir, max_bytes=10 ** 9)
+    results = {'curve_parameters': {'a': 0.9, 'b': 0.02, 'c': 380}}
+    for i, key in enumerate(('old', 'used', 'new')):
+        cache.put(key, [0, 0, 0], results)
+        os.utime(os.path.join(cache_dir, key + '.json'), ns=(i * 10 ** 9, i * 10 ** 9))
+    assert cache.get('used') == results  # now the most recently used
+
+    entry_size = os.path.getsize(os.path.join(cache_dir, 'old.json'))
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+    assert cache.get('old') is None
+    assert cache.get('new') == results
+    assert cache.get('used') == results
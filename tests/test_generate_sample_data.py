@@ -0,0 +1,63 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from generate_sample_data import TRAINING_SALARY_BANDS, _ordered_results, generate_offers
+from offer_data import read_offers
+
+
+def _generate(path, n_workers, compress=False):
+    summary = generate_offers(str(path), 2500, TRAINING_SALARY_BANDS, culture_std=20, noise_level=0.1,
+                              seed=7, chunk_rows=300, n_workers=n_workers, compress=compress)
+    return summary, read_offers(str(path))
+
+
+@pytest.mark.parametrize('name, compress', [('offers.csv', False), ('offers.offers', False),
+                                            ('offers.offers', True)])
+def test_output_does_not_depend_on_worker_count(tmp_path, name, compress):
+    serial_summary, serial = _generate(tmp_path / f'1-{name}', 1, compress)
+    parallel_summary, parallel = _generate(tmp_path / f'3-{name}', 3, compress)
+    assert len(serial) == 2500
+    for column in serial:
+        np.testing.assert_array_equal(serial[column], parallel[column])
+    assert serial_summary['accepted'] == parallel_summary['accepted']
+    np.testing.assert_array_equal(serial_summary['band_offers'], parallel_summary['band_offers'])
+
+
+def test_summary_matches_written_offers(tmp_path):
+    summary, offers = _generate(tmp_path / 'offers.csv', 1)
+    assert summary['n'] == len(offers)
+    assert summary['accepted'] == offers.iloc[:, 1].sum()
+
+
+class _RecordingPool:
+    """Runs tasks on submit and records how many results are not yet collected."""
+
+    def __init__(self):
+        self.outstanding = self.most_outstanding = 0
+
+    def submit(self, fn, task):
+        pool = self
+        pool.outstanding += 1
+        pool.most_outstanding = max(pool.most_outstanding, pool.outstanding)
+
+        class _Future(Future):
+            def result(self, timeout=None):
+                pool.outstanding -= 1
+                return super().result(timeout)
+
+        future = _Future()
+        future.set_result(fn(task))
+        return future
+
+
+def test_ordered_results_bound_chunks_in_flight(tmp_path):
+    tasks = [(str(tmp_path / 'offers.csv'), 'csv', i, i * 10, 10, seed, TRAINING_SALARY_BANDS, 20, 0.1)
+             for i, seed in enumerate(np.random.SeedSequence(0).spawn(20))]
+    pool = _RecordingPool()
+    results = []
+    for summary, _ in _ordered_results(pool, tasks, window=4):
+        results.append(summary['n'])
+    assert results == [10] * 20
+    assert pool.most_outstanding == 4
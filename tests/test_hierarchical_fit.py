@@ -0,0 +1,124 @@
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fit_parameters
+from fit_parameters import fit_group_parameters
+from hierarchical_fit import (PARAMETER_NAMES, estimate_pooling_scale, fit_grouped, group_offer_bins,
+                              parameter_set_name, parameter_set_names)
+from likelihood_fit import aggregate_offers, fit_maximum_likelihood
+from offer_data import ACCEPTANCE_COLUMN, SALARY_COLUMN
+
+
+@pytest.fixture
+def grouped_offers():
+    rng = np.random.default_rng(8)
+    curves = {'north': (0.9, 0.025, 370), 'south': (0.95, 0.02, 400), 'tiny': (0.9, 0.03, 390)}
+    sizes = {'north': 3000, 'south': 3000, 'tiny': 40}
+    groups, salaries, acceptances = [], [], []
+    for name, (a, b, c) in curves.items():
+        x = rng.uniform(280, 600, sizes[name]).round()
+        groups += [name] * len(x)
+        salaries.append(x)
+        acceptances.append(rng.random(len(x)) < a / (1 + np.exp(-b * (x - c))))
+    return np.array(groups), np.concatenate(salaries), np.concatenate(acceptances).astype(float)
+
+
+def test_group_bins_match_per_group_aggregation(grouped_offers):
+    groups, salaries, acceptances = grouped_offers
+    names, x, n, y = group_offer_bins(groups, salaries, acceptances, bin_width=5)
+    assert list(names) == ['north', 'south', 'tiny']
+    for i, name in enumerate(names):
+        bins = aggregate_offers(salaries[groups == name], acceptances[groups == name], 5)
+        k = len(bins[0])
+        np.testing.assert_allclose(x[i, :k], bins[0])
+        np.testing.assert_array_equal(n[i, :k], bins[1])
+        np.testing.assert_array_equal(y[i, :k], bins[2])
+        assert not n[i, k:].any()
+
+
+def test_infinite_scale_reproduces_unpooled_fits(grouped_offers):
+    groups, salaries, acceptances = grouped_offers
+    fit = fit_grouped(groups, salaries, acceptances, pooling_scale=[np.inf] * 3)
+    np.testing.assert_allclose(fit['params'], fit['unpooled_params'], rtol=1e-6)
+    north = groups == 'north'
+    single = fit_maximum_likelihood(salaries[north], acceptances[north], p0=fit['shared_params'])
+    np.testing.assert_allclose(fit['params'][0], single['params'], rtol=1e-4)
+
+
+def test_small_groups_are_pulled_towards_the_shared_curve(grouped_offers):
+    groups, salaries, acceptances = grouped_offers
+    fit = fit_grouped(groups, salaries, acceptances)
+    assert fit['converged'].all()
+    shift = np.abs(fit['params'] - fit['unpooled_params']) / np.abs(fit['unpooled_params'] - fit['shared_params'])
+    # The 40-offer group moves much further towards the shared curve than the large ones
+    assert shift[2, 2] > 3 * max(shift[0, 2], shift[1, 2])
+    np.testing.assert_array_equal(fit['n_offers'], [3000, 3000, 40])
+
+
+def test_pooling_scale_needs_two_groups():
+    scale = estimate_pooling_scale(np.ones((1, 3)), np.eye(3)[None])
+    assert np.isinf(scale).all()
+
+
+def test_parameter_set_name_is_file_safe():
+    assert parameter_set_name('Sales / EMEA') == 'Sales_EMEA'
+    assert parameter_set_name('default') == 'default_group'
+    assert parameter_set_name('...') == 'group'
+
+
+def test_parameter_set_names_resolve_collisions():
+    names = parameter_set_names(['A B', 'A/B', 'A_B', 'a_b', 'A_B_2', 'other'])
+    assert names == ['A_B', 'A_B_2', 'A_B_3', 'a_b_4', 'A_B_2_2', 'other']
+    assert len({name.lower() for name in names}) == len(names)
+
+
+def test_group_files_are_not_overwritten_on_collision(tmp_path, grouped_offers):
+    groups, salaries, acceptances = grouped_offers
+    labels = np.array(['Sales EMEA', 'Sales/EMEA', 'tiny'])[np.unique(groups, return_inverse=True)[1]]
+    path = tmp_path / 'offers.csv'
+    pd.DataFrame({SALARY_COLUMN: (salaries * 1000).astype(int), ACCEPTANCE_COLUMN: acceptances.astype(int),
+                  'team': labels}).to_csv(path, index=False)
+
+    shared = {'curve_parameters': {'a': 0.92, 'b': 0.023, 'c': 383, 'description': ''},
+              'culture_bounds': {}}
+    saved = fit_group_parameters(str(path), 'team', shared, output_dir=str(tmp_path / 'sets'))
+    assert sorted(saved.values()) == sorted(
+        str(tmp_path / 'sets' / f'{name}.json') for name in ('Sales_EMEA', 'Sales_EMEA_2', 'tiny'))
+
+
+@pytest.mark.parametrize('bin_width', [0, 5000])
+def test_streamed_group_fit_matches_in_memory_fit(tmp_path, grouped_offers, bin_width):
+    groups, salaries, acceptances = grouped_offers
+    path = tmp_path / 'offers.csv'
+    frame = pd.DataFrame({SALARY_COLUMN: (salaries * 1000).astype(int),
+                          ACCEPTANCE_COLUMN: acceptances.astype(int), 'team': groups})
+    frame.loc[::97, 'team'] = None
+    frame.to_csv(path, index=False)
+
+    shared = {'curve_parameters': {'a': 0.92, 'b': 0.023, 'c': 383, 'description': ''},
+              'culture_bounds': {}}
+    fits = {}
+    for chunksize in (None, 700):
+        output_dir = tmp_path / f'sets_{chunksize}'
+        saved = fit_group_parameters(str(path), 'team', shared, bin_width=bin_width,
+                                     output_dir=str(output_dir), chunksize=chunksize)
+        fits[chunksize] = {group: json.loads(open(file).read()) for group, file in saved.items()}
+
+    assert list(fits[700]) == list(fits[None]) == ['north', 'south', 'tiny']
+    for group, results in fits[None].items():
+        streamed = fits[700][group]
+        assert streamed['fit_metadata']['n_samples'] == results['fit_metadata']['n_samples']
+        for name in PARAMETER_NAMES:
+            assert streamed['curve_parameters'][name] == pytest.approx(results['curve_parameters'][name],
+                                                                       rel=1e-6)
+
+
+def test_group_column_with_covariates_is_rejected(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, 'argv', ['fit_parameters.py', str(tmp_path / 'offers.csv'),
+                                      '--group-column', 'team', '--culture-column', 'culture'])
+    with pytest.raises(SystemExit):
+        fit_parameters.main()
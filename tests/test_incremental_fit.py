@@ -0,0 +1,85 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from incremental_fit import update_parameters
+from offer_data import (ACCEPTANCE_COLUMN, SALARY_COLUMN, OFFER_DTYPES, accumulate_offer_bins, merge_offer_bins,
+                        offers_end, read_offers, read_offers_after, write_part)
+
+
+def _append_csv(frame, path, first):
+    frame.to_csv(path, index=False, header=first, mode='w' if first else 'a')
+
+
+@pytest.mark.parametrize('bin_width', [0, 1000])
+def test_incremental_fit_equals_full_refit(tmp_path, offers_csv, bin_width):
+    offers = read_offers(offers_csv)
+    history = str(tmp_path / 'history.csv')
+    params = str(tmp_path / 'parameters.json')
+
+    for i, batch in enumerate(np.array_split(np.arange(len(offers)), [1800, 2500])):
+        _append_csv(offers.iloc[batch], history, first=i == 0)
+        incremental = update_parameters(history, params, bin_width=bin_width, chunksize=400)
+        assert incremental['fit_metadata']['incremental']['new_offers'] == len(batch)
+        assert incremental['fit_metadata']['incremental']['warm_start'] == (i > 0)
+
+    full = update_parameters(history, str(tmp_path / 'full.json'), bin_width=bin_width)
+    for name in ('a', 'b', 'c'):
+        assert incremental['curve_parameters'][name] == pytest.approx(full['curve_parameters'][name], rel=1e-6)
+    assert incremental['fit_metadata']['n_samples'] == len(offers)
+    with open(params) as f:
+        assert json.load(f)['curve_parameters']['c'] == incremental['curve_parameters']['c']
+
+
+def test_no_new_offers_leaves_parameters_alone(tmp_path, offers_csv):
+    params = str(tmp_path / 'parameters.json')
+    assert update_parameters(offers_csv, params) is not None
+    assert update_parameters(offers_csv, params) is None
+
+
+def test_rewritten_history_is_rejected(tmp_path, offers_csv):
+    offers = read_offers(offers_csv)
+    history = str(tmp_path / 'history.csv')
+    params = str(tmp_path / 'parameters.json')
+    _append_csv(offers, history, first=True)
+    update_parameters(history, params)
+    _append_csv(offers.iloc[:100], history, first=True)
+    with pytest.raises(ValueError, match='rewritten'):
+        update_parameters(history, params)
+    assert update_parameters(history, params, rebuild=True)['fit_metadata']['n_samples'] == 100
+
+
+def test_bin_width_is_fixed_by_the_first_run(tmp_path, offers_csv):
+    params = str(tmp_path / 'parameters.json')
+    update_parameters(offers_csv, params, bin_width=1000)
+    with pytest.raises(ValueError, match='bin width'):
+        update_parameters(offers_csv, params, bin_width=500)
+
+
+def test_merged_bins_match_one_pass(offers_csv):
+    chunks = list(read_offers(offers_csv, chunksize=500))
+    keys, totals = merge_offer_bins(chunks[:2], 1000)
+    keys, totals = merge_offer_bins(chunks[2:], 1000, keys, totals)
+    salaries, n_offers, n_accepted = accumulate_offer_bins(chunks, 1000)
+    np.testing.assert_allclose(totals[0], n_offers)
+    np.testing.assert_allclose(totals[1], n_accepted)
+    np.testing.assert_allclose(totals[2] / totals[0] / 1000, salaries)
+
+
+def test_appended_parts_are_read_from_the_first_new_part(tmp_path):
+    path = str(tmp_path / 'history.offers')
+    os.makedirs(path)
+    rng = np.random.default_rng(10)
+    parts = [{SALARY_COLUMN: rng.integers(280_000, 600_000, 50).astype(OFFER_DTYPES[SALARY_COLUMN]),
+              ACCEPTANCE_COLUMN: rng.integers(0, 2, 50).astype(OFFER_DTYPES[ACCEPTANCE_COLUMN])}
+             for _ in range(3)]
+    for i, part in enumerate(parts[:2]):
+        write_part(path, i, part)
+    position = offers_end(path)
+    write_part(path, 2, parts[2])
+
+    new = list(read_offers_after(path, position, offers_end(path)))
+    assert len(new) == 1
+    np.testing.assert_array_equal(new[0][SALARY_COLUMN], parts[2][SALARY_COLUMN])
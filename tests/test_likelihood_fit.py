@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from likelihood_fit import fit_batched, fit_maximum_likelihood, negative_log_likelihood
+
+
+def _finite_difference_derivatives(theta, *args, step=(1e-6, 1e-8, 1e-4)):
+    gradient = np.empty(3)
+    hessian = np.empty((3, 3))
+    for i in range(3):
+        offset = np.zeros(3)
+        offset[i] = step[i]
+        plus = negative_log_likelihood(theta + offset, *args, derivatives=1)
+        minus = negative_log_likelihood(theta - offset, *args, derivatives=1)
+        gradient[i] = (plus[0] - minus[0]) / (2 * step[i])
+        hessian[:, i] = (plus[1] - minus[1]) / (2 * step[i])
+    return gradient, hessian
+
+
+@pytest.mark.parametrize('binned', [False, True])
+def test_gradient_and_hessian_match_finite_differences(offer_arrays, binned):
+    salaries, acceptances = offer_arrays
+    args = (salaries, acceptances)
+    if binned:
+        args = (salaries[:50], acceptances[:50] * 3, np.full(50, 4.0))
+    theta = np.array([0.88, 0.021, 390.0])
+
+    _, gradient, hessian = negative_log_likelihood(theta, *args, derivatives=2)
+    numeric_gradient, numeric_hessian = _finite_difference_derivatives(theta, *args)
+
+    np.testing.assert_allclose(gradient, numeric_gradient, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(hessian, numeric_hessian, rtol=1e-4, atol=1e-3)
+    np.testing.assert_allclose(hessian, hessian.T)
+
+
+def test_fit_recovers_true_parameters(offer_arrays):
+    salaries, acceptances = offer_arrays
+    fit = fit_maximum_likelihood(salaries, acceptances)
+
+    assert fit['converged']
+    errors = np.sqrt(np.diag(fit['covariance']))
+    assert np.all(np.abs(fit['params'] - [0.92, 0.023, 383]) < 4 * errors)
+    assert np.all(np.linalg.eigvalsh(fit['covariance']) > 0)
+
+
+def test_fit_is_a_stationary_point(offer_arrays):
+    salaries, acceptances = offer_arrays
+    fit = fit_maximum_likelihood(salaries, acceptances)
+    _, gradient = negative_log_likelihood(fit['params'], salaries, acceptances, derivatives=1)
+    # Interior optimum: the gradient vanishes relative to the parameter scales
+    assert np.all(np.abs(gradient * np.sqrt(np.diag(fit['covariance']))) < 1e-4)
+
+
+def test_fit_respects_bounds():
+    salaries = np.linspace(200, 700, 200)
+    acceptances = (salaries > 400).astype(float)
+    fit = fit_maximum_likelihood(salaries, acceptances, bounds=([0.5, 0.001, 200], [1.0, 0.05, 700]))
+    assert fit['params'][0] <= 1.0
+    assert fit['params'][1] <= 0.05
+
+
+def test_batched_fit_matches_individual_fits(offer_arrays):
+    salaries, acceptances = offer_arrays
+    halves = np.stack([acceptances[:2000], acceptances[2000:]])
+    x = np.stack([salaries[:2000], salaries[2000:]])
+    p0, bounds = np.array([0.9, 0.02, 400]), ([0.5, 0.001, 280], [1.0, 0.1, 600])
+
+    batched = fit_batched(x, halves, None, p0, bounds)
+    for g in range(2):
+        single = fit_maximum_likelihood(x[g], halves[g], p0=p0, bounds=bounds)
+        np.testing.assert_allclose(batched['params'][g], single['params'], rtol=1e-6)
+        np.testing.assert_allclose(batched['log_likelihood'][g], single['log_likelihood'])
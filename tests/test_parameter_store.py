@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from parameter_store import DEFAULT_PARAMETERS, ParameterRegistry
+
+
+def _write(path, a):
+    with open(path, 'w') as f:
+        json.dump({'curve_parameters': {'a': a, 'b': 0.02, 'c': 380}}, f)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    sets_dir = tmp_path / 'parameter_sets'
+    sets_dir.mkdir()
+    _write(tmp_path / 'parameters.json', 0.9)
+    _write(sets_dir / 'cardiac.json', 0.95)
+    (sets_dir / 'notes.txt').write_text('ignored')
+    return ParameterRegistry(str(tmp_path / 'parameters.json'), str(sets_dir))
+
+
+def test_names_list_default_first(registry):
+    assert registry.names() == ['default', 'cardiac']
+    assert registry.get('cardiac')['curve_parameters']['a'] == 0.95
+
+
+def test_unknown_set_raises(registry):
+    with pytest.raises(KeyError):
+        registry.get('missing')
+
+
+def test_missing_default_file_uses_builtin_parameters(tmp_path):
+    registry = ParameterRegistry(str(tmp_path / 'absent.json'), str(tmp_path / 'absent_dir'))
+    assert registry.get() is DEFAULT_PARAMETERS
+    assert registry.version() == 'builtin'
+
+
+def test_unchanged_file_is_not_reparsed(registry):
+    first = registry.get()
+    os.utime(registry.default_file, ns=(1, 1))  # touched, same content
+    assert registry.get() is first
+
+
+def test_changed_file_is_reloaded(registry):
+    version = registry.version()
+    _write(registry.default_file, 0.97)
+    stat = os.stat(registry.default_file)
+    os.utime(registry.default_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert registry.get()['curve_parameters']['a'] == 0.97
+    assert registry.version() != version
+
+
+def test_builtin_parameters_match_the_app_slider_types():
+    curve = DEFAULT_PARAMETERS['curve_parameters']
+    assert all(isinstance(curve[name], float) for name in ('a', 'b', 'c'))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from parameter_sweep import SalaryLookup, load_sweep, run_sweep, save_sweep, sweep_recommended_salaries
+from recruitment_core import find_salary_for_probability
+
+RANGES = {'a': (0.9, 0.92, 0.01), 'b': (0.02, 0.023, 0.001), 'c': (375.0, 385.0, 5.0)}
+
+
+@pytest.fixture
+def saved_sweep(tmp_path):
+    path = str(tmp_path / 'sweep.npz')
+    save_sweep(path, run_sweep(RANGES, salaries=np.arange(300, 501, 50)))
+    return load_sweep(path)
+
+
+def test_grid_matches_inverse_sigmoid():
+    grid = sweep_recommended_salaries([0.9, 0.95], [0.02], [380], [-10, 0, 10], [0.5, 0.8, 0.9],
+                                      dtype=np.float64)
+    assert grid.shape == (2, 1, 1, 3, 3)
+    assert grid[0, 0, 0, 2, 1] == pytest.approx(find_salary_for_probability(0.8, 0.9, 0.02, 380, 10))
+    assert np.isnan(grid[0, 0, 0, :, 2]).all()  # 90% is unattainable with a = 0.9
+
+
+def test_table_lookup_uses_nearest_grid_point(saved_sweep):
+    salary = saved_sweep.lookup(a=0.921, b=0.0229, c=383.5, culture_score=10, target_probability=0.8,
+                                cost_of_living=91)
+    expected = find_salary_for_probability(0.8, 0.92, 0.023, 385, 10) * 0.91
+    assert salary == pytest.approx(expected, rel=1e-5)
+    assert saved_sweep.probability.shape == (3, 4, 3, 21, 5)
+
+
+def test_salary_lookup_from_sweep_matches_computed_table(saved_sweep):
+    from_sweep = saved_sweep.salary_lookup(0.91, 0.022, 380)
+    computed = SalaryLookup(0.91, 0.022, 380)
+    for culture, target, cost_of_living in [(0, 0.8, 100), (-25, 0.6, 150), (50, 0.5, 77), (10, 0.95, 91)]:
+        expected = computed.regional_salary(culture, target, cost_of_living)
+        actual = from_sweep.regional_salary(culture, target, cost_of_living)
+        if expected is None:
+            assert actual is None
+        else:
+            assert actual == pytest.approx(expected, rel=1e-5)
+
+
+def test_salary_lookup_off_grid_is_none(saved_sweep):
+    assert saved_sweep.salary_lookup(0.913, 0.022, 380) is None
+    assert saved_sweep.salary_lookup(0.91, 0.022, 377.5) is None
+
+
+def test_salary_lookup_falls_back_off_grid():
+    lookup = SalaryLookup(0.92, 0.023, 383)
+    assert lookup.national_salary(7, 0.83) == pytest.approx(find_salary_for_probability(0.83, 0.92, 0.023, 383, 7))
+    assert lookup.regional_salary(0, 0.95, 100) is None
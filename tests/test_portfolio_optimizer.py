@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from portfolio_optimizer import optimize_offers
+from recruitment_core import sigmoid_recruitment
+
+CURVE = {'a': 0.95, 'b': 0.03, 'c': 383.0}
+
+
+def expected_hires(salary_K, culture, cost_of_living):
+    """Expected hires of salaries ($1000s) with a leading grid axis."""
+    return sigmoid_recruitment(salary_K / (cost_of_living / 100), CURVE['a'], CURVE['b'],
+                               CURVE['c'] - culture).sum(axis=-1)
+
+
+def brute_force(budget_K, culture, cost_of_living, steps=241):
+    """Best expected hires over a grid of ways to spend the whole budget on up to 3 positions."""
+    grid = np.linspace(0, budget_K, steps)
+    splits = np.stack(np.meshgrid(*[grid] * (len(culture) - 1), indexing='ij'), axis=-1)
+    splits = splits.reshape(-1, len(culture) - 1)
+    splits = np.column_stack([splits, budget_K - splits.sum(axis=1)])
+    splits = splits[splits[:, -1] >= 0]
+    return expected_hires(splits, culture, cost_of_living).max()
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_brute_force_on_small_portfolios(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(15):
+        n = rng.integers(2, 4)
+        culture = rng.uniform(-40, 40, n)
+        cost_of_living = rng.uniform(70, 180, n)
+        budget_K = rng.uniform(50, 700 * n)
+        result = optimize_offers(budget_K * 1000, CURVE['a'], CURVE['b'], CURVE['c'], culture, cost_of_living)
+        assert result['expected_hires'] >= brute_force(budget_K, culture, cost_of_living) - 1e-6
+
+
+def test_position_below_its_inflection_point():
+    # The best plan puts the first position a little below its inflection
+    # point, which no fully concave split can afford
+    culture = np.array([9.97, 6.56, -34.27])
+    cost_of_living = np.array([138.38, 152.74, 85.60])
+    result = optimize_offers(912_861, CURVE['a'], CURVE['b'], CURVE['c'], culture, cost_of_living)
+    inflection = (CURVE['c'] - culture) * cost_of_living / 100
+    assert result['expected_hires'] >= brute_force(912.861, culture, cost_of_living, steps=801) - 1e-6
+    assert result['n_funded'] == 2
+    assert 0 < result['salary'][0] / 1000 < inflection[0]
+
+
+def test_small_budget_funds_the_best_single_position():
+    culture = np.array([0, 30, -20])
+    cost_of_living = np.array([100, 130, 90])
+    budget = 300_000
+    result = optimize_offers(budget, CURVE['a'], CURVE['b'], CURVE['c'], culture, cost_of_living)
+
+    # The budget is below every regional inflection salary
+    assert budget / 1000 < ((CURVE['c'] - culture) * cost_of_living / 100).min()
+    gains = [expected_hires(np.eye(3)[i] * budget / 1000, culture, cost_of_living) for i in range(3)]
+    assert result['n_funded'] == 1
+    assert result['salary'][np.argmax(gains)] == pytest.approx(budget)
+    assert result['expected_hires'] == pytest.approx(max(gains))
+
+
+@pytest.mark.parametrize('budget', [2e6, 2e7, 1.5e8])
+def test_never_spends_more_than_the_budget(budget):
+    rng = np.random.default_rng(5)
+    culture = rng.uniform(-30, 30, 400)
+    cost_of_living = rng.integers(77, 232, 400)
+    result = optimize_offers(budget, CURVE['a'], CURVE['b'], CURVE['c'], culture, cost_of_living)
+    assert result['salary'].sum() <= budget * (1 + 1e-12)
+    assert result['spent'] == pytest.approx(budget, rel=1e-9)
+    assert result['expected_hires'] == pytest.approx(expected_hires(
+        result['salary'] / 1000, culture, cost_of_living))
+
+
+def test_identical_positions_share_the_budget_evenly():
+    n_positions, budget = 40, 20_000_000
+    result = optimize_offers(budget, CURVE['a'], CURVE['b'], CURVE['c'], 0, 91, n_positions=n_positions)
+
+    # With every position alike, the best plan funds k equal offers
+    k = np.arange(1, n_positions + 1)
+    plans = k * sigmoid_recruitment(budget / 1000 / k / 0.91, CURVE['a'], CURVE['b'], CURVE['c'])
+    plans += (n_positions - k) * sigmoid_recruitment(0, CURVE['a'], CURVE['b'], CURVE['c'])
+    funded = result['salary'][result['salary'] > 0]
+    assert result['n_funded'] == k[np.argmax(plans)]
+    assert np.allclose(funded, funded[0])
+    assert result['expected_hires'] == pytest.approx(plans.max())
+
+
+def test_nothing_to_spend():
+    result = optimize_offers(0, CURVE['a'], CURVE['b'], CURVE['c'], n_positions=3)
+    assert result['n_funded'] == 0
+    assert result['spent'] == 0
+    assert np.all(result['salary'] == 0)
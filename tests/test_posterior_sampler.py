@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+import posterior_sampler
+from likelihood_fit import aggregate_offers
+from posterior_sampler import (DEFAULT_POSTERIOR_FILE, format_salary_limit, load_posterior, posterior_path,
+                               salary_credible_interval, sample_posterior, sampled_curve_matches,
+                               save_posterior, split_rhat)
+from recruitment_core import find_salary_for_probability
+
+TOLERANCE = {'a': 0.005, 'b': 0.0005, 'c': 2.5}
+
+
+@pytest.fixture(scope='module')
+def posterior():
+    rng = np.random.default_rng(11)
+    salaries = rng.uniform(280, 600, 3000).round()
+    accepted = (rng.random(3000) < 0.92 / (1 + np.exp(-0.023 * (salaries - 383)))).astype(float)
+    x, n, y = aggregate_offers(salaries, accepted)
+    return sample_posterior(x, y, n, n_chains=8, n_draws=300, n_warmup=300, seed=3, n_workers=1)
+
+
+def test_draws_concentrate_around_the_maximum_likelihood_curve(posterior):
+    assert posterior['draws'].shape == (8, 300, 3)
+    assert (posterior['rhat'] < 1.1).all()
+    median = np.median(posterior['draws'].reshape(-1, 3), axis=0)
+    np.testing.assert_allclose(median, posterior['maximum_likelihood'], rtol=0.05)
+    assert ((posterior['draws'][..., 0] > 0) & (posterior['draws'][..., 0] < 1)).all()
+
+
+def test_saved_metadata_records_the_sampled_curve(tmp_path, posterior):
+    path = str(tmp_path / 'draws.npz')
+    save_posterior(path, posterior, {'parameter_set': 'cardiac'})
+    draws, metadata = load_posterior(path)
+    np.testing.assert_allclose(draws, posterior['draws'].reshape(-1, 3), rtol=1e-6)
+    assert metadata['parameter_set'] == 'cardiac'
+
+    sampled = metadata['maximum_likelihood']
+    assert sampled_curve_matches(metadata, sampled, TOLERANCE)
+    assert sampled_curve_matches(metadata, {**sampled, 'c': sampled['c'] + 2}, TOLERANCE)
+    assert not sampled_curve_matches(metadata, {**sampled, 'c': sampled['c'] + 5}, TOLERANCE)
+    assert not sampled_curve_matches({}, sampled, TOLERANCE)
+
+
+def test_split_rhat_flags_disagreeing_chains():
+    rng = np.random.default_rng(0)
+    mixed = rng.normal(size=(4, 500, 3))
+    stuck = mixed + np.arange(4)[:, None, None]
+    assert (split_rhat(mixed) < 1.02).all()
+    assert (split_rhat(stuck) > 1.5).all()
+
+
+def test_credible_interval_counts_unattainable_draws_as_infinite():
+    draws = np.array([[0.95, 0.02, 380]] * 90 + [[0.7, 0.02, 380]] * 10, dtype=float)
+    reachable = find_salary_for_probability(0.8, 0.95, 0.02, 380)
+    lower, median, upper = salary_credible_interval(draws, 0.8)
+    assert lower == pytest.approx(reachable) and median == pytest.approx(reachable)
+    assert upper == np.inf
+    assert format_salary_limit(upper) == 'no upper limit'
+    assert format_salary_limit(412.4) == '$412K'
+
+
+def test_posterior_files_are_keyed_by_parameter_set():
+    assert posterior_path() == DEFAULT_POSTERIOR_FILE
+    assert posterior_path('cardiac', 'sets') == os.path.join('sets', 'cardiac.posterior.npz')
+
+
+def test_main_writes_the_named_set_and_prints_no_infinite_limit(tmp_path, offers_csv, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['posterior_sampler.py', offers_csv, '--parameter-set', 'cardiac',
+                                      '--chains', '8', '--draws', '50', '--warmup', '100',
+                                      '--workers', '1', '--target-probability', '0.95'])
+    posterior_sampler.main()
+    output = capsys.readouterr().out
+    assert 'inf' not in output
+    assert 'no upper limit' in output
+    _, metadata = load_posterior(os.path.join('parameter_sets', 'cardiac.posterior.npz'))
+    assert metadata['parameter_set'] == 'cardiac'
+    assert set(metadata['maximum_likelihood']) == {'a', 'b', 'c'}
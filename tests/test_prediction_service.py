@@ -0,0 +1,91 @@
+import asyncio
+import io
+
+import numpy as np
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from parameter_store import ParameterRegistry
+from prediction_service import ARROW_MEDIA_TYPE, create_app
+from recruitment_core import score_offers
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ParameterRegistry(str(tmp_path / 'parameters.json'), str(tmp_path / 'parameter_sets'))
+
+
+def _request(registry, method, path, **kwargs):
+    """Send one request to a fresh app and return (status, body)."""
+    async def run():
+        async with TestClient(TestServer(create_app(registry))) as client:
+            response = await client.request(method, path, **kwargs)
+            if response.content_type == 'application/json':
+                return response.status, await response.json()
+            return response.status, await response.read()
+    return asyncio.run(run())
+
+
+def test_score_matches_score_offers(registry):
+    offers = {'salary': [385000, 420000], 'culture': [0, 10], 'cost_of_living': [100, 91]}
+    status, body = _request(registry, 'POST', '/score', json={'offers': offers})
+    assert status == 200
+    assert body['parameter_set'] == 'default'
+    assert body['n_offers'] == 2
+
+    curve = registry.get()['curve_parameters']
+    expected = score_offers(offers['salary'], curve['a'], curve['b'], curve['c'],
+                            offers['culture'], offers['cost_of_living'])
+    for name in ('probability', 'culture_adjusted_probability', 'recommended_salary'):
+        np.testing.assert_allclose(body[name], expected[name])
+
+
+def test_records_and_columns_give_the_same_scores(registry):
+    records = [{'salary': 385000, 'culture': 5}, {'salary': 420000}]
+    columns = {'salary': [385000, 420000], 'culture': [5, 0]}
+    _, from_records = _request(registry, 'POST', '/score', json={'offers': records})
+    _, from_columns = _request(registry, 'POST', '/score', json={'offers': columns})
+    assert from_records == from_columns
+
+
+@pytest.mark.parametrize('body', [
+    {'offers': {'culture': [0]}},
+    {'offers': {'salary': ['high']}},
+    {'offers': {'salary': [400000]}, 'target_probability': 1.5},
+    {'offers': {'salary': [400000, 410000], 'culture': [0, 1, 2]}},
+    {'offers': {'salary': [400000, 410000], 'cost_of_living': [100, 0]}},
+    {'offers': {'salary': [400000], 'cost_of_living': [-91]}},
+    {'offers': [{'salary': 400000}, {'culture': 10}]},
+    {'offers': {'salary': [400000, None]}},
+    {'parameter_set': ['default'], 'offers': {'salary': [400000]}},
+])
+def test_invalid_requests_are_rejected(registry, body):
+    status, _ = _request(registry, 'POST', '/score', json=body)
+    assert status == 400
+
+
+def test_unknown_parameter_set_is_not_found(registry):
+    status, _ = _request(registry, 'POST', '/score',
+                         json={'parameter_set': 'missing', 'offers': {'salary': [400000]}})
+    assert status == 404
+
+
+def test_arrow_round_trip(registry):
+    pa = pytest.importorskip('pyarrow')
+    table = pa.table({'salary': [385000.0, 420000.0], 'cost_of_living': [100.0, 91.0]})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    status, payload = _request(registry, 'POST', '/score', data=sink.getvalue().to_pybytes(),
+                               headers={'Content-Type': ARROW_MEDIA_TYPE})
+    assert status == 200
+    result = pa.ipc.open_stream(io.BytesIO(payload)).read_all()
+    _, body = _request(registry, 'POST', '/score', json={'offers': table.to_pydict()})
+    np.testing.assert_allclose(result.column('probability').to_numpy(), body['probability'])
+
+
+def test_parameter_sets_listing(registry):
+    status, body = _request(registry, 'GET', '/parameter-sets')
+    assert status == 200
+    assert body['default']['version'] == 'builtin'
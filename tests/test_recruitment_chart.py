@@ -0,0 +1,35 @@
+import pytest
+
+from recruitment_chart import CHART_CACHE_SIZE, build_recruitment_figure, render_recruitment_chart
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    render_recruitment_chart.cache_clear()
+    yield
+    render_recruitment_chart.cache_clear()
+
+
+def test_figure_marks_the_target_salary():
+    fig = build_recruitment_figure(0.92, 0.023, 383, 10, 91, 0.8)
+    ax = fig.axes[0]
+    assert len(ax.collections) == 1  # target point
+    x, y = ax.collections[0].get_offsets()[0]
+    assert y == pytest.approx(0.8)
+    assert ax.get_xlim() == pytest.approx((250 * 0.91, 700 * 0.91))
+
+
+def test_unattainable_target_has_no_marker():
+    fig = build_recruitment_figure(0.92, 0.023, 383, 0, 100, 0.95)
+    assert len(fig.axes[0].collections) == 0
+
+
+def test_rendered_charts_are_memoized():
+    first = render_recruitment_chart(0.92, 0.023, 383, 10, 91, 0.8)
+    assert first.startswith(PNG_SIGNATURE)
+    assert render_recruitment_chart(0.92, 0.023, 383, 10, 91, 0.8) is first
+    render_recruitment_chart(0.92, 0.023, 383, 15, 91, 0.8)
+    info = render_recruitment_chart.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (1, 2, CHART_CACHE_SIZE)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from recruitment_core import find_salary_for_probability, score_grid, sigmoid_recruitment
+
+
+def test_sigmoid_matches_formula():
+    x = np.linspace(250, 650, 41)
+    expected = 0.9 / (1 + np.exp(-0.02 * (x - (380 - 10))))
+    np.testing.assert_allclose(sigmoid_recruitment(x, 0.9, 0.02, 380, 10), expected, rtol=1e-12)
+
+
+def test_sigmoid_scalar_returns_float():
+    value = sigmoid_recruitment(380, 0.9, 0.02, 380)
+    assert isinstance(value, float)
+    assert value == 0.45
+
+
+def test_sigmoid_broadcasts_and_saturates():
+    result = sigmoid_recruitment(np.array([-1e6, 400, 1e6]), 0.9, 0.02, 380, np.array([[0], [10]]))
+    assert result.shape == (2, 3)
+    assert np.all(np.isfinite(result))
+    np.testing.assert_allclose(result[:, [0, 2]], [[0, 0.9], [0, 0.9]])
+
+
+def test_sigmoid_writes_into_out():
+    out = np.empty(3)
+    result = sigmoid_recruitment(np.array([300.0, 400, 500]), 0.9, 0.02, 380, out=out)
+    assert result is out
+
+
+def test_find_salary_inverts_sigmoid():
+    targets = np.array([0.2, 0.5, 0.8])
+    salaries = find_salary_for_probability(targets, 0.9, 0.02, 380, 5)
+    np.testing.assert_allclose(sigmoid_recruitment(salaries, 0.9, 0.02, 380, 5), targets)
+
+
+def test_find_salary_unattainable_targets():
+    assert find_salary_for_probability(0.95, 0.9, 0.02, 380) is None
+    assert find_salary_for_probability(0.0, 0.9, 0.02, 380) is None
+    result = find_salary_for_probability(np.array([0.5, 0.9, 0.95]), 0.9, 0.02, 380)
+    assert np.isfinite(result[0]) and np.isnan(result[1:]).all()
+
+
+def test_score_grid_shape_and_values():
+    salaries = np.array([300.0, 400, 500])
+    culture = np.array([-10.0, 0, 10])
+    parameter_sets = np.array([[0.9, 0.02, 380], [0.95, 0.03, 400]])
+    grid = score_grid(salaries, culture, parameter_sets)
+    assert grid.shape == (2, 3, 3)
+    np.testing.assert_allclose(grid[1, 2], sigmoid_recruitment(salaries, 0.95, 0.03, 400, 10))
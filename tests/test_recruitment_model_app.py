@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pytest
+
+from parameter_store import DEFAULT_PARAMETERS
+from posterior_sampler import DEFAULT_POSTERIOR_FILE, save_posterior
+
+streamlit_testing = pytest.importorskip('streamlit.testing.v1')
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'recruitment_model_app.py')
+
+
+def _save_draws(path, curve):
+    rng = np.random.default_rng(12)
+    draws = np.array([curve['a'], curve['b'], curve['c']]) + rng.normal(0, [0.01, 0.001, 3], (1, 400, 3))
+    save_posterior(path, {'draws': draws, 'priors': {}, 'acceptance_rate': 0.3, 'rhat': np.ones(3),
+                          'ess': np.full(3, 400.0), 'maximum_likelihood': [curve[n] for n in 'abc']})
+
+
+def _run(**sliders):
+    app = streamlit_testing.AppTest.from_file(APP, default_timeout=60)
+    app.run()
+    for label, value in sliders.items():
+        next(s for s in app.slider if s.label.startswith(label)).set_value(value)
+    if sliders:
+        app.run()
+    assert not app.exception
+    return ' '.join(m.value for m in app.markdown)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # builtin parameters, no sweep file
+    return tmp_path
+
+
+def test_band_shows_for_the_sampled_curve_only(workdir):
+    assert 'Credible Range' not in _run()
+
+    _save_draws(DEFAULT_POSTERIOR_FILE, DEFAULT_PARAMETERS['curve_parameters'])
+    assert 'Credible Range' in _run()
+    assert 'Credible Range' not in _run(**{'Baseline Inflection Point': 420.0})
+
+
+def test_band_of_another_curve_is_hidden(workdir):
+    curve = {**DEFAULT_PARAMETERS['curve_parameters'], 'c': 430}
+    _save_draws(DEFAULT_POSTERIOR_FILE, curve)
+    assert 'Credible Range' not in _run()
+    assert 'Credible Range' in _run(**{'Baseline Inflection Point': 430.0})
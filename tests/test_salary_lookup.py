@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from parameter_sweep import SalaryLookup
+from recruitment_core import find_salary_for_probability
+
+A, B, C = 0.92, 0.023, 383
+
+
+@pytest.fixture(scope='module')
+def lookup():
+    return SalaryLookup(A, B, C, culture_scores=np.arange(-50, 51, 5))
+
+
+@pytest.mark.parametrize('culture', [-50, -5, 0, 25, 50])
+@pytest.mark.parametrize('target', [0.5, 0.65, 0.8, 0.9])
+def test_national_salary_matches_inverse_sigmoid(lookup, culture, target):
+    assert lookup.national_salary(culture, target) == pytest.approx(
+        find_salary_for_probability(target, A, B, C, k=culture))
+
+
+@pytest.mark.parametrize('cost_of_living', [77, 91, 100, 231])
+def test_regional_salary_scales_national(lookup, cost_of_living):
+    expected = find_salary_for_probability(0.8, A, B, C, k=10) * cost_of_living / 100
+    assert lookup.regional_salary(10, 0.8, cost_of_living) == pytest.approx(expected)
+
+
+def test_off_grid_inputs_fall_back(lookup):
+    assert lookup.regional_salary(12, 0.83, 95.5) == pytest.approx(
+        find_salary_for_probability(0.83, A, B, C, k=12) * 0.955)
+
+
+def test_unattainable_target_is_none(lookup):
+    assert lookup.national_salary(0, 0.95) is None
+    assert lookup.regional_salary(0, 0.95, 100) is None